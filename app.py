@@ -1,49 +1,75 @@
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import plotly.express as px
-
-# 更详细的大气透过率数据（基于真实大气窗口）
-wavelength = [0.4, 0.45, 0.5, 0.55, 0.6, 0.65, 0.7, 0.75, 0.8, 0.85, 0.9, 0.95, 1.0, 
-              1.1, 1.2, 1.3, 1.4, 1.5, 1.6, 1.7, 1.8, 1.9, 2.0, 2.1, 2.2, 2.3, 2.4, 2.5,
-              10.0, 10.5, 11.0, 11.5, 12.0, 12.5]
-
-transmission = [75, 80, 85, 88, 90, 88, 85, 80, 75, 70, 65, 60, 55, 50, 45, 40, 35, 30, 25, 20, 15, 10, 15, 20, 25, 30, 35, 40,
-                50, 55, 60, 65, 70, 75]
-
-# 详细的卫星波段数据
-satellite_bands = {
-    "Landsat 9": [
-        {"Band": "B1", "Range": (0.43, 0.45), "Resolution": "30 m", "Color": "lightblue", "Description": "Coastal aerosol"},
-        {"Band": "B2", "Range": (0.45, 0.51), "Resolution": "30 m", "Color": "blue", "Description": "Blue"},
-        {"Band": "B3", "Range": (0.53, 0.59), "Resolution": "30 m", "Color": "green", "Description": "Green"},
-        {"Band": "B4", "Range": (0.64, 0.67), "Resolution": "30 m", "Color": "red", "Description": "Red"},
-        {"Band": "B5", "Range": (0.85, 0.88), "Resolution": "30 m", "Color": "lightgreen", "Description": "NIR"},
-        {"Band": "B6", "Range": (1.57, 1.65), "Resolution": "30 m", "Color": "orange", "Description": "SWIR 1"},
-        {"Band": "B7", "Range": (2.11, 2.29), "Resolution": "30 m", "Color": "brown", "Description": "SWIR 2"},
-        {"Band": "B8", "Range": (0.50, 0.68), "Resolution": "15 m", "Color": "purple", "Description": "Panchromatic"},
-        {"Band": "B9", "Range": (1.36, 1.38), "Resolution": "30 m", "Color": "navy", "Description": "Cirrus"},
-        {"Band": "B10", "Range": (10.6, 11.2), "Resolution": "100 m", "Color": "crimson", "Description": "TIRS 1"},
-        {"Band": "B11", "Range": (11.5, 12.5), "Resolution": "100 m", "Color": "crimson", "Description": "TIRS 2"}
-    ],
-    "Sentinel-2": [
-        {"Band": "B1", "Range": (0.433, 0.453), "Resolution": "60 m", "Color": "lightblue", "Description": "Coastal aerosol"},
-        {"Band": "B2", "Range": (0.458, 0.523), "Resolution": "10 m", "Color": "blue", "Description": "Blue"},
-        {"Band": "B3", "Range": (0.543, 0.578), "Resolution": "10 m", "Color": "green", "Description": "Green"},
-        {"Band": "B4", "Range": (0.650, 0.680), "Resolution": "10 m", "Color": "red", "Description": "Red"},
-        {"Band": "B5", "Range": (0.698, 0.713), "Resolution": "20 m", "Color": "lightgreen", "Description": "Red edge 1"},
-        {"Band": "B6", "Range": (0.733, 0.748), "Resolution": "20 m", "Color": "yellow", "Description": "Red edge 2"},
-        {"Band": "B7", "Range": (0.773, 0.793), "Resolution": "20 m", "Color": "orange", "Description": "Red edge 3"},
-        {"Band": "B8", "Range": (0.785, 0.900), "Resolution": "10 m", "Color": "purple", "Description": "NIR"},
-        {"Band": "B8A", "Range": (0.855, 0.875), "Resolution": "20 m", "Color": "forestgreen", "Description": "NIR narrow"},
-        {"Band": "B9", "Range": (0.935, 0.955), "Resolution": "60 m", "Color": "navy", "Description": "Water vapour"},
-        {"Band": "B10", "Range": (1.365, 1.385), "Resolution": "60 m", "Color": "navy", "Description": "Cirrus"},
-        {"Band": "B11", "Range": (1.565, 1.655), "Resolution": "20 m", "Color": "brown", "Description": "SWIR 1"},
-        {"Band": "B12", "Range": (2.100, 2.280), "Resolution": "20 m", "Color": "saddlebrown", "Description": "SWIR 2"}
-    ]
-}
+import gzip
+import hashlib
+import json
+import os
+import sys
+
+# plotly 在真正构建图表时才导入（见各 create_* 函数）：
+# 命中预构建快照时 worker 启动无需加载 plotly 的图表对象与校验器
+try:
+    import brotli  # 可选依赖，未安装时只使用 gzip
+except ImportError:
+    brotli = None
+
+# 波段与大气透过率数据统一放在 scripts/spectral_bands.py
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+from spectral_bands import wavelength, transmission, satellite_bands
+from band_traces import add_batched_band_traces
+
+def add_overlap_traces(fig):
+    """
+    高亮不同卫星之间相互重叠的波长范围（由 band_index 的区间索引求出）。
+    每个子图一个 trace，各重叠区域的矩形以 None 分隔画在同一条折线里，
+    trace 的 legendgroup 为 'overlaps'，供客户端模式切换显示。
+    """
+    import plotly.graph_objects as go
+    from band_index import overlap_regions
+    from spectral_bands import SENSORS, band_table
 
-def create_satellite_comparison_chart():
-    """创建卫星波段比较图表"""
+    table = band_table()
+    panels = {1: ([], [], []), 2: ([], [], [])}
+    for i, sensor_a in enumerate(SENSORS):
+        for sensor_b in SENSORS[i + 1:]:
+            for row_a, row_b, lo, hi in overlap_regions(table, sensor_a, sensor_b):
+                if hi <= 2.5:
+                    xs, ys, texts = panels[1]
+                elif lo >= 10:
+                    xs, ys, texts = panels[2]
+                else:
+                    continue
+                text = f"{sensor_a} {table['band'][row_a]} ∩ {sensor_b} {table['band'][row_b]}<br>{lo:g}-{hi:g} μm"
+                xs += [lo, hi, hi, lo, lo, None]
+                ys += [0, 0, 100, 100, 0, None]
+                texts += [text] * 5 + [None]
+
+    show_legend = True
+    for col, (xs, ys, texts) in panels.items():
+        if not xs:
+            continue
+        fig.add_trace(
+            go.Scatter(
+                x=xs, y=ys,
+                mode='lines',
+                fill='toself',
+                fillcolor='rgba(0,0,0,0.15)',
+                line=dict(color='black', width=2, dash='dot'),
+                name='Overlapping bands',
+                legendgroup='overlaps',
+                showlegend=show_legend,
+                text=texts,
+                hovertemplate="<b>Overlap</b><br>%{text}<extra></extra>"
+            ),
+            row=1, col=col
+        )
+        show_legend = False
+
+def create_satellite_comparison_chart(show_overlaps=False):
+    """
+    创建卫星波段比较图表（每颗卫星每个子图只用一个批量 trace）
+    show_overlaps: 高亮不同卫星之间重叠的波段
+    """
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
     
     # 创建子图，左侧显示可见光到近红外，右侧显示热红外
     fig = make_subplots(
@@ -91,46 +117,11 @@ def create_satellite_comparison_chart():
     
     # 添加卫星波段矩形
     for satellite_name, bands in satellite_bands.items():
-        for band in bands:
-            # 确定波段属于哪个子图
-            if band["Range"][1] <= 2.5:
-                # 可见光到近红外波段
-                fig.add_trace(
-                    go.Scatter(
-                        x=[band["Range"][0], band["Range"][1], band["Range"][1], band["Range"][0], band["Range"][0]],
-                        y=[0, 0, 100, 100, 0],
-                        fill="toself",
-                        name=f"{satellite_name} {band['Band']} ({band['Resolution']})",
-                        fillcolor=band["Color"],
-                        line=dict(color=band["Color"], width=1),
-                        opacity=0.7,
-                        hovertemplate=f"<b>{satellite_name} {band['Band']}</b><br>" +
-                                    f"Wavelength: {band['Range'][0]}-{band['Range'][1]} μm<br>" +
-                                    f"Resolution: {band['Resolution']}<br>" +
-                                    f"Description: {band['Description']}<extra></extra>"
-                    ),
-                    row=1, col=1
-                )
-            elif band["Range"][0] >= 10:
-                # 热红外波段
-                fig.add_trace(
-                    go.Scatter(
-                        x=[band["Range"][0], band["Range"][1], band["Range"][1], band["Range"][0], band["Range"][0]],
-                        y=[0, 0, 100, 100, 0],
-                        fill="toself",
-                        name=f"{satellite_name} {band['Band']} ({band['Resolution']})",
-                        fillcolor=band["Color"],
-                        line=dict(color=band["Color"], width=1),
-                        opacity=0.7,
-                        hovertemplate=f"<b>{satellite_name} {band['Band']}</b><br>" +
-                                    f"Wavelength: {band['Range'][0]}-{band['Range'][1]} μm<br>" +
-                                    f"Resolution: {band['Resolution']}<br>" +
-                                    f"Description: {band['Description']}<extra></extra>",
-                        showlegend=False
-                    ),
-                    row=1, col=2
-                )
+        add_batched_band_traces(fig, satellite_name, bands)
     
+    if show_overlaps:
+        add_overlap_traces(fig)
+
     # 更新布局
     fig.update_layout(
         title={
@@ -212,11 +203,248 @@ def create_satellite_comparison_chart():
     
     return fig
 
-def create_interactive_dashboard():
-    """创建交互式仪表板"""
+def create_single_satellite_chart(selected_satellite, show_overlaps=False):
+    """创建只显示选定卫星的图表（参数含义同 create_satellite_comparison_chart）"""
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    fig = make_subplots(
+        rows=1, cols=2,
+        subplot_titles=('Visible to SWIR (0.4-2.5 μm)', 'Thermal Infrared (10-12.5 μm)'),
+        specs=[[{"secondary_y": False}, {"secondary_y": False}]],
+        horizontal_spacing=0.1
+    )
+
+    # 添加大气透过率曲线
+    vis_swir_wavelength = [w for w in wavelength if w <= 2.5]
+    vis_swir_transmission = [transmission[i] for i, w in enumerate(wavelength) if w <= 2.5]
+
+    fig.add_trace(
+        go.Scatter(
+            x=vis_swir_wavelength, 
+            y=vis_swir_transmission,
+            mode='lines', 
+            name='Atmospheric Transmission',
+            line=dict(color='lightgray', width=2),
+            fill='tonexty',
+            fillcolor='rgba(200,200,200,0.3)'
+        ),
+        row=1, col=1
+    )
+
+    tir_wavelength = [w for w in wavelength if w >= 10]
+    tir_transmission = [transmission[i] for i, w in enumerate(wavelength) if w >= 10]
+
+    fig.add_trace(
+        go.Scatter(
+            x=tir_wavelength, 
+            y=tir_transmission,
+            mode='lines', 
+            name='Atmospheric Transmission',
+            line=dict(color='lightgray', width=2),
+            fill='tonexty',
+            fillcolor='rgba(200,200,200,0.3)',
+            showlegend=False
+        ),
+        row=1, col=2
+    )
+
+    # 只添加选定卫星的波段
+    bands = satellite_bands[selected_satellite]
+    add_batched_band_traces(fig, selected_satellite, bands, show_satellite=False)
+
+    if show_overlaps:
+        add_overlap_traces(fig)
+
+    fig.update_layout(
+        title=f'{selected_satellite} Bands vs Atmospheric Transmission',
+        xaxis_title="Wavelength (μm)",
+        yaxis_title="Atmospheric Transmission (%)",
+        template="plotly_white",
+        height=600,
+        showlegend=True,
+        legend=dict(
+            orientation="v",
+            yanchor="top",
+            y=1,
+            xanchor="left",
+            x=1.02
+        )
+    )
+
+    fig.update_xaxes(range=[0.4, 2.5], row=1, col=1)
+    fig.update_xaxes(range=[10, 12.5], row=1, col=2)
+    fig.update_yaxes(range=[0, 100], row=1, col=1)
+    fig.update_yaxes(range=[0, 100], row=1, col=2)
+
+    return fig
+
+# ========== 图表缓存 ==========
+# 下拉框只有 'Both' / 各卫星几种取值（再乘以是否高亮重叠波段），
+# 每种图表构建一次后缓存序列化结果，回调直接返回缓存，不再重复走 make_subplots 和 plotly 校验
+SATELLITE_OPTIONS = ('Both',) + tuple(satellite_bands)
+FIGURE_VARIANTS = tuple((option, show_overlaps) for option in SATELLITE_OPTIONS for show_overlaps in (False, True))
+
+# 预构建图表快照：python app.py --write-snapshot 生成，
+# 数据哈希与构建代码哈希都一致时直接读取，省去 worker 冷启动时的图表构建
+FIGURE_SNAPSHOT_PATH = os.environ.get(
+    'FIGURE_SNAPSHOT_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'figure_snapshot.json')
+)
+
+# 参与构建图表与透过率表格的源文件（相对仓库根目录），任何一个改动都会让旧快照失效
+SNAPSHOT_SOURCES = (
+    'app.py',
+    os.path.join('scripts', 'spectral_bands.py'),
+    os.path.join('scripts', 'band_transmission.py'),
+    os.path.join('scripts', 'band_index.py'),
+    os.path.join('scripts', 'band_traces.py'),
+)
+
+_figure_cache = {'hash': None, 'figures': {}, 'snapshot': {}}
+
+def bands_hash():
+    """图表输入数据（波段 + 透过率）的内容哈希；要序列化整个波段表，只在建立 / 失效缓存时调用"""
+    payload = json.dumps([satellite_bands, wavelength, transmission], sort_keys=True)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+def snapshot_hash():
+    """
+    快照的键：数据哈希 + SNAPSHOT_SOURCES 源码哈希 + plotly 版本。
+    只比较数据时，修改了 trace / 布局代码后仍会读到旧快照
+    """
+    from importlib.metadata import PackageNotFoundError, version
+
+    root = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.sha1(bands_hash().encode('utf-8'))
+    for source in SNAPSHOT_SOURCES:
+        with open(os.path.join(root, source), 'rb') as f:
+            digest.update(f.read())
+    try:
+        digest.update(version('plotly').encode('utf-8'))
+    except PackageNotFoundError:
+        pass
+    return digest.hexdigest()
+
+def invalidate_figure_cache():
+    """
+    重新计算快照哈希、清空图表缓存并按新哈希加载快照。
+    模块导入时调用一次；运行时修改了 satellite_bands 等数据后需再次调用
+    """
+    current_hash = snapshot_hash()
+    _figure_cache['hash'] = current_hash
+    _figure_cache['figures'] = {}
+    _figure_cache['snapshot'] = load_figure_snapshot(current_hash)
+
+def figure_key(selected_satellite, show_overlaps=False):
+    """缓存与快照中图表的键，如 'Both' / 'Both+overlaps'"""
+    return f"{selected_satellite}+overlaps" if show_overlaps else selected_satellite
+
+def build_satellite_chart(selected_satellite, show_overlaps=False):
+    """按下拉框取值构建图表（不经过缓存）"""
+    if selected_satellite == 'Both':
+        return create_satellite_comparison_chart(show_overlaps=show_overlaps)
+    return create_single_satellite_chart(selected_satellite, show_overlaps=show_overlaps)
+
+def load_figure_snapshot(expected_hash, path=FIGURE_SNAPSHOT_PATH):
+    """
+    读取预构建快照 {'figures': {...}, 'tables': {...}}；
+    文件缺失、损坏或快照哈希（数据或构建代码变化）不一致时返回空 dict
+    """
+    try:
+        with open(path, encoding='utf-8') as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if snapshot.get('hash') != expected_hash:
+        return {}
+    return snapshot
+
+def write_figure_snapshot(path=FIGURE_SNAPSHOT_PATH):
+    """构建所有下拉框取值的图表和波段透过率表格并写入快照文件"""
+    from band_transmission import transmission_rows
+
+    figures = {
+        figure_key(option, show_overlaps): json.loads(build_satellite_chart(option, show_overlaps).to_json())
+        for option, show_overlaps in FIGURE_VARIANTS
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        snapshot = {'hash': snapshot_hash(), 'figures': figures, 'tables': {'band_transmission': transmission_rows()}}
+        json.dump(snapshot, f, separators=(',', ':'))
+    return path
+
+def get_cached_figure(selected_satellite, show_overlaps=False):
+    """
+    返回缓存的图表 dict，可直接作为 dcc.Graph 的 figure。
+    优先使用快照中的图表，没有时现场构建一次；快照哈希只在 invalidate_figure_cache() 中计算。
+    """
+    if _figure_cache['hash'] is None:
+        invalidate_figure_cache()
+
+    key = figure_key(selected_satellite, show_overlaps)
+    figures = _figure_cache['figures']
+    figure = figures.get(key)
+    if figure is None:
+        figure = _figure_cache['snapshot'].get('figures', {}).get(key)
+        if figure is None:
+            figure = json.loads(build_satellite_chart(selected_satellite, show_overlaps).to_json())
+        # 只缓存合法取值，避免任意输入撑大缓存
+        if selected_satellite in SATELLITE_OPTIONS:
+            figures[key] = figure
+    return figure
+
+def get_transmission_rows():
+    """波段平均透过率表格的行（优先取快照，缺失时现算）"""
+    if _figure_cache['hash'] is None:
+        invalidate_figure_cache()   # 确保快照已按当前哈希加载
+    rows = _figure_cache['snapshot'].get('tables', {}).get('band_transmission')
+    if rows is None:
+        from band_transmission import transmission_rows
+        rows = transmission_rows()
+    return rows
+
+def warm_figure_cache():
+    """启动时预先构建所有下拉框取值（含重叠高亮）对应的图表"""
+    for option, show_overlaps in FIGURE_VARIANTS:
+        get_cached_figure(option, show_overlaps)
+
+# 客户端切换卫星：浏览器只接收一次包含全部卫星和重叠高亮的图表，
+# 下拉框/勾选框变化时按 trace 的 legendgroup（卫星名或 'overlaps'）切换 visible，服务器不参与
+CLIENTSIDE_FILTER_JS = """
+function(selectedSatellite, overlapToggle, figure) {
+    if (!figure) {
+        return window.dash_clientside.no_update;
+    }
+    var showAll = selectedSatellite === 'Both';
+    var showOverlaps = (overlapToggle || []).indexOf('overlaps') !== -1;
+    var data = figure.data.map(function(trace) {
+        if (!trace.legendgroup) {
+            return trace;  // 大气透过率曲线始终显示
+        }
+        var visible = trace.legendgroup === 'overlaps'
+            ? showOverlaps
+            : showAll || trace.legendgroup === selectedSatellite;
+        return Object.assign({}, trace, {visible: visible});
+    });
+    var title = showAll
+        ? 'Satellite Band Comparison with Atmospheric Transmission'
+        : selectedSatellite + ' Bands vs Atmospheric Transmission';
+    var layout = Object.assign({}, figure.layout, {
+        title: Object.assign({}, figure.layout.title, {text: title})
+    });
+    return Object.assign({}, figure, {data: data, layout: layout});
+}
+"""
+
+def create_interactive_dashboard(clientside=False):
+    """
+    创建交互式仪表板
+    clientside: True 时卫星切换由浏览器端回调完成，每次点击不再请求服务器
+    """
     import dash
-    from dash import dcc, html
-    from dash.dependencies import Input, Output
+    from dash import dash_table, dcc, html
+    from dash.dependencies import Input, Output, State
+    import flask
     
     app = dash.Dash(__name__)
     
@@ -236,11 +464,21 @@ def create_interactive_dashboard():
                     ],
                     value='Both',
                     style={'width': '300px', 'margin': '0 auto'}
+                ),
+                dcc.Checklist(
+                    id='overlap-toggle',
+                    options=[{'label': ' Show overlapping bands', 'value': 'overlaps'}],
+                    value=[],
+                    style={'marginTop': '10px'}
                 )
             ], style={'textAlign': 'center', 'marginBottom': 30})
         ]),
         
-        dcc.Graph(id='satellite-comparison-chart'),
+        dcc.Graph(
+            id='satellite-comparison-chart',
+            # 客户端模式下合并图表（含重叠高亮）随布局一次性下发
+            figure=get_cached_figure('Both', show_overlaps=True) if clientside else None
+        ),
         
         html.Div([
             html.H3("Chart Description", style={'color': '#2c3e50'}),
@@ -248,129 +486,164 @@ def create_interactive_dashboard():
                 html.Li("Light gray area represents atmospheric transmission, peaks indicate atmospheric windows"),
                 html.Li("Colored rectangles represent spectral bands of each satellite"),
                 html.Li("Hover over elements to view detailed band information"),
+                html.Li("Tick \"Show overlapping bands\" to outline wavelength ranges covered by both satellites"),
                 html.Li("Left panel shows visible to near-infrared bands, right panel shows thermal infrared bands")
             ])
-        ], style={'marginTop': 30, 'padding': 20, 'backgroundColor': '#f8f9fa', 'borderRadius': 10})
+        ], style={'marginTop': 30, 'padding': 20, 'backgroundColor': '#f8f9fa', 'borderRadius': 10}),
+
+        html.Div([
+            html.H3("Band-Integrated Atmospheric Transmission", style={'color': '#2c3e50'}),
+            html.P("Mean transmission of the atmosphere over each band's wavelength range. Click a column header to sort."),
+            dash_table.DataTable(
+                id='band-transmission-table',
+                columns=[
+                    {'name': 'Satellite', 'id': 'Satellite'},
+                    {'name': 'Band', 'id': 'Band'},
+                    {'name': 'Description', 'id': 'Description'},
+                    {'name': 'Range (μm)', 'id': 'Range (μm)'},
+                    {'name': 'Resolution (m)', 'id': 'Resolution (m)', 'type': 'numeric'},
+                    {'name': 'Mean transmission (%)', 'id': 'Mean transmission (%)', 'type': 'numeric'}
+                ],
+                data=get_transmission_rows(),
+                sort_action='native',
+                style_cell={'textAlign': 'left', 'padding': '4px 8px'},
+                style_header={'fontWeight': 'bold'}
+            )
+        ], style={'marginTop': 30, 'padding': 20})
     ])
     
+    if clientside:
+        app.clientside_callback(
+            CLIENTSIDE_FILTER_JS,
+            Output('satellite-comparison-chart', 'figure'),
+            Input('satellite-dropdown', 'value'),
+            Input('overlap-toggle', 'value'),
+            State('satellite-comparison-chart', 'figure')
+        )
+        return app
+
     @app.callback(
         Output('satellite-comparison-chart', 'figure'),
-        Input('satellite-dropdown', 'value')
+        Input('satellite-dropdown', 'value'),
+        Input('overlap-toggle', 'value')
     )
-    def update_chart(selected_satellite):
-        if selected_satellite == 'Both':
-            return create_satellite_comparison_chart()
-        else:
-            # 创建只显示选定卫星的图表
-            fig = make_subplots(
-                rows=1, cols=2,
-                subplot_titles=('Visible to SWIR (0.4-2.5 μm)', 'Thermal Infrared (10-12.5 μm)'),
-                specs=[[{"secondary_y": False}, {"secondary_y": False}]],
-                horizontal_spacing=0.1
-            )
-            
-            # 添加大气透过率曲线
-            vis_swir_wavelength = [w for w in wavelength if w <= 2.5]
-            vis_swir_transmission = [transmission[i] for i, w in enumerate(wavelength) if w <= 2.5]
-            
-            fig.add_trace(
-                go.Scatter(
-                    x=vis_swir_wavelength, 
-                    y=vis_swir_transmission,
-                    mode='lines', 
-                    name='Atmospheric Transmission',
-                    line=dict(color='lightgray', width=2),
-                    fill='tonexty',
-                    fillcolor='rgba(200,200,200,0.3)'
-                ),
-                row=1, col=1
-            )
-            
-            tir_wavelength = [w for w in wavelength if w >= 10]
-            tir_transmission = [transmission[i] for i, w in enumerate(wavelength) if w >= 10]
-            
-            fig.add_trace(
-                go.Scatter(
-                    x=tir_wavelength, 
-                    y=tir_transmission,
-                    mode='lines', 
-                    name='Atmospheric Transmission',
-                    line=dict(color='lightgray', width=2),
-                    fill='tonexty',
-                    fillcolor='rgba(200,200,200,0.3)',
-                    showlegend=False
-                ),
-                row=1, col=2
-            )
-            
-            # 只添加选定卫星的波段
-            bands = satellite_bands[selected_satellite]
-            for band in bands:
-                if band["Range"][1] <= 2.5:
-                    fig.add_trace(
-                        go.Scatter(
-                            x=[band["Range"][0], band["Range"][1], band["Range"][1], band["Range"][0], band["Range"][0]],
-                            y=[0, 0, 100, 100, 0],
-                            fill="toself",
-                            name=f"{band['Band']} ({band['Resolution']})",
-                            fillcolor=band["Color"],
-                            line=dict(color=band["Color"], width=1),
-                            opacity=0.7,
-                            hovertemplate=f"<b>{band['Band']}</b><br>" +
-                                        f"Wavelength: {band['Range'][0]}-{band['Range'][1]} μm<br>" +
-                                        f"Resolution: {band['Resolution']}<br>" +
-                                        f"Description: {band['Description']}<extra></extra>"
-                        ),
-                        row=1, col=1
-                    )
-                elif band["Range"][0] >= 10:
-                    fig.add_trace(
-                        go.Scatter(
-                            x=[band["Range"][0], band["Range"][1], band["Range"][1], band["Range"][0], band["Range"][0]],
-                            y=[0, 0, 100, 100, 0],
-                            fill="toself",
-                            name=f"{band['Band']} ({band['Resolution']})",
-                            fillcolor=band["Color"],
-                            line=dict(color=band["Color"], width=1),
-                            opacity=0.7,
-                            hovertemplate=f"<b>{band['Band']}</b><br>" +
-                                        f"Wavelength: {band['Range'][0]}-{band['Range'][1]} μm<br>" +
-                                        f"Resolution: {band['Resolution']}<br>" +
-                                        f"Description: {band['Description']}<extra></extra>",
-                            showlegend=False
-                        ),
-                        row=1, col=2
-                    )
-            
-            fig.update_layout(
-                title=f'{selected_satellite} Bands vs Atmospheric Transmission',
-                xaxis_title="Wavelength (μm)",
-                yaxis_title="Atmospheric Transmission (%)",
-                template="plotly_white",
-                height=600,
-                showlegend=True,
-                legend=dict(
-                    orientation="v",
-                    yanchor="top",
-                    y=1,
-                    xanchor="left",
-                    x=1.02
-                )
-            )
-            
-            fig.update_xaxes(range=[0.4, 2.5], row=1, col=1)
-            fig.update_xaxes(range=[10, 12.5], row=1, col=2)
-            fig.update_yaxes(range=[0, 100], row=1, col=1)
-            fig.update_yaxes(range=[0, 100], row=1, col=2)
-            
-            return fig
+    def update_chart(selected_satellite, overlap_toggle):
+        # 下拉框被清空 (None) 或收到非法取值时保留当前图表，而不是抛 KeyError 返回 500
+        if selected_satellite not in SATELLITE_OPTIONS:
+            return dash.no_update
+        show_overlaps = 'overlaps' in (overlap_toggle or [])
+        # 响应压缩按图表键缓存（见 install_response_cache）
+        flask.g.figure_key = figure_key(selected_satellite, show_overlaps)
+        return get_cached_figure(selected_satellite, show_overlaps)
     
     return app
 
-app = create_interactive_dashboard()
+# ========== 响应压缩与 ETag ==========
+# 只处理图表相关的 JSON 接口，其余静态资源交给 Dash/Flask 默认逻辑
+LAYOUT_ENDPOINT = '/_dash-layout'
+UPDATE_ENDPOINT = '/_dash-update-component'
+CACHED_ENDPOINTS = (UPDATE_ENDPOINT, LAYOUT_ENDPOINT)
+MIN_COMPRESS_SIZE = 500
+MAX_COMPRESSED_ENTRIES = 64
+
+# 缓存键 -> 压缩后的字节；同一图表被反复请求时不必重复压缩
+_compressed_cache = {}
+
+def compress_body(body, encoding):
+    """按 encoding ('br' / 'gzip') 压缩响应体"""
+    if encoding == 'br':
+        return brotli.compress(body)
+    return gzip.compress(body, compresslevel=6, mtime=0)
+
+def choose_encoding(accept_encodings):
+    """根据 Accept-Encoding 选择压缩方式，客户端都不支持时返回 None"""
+    if brotli is not None and accept_encodings['br']:
+        return 'br'
+    if accept_encodings['gzip']:
+        return 'gzip'
+    return None
+
+def layout_etag(clientside, encoding):
+    """
+    布局的强 ETag：图表缓存的快照哈希（数据 + 构建代码）+ 客户端模式 + Dash 版本，
+    不同编码是不同的表示，需要区分
+    """
+    import dash
+
+    if _figure_cache['hash'] is None:
+        invalidate_figure_cache()
+    mode = 'clientside' if clientside else 'server'
+    tag = f"{_figure_cache['hash'][:20]}-{mode}-{dash.__version__}"
+    return f"{tag}-{encoding}" if encoding else tag
+
+def install_response_cache(server, clientside=False):
+    """
+    为 CACHED_ENDPOINTS 的响应做 gzip/brotli 压缩，并给布局加上 ETag：
+    - GET /_dash-layout：ETag 见 layout_etag()，不对响应体求哈希；请求带匹配的
+      If-None-Match 时在生成布局之前直接返回 304。只有这个接口能用上条件请求
+    - POST /_dash-update-component：浏览器不会给 Dash 的 POST 回调发送 If-None-Match，
+      不加 ETag；回调在 flask.g.figure_key 中记下图表键，压缩结果按 (快照哈希, 图表键, 编码) 缓存
+    """
+    from flask import g, request
+
+    def not_modified(etag):
+        response = server.response_class(status=304)
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        response.vary.add('Accept-Encoding')
+        return response
+
+    @server.before_request
+    def check_layout_etag():
+        if request.method != 'GET' or not request.path.endswith(LAYOUT_ENDPOINT):
+            return None
+        etag = layout_etag(clientside, choose_encoding(request.accept_encodings))
+        return not_modified(etag) if request.if_none_match.contains(etag) else None
+
+    @server.after_request
+    def compress_and_tag(response):
+        if not request.path.endswith(CACHED_ENDPOINTS):
+            return response
+        if response.status_code != 200 or response.direct_passthrough or 'Content-Encoding' in response.headers:
+            return response
+
+        response.vary.add('Accept-Encoding')
+        if request.path.endswith(LAYOUT_ENDPOINT):
+            encoding = choose_encoding(request.accept_encodings)
+            etag = layout_etag(clientside, encoding)
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = 'no-cache'
+            key = (LAYOUT_ENDPOINT, etag)
+        else:
+            body_size = response.calculate_content_length() or 0
+            encoding = choose_encoding(request.accept_encodings) if body_size >= MIN_COMPRESS_SIZE else None
+            figure = g.get('figure_key')
+            key = None if figure is None else (UPDATE_ENDPOINT, _figure_cache['hash'], figure, encoding)
+
+        if encoding:
+            compressed = None if key is None else _compressed_cache.get(key)
+            if compressed is None:
+                compressed = compress_body(response.get_data(), encoding)
+                if key is not None:
+                    if len(_compressed_cache) >= MAX_COMPRESSED_ENTRIES:
+                        _compressed_cache.clear()
+                    _compressed_cache[key] = compressed
+            response.set_data(compressed)
+            response.headers['Content-Encoding'] = encoding
+        return response
+
+# 设置环境变量 CLIENTSIDE_FILTERING=1 启用客户端切换卫星
+# 模块导入时即构建好 app 和图表缓存：gunicorn --preload 下只在主进程做一次，
+# fork 出的 worker 以写时复制方式共享这些对象
+CLIENTSIDE = os.environ.get('CLIENTSIDE_FILTERING') == '1'
+app = create_interactive_dashboard(clientside=CLIENTSIDE)
 server = app.server
+install_response_cache(server, clientside=CLIENTSIDE)
+warm_figure_cache()
 
-if __name__ == "__main__":
+if __name__ == "__main__" and '--write-snapshot' in sys.argv:
+    print(f"Figure snapshot written to {write_figure_snapshot()}")
+elif __name__ == "__main__":
     print("Starting interactive dashboard...")
     print("Please open http://127.0.0.1:8050 in your browser")
     app.run_server(debug=True, port=8050)
@@ -0,0 +1,333 @@
+"""
+Load-test / latency benchmark for the Dash dashboard in app.py.
+
+Starts `app:server` either in-process (werkzeug threaded server on a local
+port) or under a local gunicorn (`--mode gunicorn --workers N`, same
+`--preload` setup as the Procfile), then replays the
+`/_dash-update-component` POST that the `satellite-dropdown` callback sends,
+cycling through every dropdown value, at one or more concurrency levels.
+
+Reports p50/p95/p99 latency, requests/s, wire and decoded payload bytes and
+the RSS of every server process, and saves everything as JSON (with the git
+commit) so runs can be compared with `--compare previous.json`.
+
+In-process mode shares the interpreter (and GIL) with the load generator, so
+its numbers are a lower bound; use gunicorn mode to size worker counts.
+
+Usage:
+    python benchmarks/dash_load.py [--mode inprocess|gunicorn] [--workers 2]
+        [--concurrency 1 4 16] [--requests 400] [--encoding gzip]
+        [--output benchmarks/dash_load_results.json] [--compare old.json]
+"""
+import argparse
+import gzip
+import http.client
+import json
+import os
+import platform
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+try:
+    import psutil  # 可选依赖，未安装时从 /proc 读取 RSS
+except ImportError:
+    psutil = None
+
+UPDATE_PATH = "/_dash-update-component"
+DROPDOWN_VALUES = ("Landsat 9", "Sentinel-2", "Both")
+
+
+def update_payload(satellite, show_overlaps=False):
+    """satellite-dropdown 变化时浏览器发出的回调请求体"""
+    return json.dumps({
+        "output": "satellite-comparison-chart.figure",
+        "outputs": {"id": "satellite-comparison-chart", "property": "figure"},
+        "inputs": [
+            {"id": "satellite-dropdown", "property": "value", "value": satellite},
+            {"id": "overlap-toggle", "property": "value", "value": ["overlaps"] if show_overlaps else []},
+        ],
+        "changedPropIds": ["satellite-dropdown.value"],
+        "state": [],
+    }).encode("utf-8")
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_ready(port, timeout=60.0):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=2)
+            connection.request("GET", "/_dash-layout")
+            connection.getresponse().read()
+            connection.close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"server on port {port} did not become ready within {timeout:.0f} s")
+
+
+# ========== 服务器 ==========
+class InProcessServer:
+    """在本进程的后台线程里运行 app.server（werkzeug 多线程）"""
+
+    def __init__(self, port):
+        import logging
+
+        from werkzeug.serving import make_server
+
+        # 每个请求一行的访问日志会拖慢压测并淹没输出
+        logging.getLogger("werkzeug").setLevel(logging.ERROR)
+        sys.path.insert(0, REPO_ROOT)
+        import app
+
+        self.port = port
+        self.httpd = make_server("127.0.0.1", port, app.server, threaded=True)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    def pids(self):
+        return [os.getpid()]
+
+    def stop(self):
+        self.httpd.shutdown()
+
+
+class GunicornServer:
+    """本地 gunicorn --preload，与 Procfile 相同"""
+
+    def __init__(self, port, workers):
+        executable = shutil.which("gunicorn")
+        if executable is None:
+            raise RuntimeError("gunicorn is not installed; use --mode inprocess or pip install gunicorn")
+        self.port = port
+        self.process = subprocess.Popen(
+            [executable, "--preload", "--workers", str(workers), "--bind", f"127.0.0.1:{port}", "app:server"],
+            cwd=REPO_ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        wait_until_ready(port)
+
+    def pids(self):
+        return [self.process.pid] + child_pids(self.process.pid)
+
+    def stop(self):
+        self.process.terminate()
+        self.process.wait(timeout=30)
+
+
+def child_pids(pid):
+    if psutil is not None:
+        return [child.pid for child in psutil.Process(pid).children()]
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            return [int(child) for child in f.read().split()]
+    except OSError:
+        return []
+
+
+def rss_bytes(pid):
+    if psutil is not None:
+        return psutil.Process(pid).memory_info().rss
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+# ========== 压测 ==========
+def run_load(port, concurrency, requests, encoding, show_overlaps=False):
+    """concurrency 个线程各持一条 keep-alive 连接，共发出 requests 个回调请求"""
+    payloads = [update_payload(value, show_overlaps) for value in DROPDOWN_VALUES]
+    headers = {"Content-Type": "application/json"}
+    if encoding:
+        headers["Accept-Encoding"] = encoding
+    counter = iter(range(requests))
+    lock = threading.Lock()
+    latencies, wire_bytes, body_bytes, errors = [], [], [], []
+
+    def worker():
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        while True:
+            with lock:
+                index = next(counter, None)
+            if index is None:
+                break
+            start = time.perf_counter()
+            try:
+                connection.request("POST", UPDATE_PATH, body=payloads[index % len(payloads)], headers=headers)
+                response = connection.getresponse()
+                data = response.read()
+            except (OSError, http.client.HTTPException) as exc:
+                # 连接被重置 / 超时等：记为错误并换一条新连接，不让线程静默退出
+                connection.close()
+                connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+                with lock:
+                    errors.append(type(exc).__name__)
+                continue
+            elapsed = time.perf_counter() - start
+            with lock:
+                if response.status != 200:
+                    errors.append(response.status)
+                    continue
+                latencies.append(elapsed)
+                wire_bytes.append(len(data))
+                if response.getheader("Content-Encoding") == "gzip":
+                    data = gzip.decompress(data)
+                body_bytes.append(len(data))
+        connection.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    duration = time.perf_counter() - start
+
+    # 成功请求少于 2 个时（如 CLIENTSIDE_FILTERING=1 下回调不存在、或全部 500）无法求分位数，记为 null
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive") if len(latencies) >= 2 else None
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": len(errors),
+        "error_kinds": {str(kind): errors.count(kind) for kind in dict.fromkeys(errors)},
+        "duration_s": round(duration, 4),
+        "rps": round(len(latencies) / duration, 1),
+        "p50_ms": round(cuts[49] * 1000, 3) if cuts else None,
+        "p95_ms": round(cuts[94] * 1000, 3) if cuts else None,
+        "p99_ms": round(cuts[98] * 1000, 3) if cuts else None,
+        "max_ms": round(max(latencies) * 1000, 3) if latencies else None,
+        "wire_bytes_mean": round(statistics.fmean(wire_bytes)) if wire_bytes else None,
+        "body_bytes_mean": round(statistics.fmean(body_bytes)) if body_bytes else None,
+    }
+
+
+def server_roles(mode, pids):
+    """[(pid, 角色)]：进程内模式的 RSS 包含压测线程本身"""
+    if mode == "inprocess":
+        return [(pids[0], "in-process server + load generator")]
+    return [(pids[0], "gunicorn master")] + [(pid, f"worker {i}") for i, pid in enumerate(pids[1:], 1)]
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _ms(value):
+    return "n/a" if value is None else f"{value:.2f}"
+
+
+def _change(new, old):
+    """相对变化；任一侧缺失（null）或为 0 时无法比较"""
+    return "n/a" if not new or not old else f"{new / old - 1:+.0%}"
+
+
+def format_summary(result, previous=None):
+    header = f"# Dash load test: {result['mode']}"
+    if result["mode"] == "gunicorn":
+        header += f", {result['workers']} workers"
+    lines = [
+        header,
+        "",
+        f"Commit {result['commit']}, Python {result['python']}, Dash {result['dash']}, "
+        f"{result['requests']} requests per level, Accept-Encoding: {result['encoding'] or 'identity'}.",
+        "",
+        "| Concurrency | req/s | p50 (ms) | p95 (ms) | p99 (ms) | wire bytes | body bytes | errors |",
+        "|-------------|-------|----------|----------|----------|------------|------------|--------|",
+    ]
+    for level in result["levels"]:
+        lines.append(f"| {level['concurrency']} | {level['rps']:.0f} | {_ms(level['p50_ms'])} | {_ms(level['p95_ms'])} "
+                     f"| {_ms(level['p99_ms'])} | {level['wire_bytes_mean'] or 'n/a'} "
+                     f"| {level['body_bytes_mean'] or 'n/a'} | {level['errors']} |")
+
+    before = {level["concurrency"]: level for level in (previous or {}).get("levels", [])}
+    compared = [level for level in result["levels"] if level["concurrency"] in before]
+    if compared:
+        lines += ["", f"## Change vs {previous['commit']} ({previous['mode']})", "",
+                  "| Concurrency | req/s | p50 | p95 | p99 |", "|-------------|-------|-----|-----|-----|"]
+        for level in compared:
+            old = before[level["concurrency"]]
+            lines.append(f"| {level['concurrency']} | {_change(level['rps'], old['rps'])} "
+                         f"| {_change(level['p50_ms'], old['p50_ms'])} | {_change(level['p95_ms'], old['p95_ms'])} "
+                         f"| {_change(level['p99_ms'], old['p99_ms'])} |")
+    lines += ["", "| Process | RSS before (MB) | RSS after (MB) |", "|---------|-----------------|----------------|"]
+    for process in result["rss"]:
+        lines.append(f"| {process['role']} ({process['pid']}) | {(process['before_bytes'] or 0) / 1e6:.1f} "
+                     f"| {(process['after_bytes'] or 0) / 1e6:.1f} |")
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=("inprocess", "gunicorn"), default="inprocess")
+    parser.add_argument("--workers", type=int, default=2, help="gunicorn worker processes")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--requests", type=int, default=400, help="requests per concurrency level")
+    parser.add_argument("--warmup", type=int, default=30)
+    parser.add_argument("--encoding", default="gzip", help="Accept-Encoding header ('' for identity)")
+    parser.add_argument("--overlaps", action="store_true", help="request figures with overlap highlighting")
+    parser.add_argument("--output", default=os.path.join(REPO_ROOT, "benchmarks", "dash_load_results.json"))
+    parser.add_argument("--compare", help="previous JSON result to compare against")
+    args = parser.parse_args()
+
+    port = free_port()
+    server = InProcessServer(port) if args.mode == "inprocess" else GunicornServer(port, args.workers)
+    try:
+        wait_until_ready(port)
+        rss_before = {pid: rss_bytes(pid) for pid in server.pids()}
+        run_load(port, 1, args.warmup, args.encoding, args.overlaps)
+        levels = [run_load(port, concurrency, args.requests, args.encoding, args.overlaps)
+                  for concurrency in args.concurrency]
+        rss_after = {pid: rss_bytes(pid) for pid in server.pids()}
+    finally:
+        server.stop()
+
+    import dash
+
+    result = {
+        "commit": git_commit(),
+        "mode": args.mode,
+        "workers": args.workers if args.mode == "gunicorn" else 1,
+        "python": platform.python_version(),
+        "dash": dash.__version__,
+        "platform": f"{platform.system()} {platform.machine()}",
+        "cpus": os.cpu_count(),
+        "encoding": args.encoding,
+        "overlaps": args.overlaps,
+        "requests": args.requests,
+        "levels": levels,
+        "rss": [
+            {"pid": pid, "role": role, "before_bytes": rss_before.get(pid), "after_bytes": rss_after.get(pid)}
+            for pid, role in server_roles(args.mode, list(rss_after))
+        ],
+    }
+    previous = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            previous = json.load(f)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+    print(format_summary(result, previous))
+
+
+if __name__ == "__main__":
+    main()
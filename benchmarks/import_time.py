@@ -0,0 +1,122 @@
+"""
+Cold-start import-time benchmark for app.py.
+
+Runs `python -X importtime -c "import app"` in fresh interpreters, with and
+without the prebuilt figure snapshot, and writes a markdown report with the
+median totals and the heaviest direct imports of `app`.
+
+Usage:
+    python benchmarks/import_time.py [--runs 5] [--output benchmarks/import_time_report.md]
+"""
+import argparse
+import os
+import platform
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_importtime(env_overrides=None):
+    """在新解释器中导入 app，返回 [(depth, name, self_us, cumulative_us), ...]"""
+    env = dict(os.environ, **(env_overrides or {}))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app"],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        rows.append((depth, name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def app_breakdown(rows):
+    """app 本身的累计耗时，以及 app 直接导入的各模块累计耗时"""
+    # -X importtime 先输出子模块再输出父模块：app 的直接子模块是
+    # 上一个顶层模块之后、app 这一行之前的 depth == 1 的行
+    children = {}
+    for depth, name, _, cumulative in rows:
+        if depth == 0:
+            if name == "app":
+                return cumulative, children
+            children = {}
+        elif depth == 1:
+            children[name] = children.get(name, 0) + cumulative
+    raise RuntimeError("`import app` not found in -X importtime output")
+
+
+def measure(label, runs, env_overrides=None):
+    totals = []
+    own_times = []
+    children_runs = []
+    for _ in range(runs):
+        total, children = app_breakdown(run_importtime(env_overrides))
+        totals.append(total)
+        # app 自身代码（构建 layout / 图表缓存）不属于任何子模块
+        own_times.append(total - sum(children.values()))
+        children_runs.append(children)
+    names = set().union(*children_runs)
+    children = {
+        name: statistics.median(run.get(name, 0) for run in children_runs)
+        for name in names
+    }
+    return {
+        "label": label,
+        "total_us": statistics.median(totals),
+        "own_us": statistics.median(own_times),
+        "children": children,
+    }
+
+
+def format_report(results, runs, top):
+    lines = [
+        "# app.py import-time report",
+        "",
+        f"Generated by `python benchmarks/import_time.py --runs {runs}` "
+        f"(Python {platform.python_version()}, {platform.system()} {platform.machine()}).",
+        "Times are medians of `-X importtime` cumulative microseconds for `import app`.",
+        "",
+        "| Mode | import app (ms) |",
+        "|------|-----------------|",
+    ]
+    for result in results:
+        lines.append(f"| {result['label']} | {result['total_us'] / 1000:.1f} |")
+    for result in results:
+        lines += [
+            "",
+            f"## Heaviest direct imports: {result['label']}",
+            "",
+            "| Module | cumulative (ms) |",
+            "|--------|-----------------|",
+        ]
+        ranked = sorted(result["children"].items(), key=lambda item: item[1], reverse=True)[:top]
+        for name, cumulative in ranked:
+            lines.append(f"| `{name}` | {cumulative / 1000:.1f} |")
+        lines.append(f"| *(app module body)* | {result['own_us'] / 1000:.1f} |")
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--output", default=os.path.join(REPO_ROOT, "benchmarks", "import_time_report.md"))
+    args = parser.parse_args()
+
+    results = [
+        measure("prebuilt figure snapshot", args.runs),
+        measure("figures built at import", args.runs, {"FIGURE_SNAPSHOT_PATH": os.devnull}),
+    ]
+    report = format_report(results, args.runs, args.top)
+    with open(args.output, "w", encoding="utf-8") as f:
+        f.write(report)
+    print(report)
+
+
+if __name__ == "__main__":
+    main()
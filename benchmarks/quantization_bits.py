@@ -0,0 +1,106 @@
+"""
+Storage size vs. round-trip throughput of scripts/quantization.py per bit depth.
+
+Builds an in-memory synthetic Sentinel-2 reflectance cube with
+synthetic_scene, then for every supported bit depth times quantize+pack and
+unpack+dequantize (per-band scale/offset), and reports packed size relative to
+float32 and to 16-bit storage, plus the maximum round-trip error.
+
+Usage:
+    python benchmarks/quantization_bits.py [--size 1024] [--runs 3] [--output benchmarks/quantization_report.md]
+"""
+import argparse
+import os
+import platform
+import statistics
+import sys
+import time
+
+import numpy as np
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, "scripts"))
+
+from quantization import BIT_DEPTHS, dequantize, pack_bits, quantize, unpack_bits  # noqa: E402
+from synthetic_scene import random_land_cover, scene_metadata, simulate_block  # noqa: E402
+
+
+def synthetic_cube(size, seed=0):
+    """(波段数, size, size) 的 float32 反射率立方体"""
+    land_cover = random_land_cover((size, size), cell=64, seed=seed)
+    centers_nm = np.array(scene_metadata("Sentinel-2", land_cover.shape)["center_nm"])
+    # simulate_block() 返回的是波段在后的转置视图，按 (波段, 行, 列) 连续存放后再计时
+    return np.ascontiguousarray(simulate_block(land_cover, centers_nm, np.random.SeedSequence(seed)))
+
+
+def measure(cube, bits, runs):
+    encode, decode = [], []
+    for _ in range(runs):
+        start = time.perf_counter()
+        codes, metadata = quantize(cube, bits, axis=0)
+        packed = pack_bits(codes, bits)
+        encode.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        restored = dequantize(unpack_bits(packed, bits, codes.size).reshape(cube.shape), metadata)
+        decode.append(time.perf_counter() - start)
+
+    scale = np.asarray(metadata["scale"])[:, None, None]
+    return {
+        "bits": bits,
+        "bytes": packed.nbytes,
+        "encode_s": statistics.median(encode),
+        "decode_s": statistics.median(decode),
+        "max_error_steps": float(np.nanmax(np.abs(restored - cube) / scale)),
+    }
+
+
+def format_report(results, cube, runs):
+    float_bytes = cube.size * 4
+    mpix = cube.size / 1e6
+    lines = [
+        "# Quantization / bit-packing report",
+        "",
+        f"Generated by `python benchmarks/quantization_bits.py --size {cube.shape[1]} --runs {runs}` "
+        f"(Python {platform.python_version()}, NumPy {np.__version__}, {platform.system()} {platform.machine()}).",
+        f"Input: synthetic Sentinel-2 cube {cube.shape}, float32, {float_bytes / 1e6:.1f} MB. "
+        "Per-band scale/offset; times are medians.",
+        "",
+        "| Bits | Packed (MB) | vs float32 | vs 16-bit | Encode (M values/s) | Decode (M values/s) | Max error (steps) |",
+        "|------|-------------|------------|-----------|---------------------|---------------------|-------------------|",
+    ]
+    for result in results:
+        lines.append(
+            f"| {result['bits']} | {result['bytes'] / 1e6:.1f} | {result['bytes'] / float_bytes:.0%} "
+            f"| {result['bytes'] / (cube.size * 2):.0%} | {mpix / result['encode_s']:.0f} "
+            f"| {mpix / result['decode_s']:.0f} | {result['max_error_steps']:.3f} |"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=1024, help="scene side length in pixels")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--output", default=os.path.join(REPO_ROOT, "benchmarks", "quantization_report.md"))
+    args = parser.parse_args()
+
+    cube = synthetic_cube(args.size)
+
+    # ±inf 不参与取值范围、与 NaN 一样写成填充值，其余像元的误差不受影响
+    probe = cube[:, :64, :64].copy()
+    probe[0, 0, :3] = (np.inf, -np.inf, np.nan)
+    codes, metadata = quantize(probe, 12, axis=0)
+    restored = dequantize(codes, metadata)
+    assert np.isnan(restored[0, 0, :3]).all() and np.isfinite(metadata["scale"]).all()
+    assert np.nanmax(np.abs(restored - probe)[:, 1:]) <= max(metadata["scale"]) / 2 * 1.001
+
+    results = [measure(cube, bits, args.runs) for bits in BIT_DEPTHS]
+    report = format_report(results, cube, args.runs)
+    with open(args.output, "w", encoding="utf-8") as f:
+        f.write(report)
+    print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+"""
+AHI 扫描调度离散事件模拟：Full Disk 分条带扫描 + 日本区 / 目标区 / 地标区穿插观测。
+
+ahi_scanning_rhythm.py 只是示意图（"Full Disk every 10 min + Target Areas every
+2.5 min"）；这里用 heapq 事件队列真正按时间推进：
+
+- 每个扇区按周期产生观测请求（REQUEST 事件），进入按 (优先级, 请求时间) 排序的就绪队列
+- 扫描镜一次只执行一个观测；Full Disk 拆成南北向的 23 个条带，每个条带结束后
+  都可以插入更高优先级的扇区（与 AHI 10 分钟时间线的做法一致）
+- 扫描镜在两个观测之间需要转动：耗时 = 稳定时间 + 两轴最大角距 / 转速
+- 地面指令（COMMAND 事件）可在任意时刻修改扇区的中心、周期、时长或启停
+- 每个扇区的重访间隔、请求延迟用流式统计（Welford 均值方差 + 定宽直方图分位数），
+  不保存逐次观测，模拟数月、数百万事件时内存不变
+- 被指令停用的时段单独记录在报告中（disabled_windows），跨越停用时段的间隔不计入重访统计
+
+扇区用 dict 描述，角度为扫描角 (E-W, N-S)，单位度，size 为观测范围的半宽：
+    {"period": 150.0, "duration": 8.0, "center": (2.0, 3.0), "size": (0.8, 0.8), "priority": 1}
+Full Disk 额外有 "swaths" 条带数，duration 为单个条带的时长。
+
+示例：
+    scheduler = ScanScheduler(default_sectors())
+    scheduler.add_command(3600, "Target", center=(-3.0, 1.0))
+    report = scheduler.run(30 * 86400)
+"""
+import heapq
+import math
+
+# 事件类型
+REQUEST, DONE, COMMAND = 0, 1, 2
+
+FULL_DISK = "Full Disk"
+# Full Disk 扫描范围的半张角 (度)，略大于地球边缘的 8.70°
+DISK_HALF_ANGLE = 8.8
+
+SLEW_SETTLE_S = 0.5
+SLEW_RATE_DEG_S = 5.0
+
+
+def default_sectors():
+    """AHI 风格的默认观测计划（周期、时长单位秒；优先级数值越小越先执行）"""
+    return {
+        FULL_DISK: {"period": 600.0, "duration": 14.0, "swaths": 23, "center": (0.0, 0.0),
+                    "size": (DISK_HALF_ANGLE, DISK_HALF_ANGLE), "priority": 2},
+        "Japan": {"period": 150.0, "duration": 8.0, "center": (-0.4, 5.3), "size": (1.6, 0.8), "priority": 1},
+        "Target": {"period": 150.0, "duration": 8.0, "center": (2.0, 3.0), "size": (0.8, 0.8), "priority": 1},
+        "Landmark 1": {"period": 30.0, "duration": 1.5, "center": (-1.5, 5.0), "size": (0.8, 0.4), "priority": 0},
+        "Landmark 2": {"period": 30.0, "duration": 1.5, "center": (1.0, 4.5), "size": (0.8, 0.4), "priority": 0},
+    }
+
+
+def swath_center(swath, swaths):
+    """Full Disk 第 swath 个条带的中心（由北向南）"""
+    step = 2 * DISK_HALF_ANGLE / swaths
+    return 0.0, DISK_HALF_ANGLE - (swath + 0.5) * step
+
+
+def swath_size(swaths):
+    """Full Disk 单个条带的半宽 (E-W, N-S)"""
+    return DISK_HALF_ANGLE, DISK_HALF_ANGLE / swaths
+
+
+def slew_time(a, b, settle=SLEW_SETTLE_S, rate=SLEW_RATE_DEG_S):
+    """两轴扫描镜独立转动，耗时由较大的那一轴决定；原地不动时为 0"""
+    distance = max(abs(a[0] - b[0]), abs(a[1] - b[1]))
+    return settle + distance / rate if distance > 0 else 0.0
+
+
+class RunningStats:
+    """流式统计：计数、均值、标准差、极值，以及定宽直方图近似的分位数"""
+
+    def __init__(self, bin_width=1.0, max_value=7200.0):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.bin_width = bin_width
+        # 最后一个桶收纳所有超出 max_value 的值
+        self._bins = [0] * (int(max_value / bin_width) + 1)
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self._bins[min(int(value / self.bin_width), len(self._bins) - 1)] += 1
+
+    @property
+    def std(self):
+        return math.sqrt(self._m2 / self.count) if self.count else 0.0
+
+    def quantile(self, q):
+        """分位数（取所在桶的上界，误差不超过 bin_width）"""
+        if not self.count:
+            return math.nan
+        target = q * self.count
+        seen = 0
+        for i, n in enumerate(self._bins):
+            seen += n
+            if seen >= target:
+                return min((i + 1) * self.bin_width, self.max)
+        return self.max
+
+    def summary(self):
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "std": self.std,
+            "min": self.min,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "max": self.max,
+        }
+
+
+class ScanScheduler:
+    """单台扫描仪的离散事件调度模拟"""
+
+    def __init__(self, sectors=None, settle=SLEW_SETTLE_S, rate=SLEW_RATE_DEG_S, timeline_limit=0):
+        self.sectors = {name: dict(sector) for name, sector in (sectors or default_sectors()).items()}
+        self.settle = settle
+        self.rate = rate
+        # 记录前 timeline_limit 次观测 (开始, 结束, 扇区, 条带, 中心, 半宽)，供绘图和覆盖分析使用
+        self.timeline_limit = timeline_limit
+        self._commands = []
+
+    def add_command(self, time, sector, **changes):
+        """在 time 秒时修改扇区参数，例如 center=(x, y)、period=60.0、enabled=False"""
+        self._commands.append((float(time), sector, changes))
+
+    def run(self, duration):
+        """模拟 [0, duration) 秒，返回统计报告 dict（不修改 self.sectors，可重复调用）"""
+        sectors = {name: dict(sector) for name, sector in self.sectors.items()}
+        events = []
+        seq = 0
+        disabled_since = {}         # 扇区 -> 停用开始时刻（仍在停用中）
+        disabled_windows = {name: [] for name in sectors}
+        for name, sector in sectors.items():
+            sector.setdefault("enabled", True)
+            sector["generation"] = 0
+            if not sector["enabled"]:
+                disabled_since[name] = 0.0
+            if sector["enabled"]:
+                events.append((0.0, seq, REQUEST, name, 0))
+                seq += 1
+        for time, name, changes in self._commands:
+            events.append((time, seq, COMMAND, name, changes))
+            seq += 1
+        heapq.heapify(events)
+
+        ready = []                  # (优先级, 请求时间, 序号, 扇区, 条带)
+        pending = set()             # 已请求但尚未完成的扇区
+        last_done = {name: None for name in sectors}
+        revisit = {name: RunningStats() for name in sectors}
+        latency = {name: RunningStats() for name in sectors}
+        overruns = dict.fromkeys(sectors, 0)
+        observations = dict.fromkeys(sectors, 0)
+        request_time = {}
+        timeline = []
+
+        pointing = (0.0, 0.0)
+        busy = False
+        busy_time = slew_total = 0.0
+        processed = 0
+        heappush, heappop = heapq.heappush, heapq.heappop
+
+        while events:
+            now, _, kind, name, arg = heappop(events)
+            if now >= duration:
+                break
+            processed += 1
+            sector = sectors[name]
+
+            if kind == REQUEST:
+                if arg != sector["generation"] or not sector["enabled"]:
+                    continue            # 地面指令修改周期后作废的旧请求
+                heappush(events, (now + sector["period"], seq, REQUEST, name, arg))
+                seq += 1
+                if name in pending:
+                    overruns[name] += 1     # 上一次还没扫完，本次请求丢弃
+                    continue
+                pending.add(name)
+                request_time[name] = now
+                heappush(ready, (sector["priority"], now, seq, name, 0))
+                seq += 1
+
+            elif kind == DONE:
+                busy = False
+                swaths = sector.get("swaths", 1)
+                if arg + 1 < swaths:
+                    # Full Disk 下一个条带重新排队，让更高优先级的扇区先插入
+                    heappush(ready, (sector["priority"], request_time[name], seq, name, arg + 1))
+                    seq += 1
+                else:
+                    pending.discard(name)
+                    observations[name] += 1
+                    if last_done[name] is not None:
+                        revisit[name].add(now - last_done[name])
+                    last_done[name] = now
+
+            else:   # COMMAND
+                period = sector.get("period")
+                enabled = sector.get("enabled", True)
+                sector.update(arg)
+                if enabled and not sector["enabled"]:
+                    disabled_since[name] = now
+                elif not enabled and sector["enabled"]:
+                    disabled_windows[name].append((disabled_since.pop(name), now))
+                    # 停用期间的空档不是重访间隔，重新启用后从下一次观测开始计
+                    last_done[name] = None
+                if sector["enabled"] and (sector.get("period") != period or not enabled):
+                    # 新周期从指令时刻起算
+                    sector["generation"] += 1
+                    heappush(events, (now, seq, REQUEST, name, sector["generation"]))
+                    seq += 1
+
+            if not busy and ready:
+                priority, requested, _, job, swath = heappop(ready)
+                job_sector = sectors[job]
+                swaths = job_sector.get("swaths", 1)
+                if swaths > 1:
+                    center, size = swath_center(swath, swaths), swath_size(swaths)
+                else:
+                    center, size = job_sector["center"], job_sector["size"]
+                slew = slew_time(pointing, center, self.settle, self.rate)
+                start = now + slew
+                end = start + job_sector["duration"]
+                if swath == 0:
+                    latency[job].add(start - requested)
+                if len(timeline) < self.timeline_limit:
+                    timeline.append((start, end, job, swath, center, size))
+                pointing = center
+                busy = True
+                slew_total += slew
+                busy_time += end - now
+                heappush(events, (end, seq, DONE, job, swath))
+                seq += 1
+
+        for name, since in disabled_since.items():
+            disabled_windows[name].append((since, duration))
+
+        return {
+            "duration_s": duration,
+            "events": processed,
+            "duty_cycle": busy_time / duration,
+            "slew_fraction": slew_total / duration,
+            "sectors": {
+                name: {
+                    "observations": observations[name],
+                    "revisit_s": revisit[name].summary(),
+                    "latency_s": latency[name].summary(),
+                    "overruns": overruns[name],
+                    "disabled_windows": disabled_windows[name],
+                }
+                for name in sectors
+            },
+            "timeline": timeline,
+        }
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Discrete-event simulation of the AHI scan schedule")
+    parser.add_argument("--days", type=float, default=90.0, help="simulated time span in days")
+    args = parser.parse_args()
+
+    scheduler = ScanScheduler()
+    # 示例地面指令：第 10 天把目标区移到台风位置，并把地标区 2 停用一天
+    scheduler.add_command(10 * 86400, "Target", center=(-3.0, 1.0))
+    scheduler.add_command(20 * 86400, "Landmark 2", enabled=False)
+    scheduler.add_command(21 * 86400, "Landmark 2", enabled=True)
+
+    start = time.perf_counter()
+    report = scheduler.run(args.days * 86400)
+    elapsed = time.perf_counter() - start
+
+    print(f"{args.days:g} days, {report['events']:,} events in {elapsed:.1f} s "
+          f"({report['events'] / elapsed:,.0f} events/s)")
+    print(f"Duty cycle {report['duty_cycle']:.1%}, slewing {report['slew_fraction']:.1%}\n")
+    print(f"{'Sector':<11} {'obs':>8} {'mean':>7} {'std':>6} {'p95':>6} {'max':>7} {'latency':>8} {'overruns':>8} "
+          f"{'disabled h':>10}")
+    for name, stats in report["sectors"].items():
+        r, lat = stats["revisit_s"], stats["latency_s"]
+        if not r["count"]:
+            continue
+        disabled = sum(end - begin for begin, end in stats["disabled_windows"]) / 3600
+        print(f"{name:<11} {stats['observations']:>8,} {r['mean']:>7.1f} {r['std']:>6.2f} {r['p95']:>6.0f} "
+              f"{r['max']:>7.1f} {lat['mean']:>8.2f} {stats['overruns']:>8} {disabled:>10.1f}")
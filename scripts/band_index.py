@@ -0,0 +1,168 @@
+"""
+波段区间索引：按波长快速查询波段。
+
+基于 spectral_bands.band_table() 的 lower/upper 边界构建静态的居中区间树
+(centered interval tree)，支持：
+
+- stab(x)               包含波长 x 的全部波段，O(log n + k)
+- overlapping(lo, hi)   与 [lo, hi] 有交集的全部波段，O(log n + k)
+- overlap_join(...)     两颗卫星之间两两重叠的波段对（扫描线），O((n + m) log(n + m) + k)
+
+区间按闭区间处理，端点相接也算重叠。查询结果是 band_table() 的行号数组。
+
+示例：
+    index = band_index()
+    table = band_table()
+    table[index.stab(0.85)]                     # 覆盖 0.85 μm NIR 的全部波段
+    overlap_join(table, "Landsat 9", "Sentinel-2")
+"""
+from functools import lru_cache
+
+import numpy as np
+
+from spectral_bands import band_table, sensor_mask
+
+
+class BandIntervalIndex:
+    """静态区间树，构建后不可修改"""
+
+    def __init__(self, lower, upper):
+        self.lower = np.asarray(lower, dtype=np.float64)
+        self.upper = np.asarray(upper, dtype=np.float64)
+        if self.lower.shape != self.upper.shape or self.lower.ndim != 1:
+            raise ValueError("lower and upper must be 1-D arrays of the same length")
+        if np.any(self.lower > self.upper):
+            raise ValueError("every interval needs lower <= upper")
+
+        # 全局按下界排序，用于范围查询中“起点落在 (lo, hi]”的部分
+        self._order_by_lower = np.argsort(self.lower, kind="stable")
+        self._sorted_lower = self.lower[self._order_by_lower]
+        self._root = self._build(np.arange(len(self.lower)))
+
+    @classmethod
+    def from_table(cls, table):
+        return cls(table["lower"], table["upper"])
+
+    def __len__(self):
+        return len(self.lower)
+
+    def _build(self, indices):
+        """
+        递归构建节点：(center, left, right, 按下界升序的下界/行号, 按上界降序取负后的上界/行号)。
+        包含 center 的区间存在本节点，完全在左/右侧的区间进入子树。
+        """
+        if len(indices) == 0:
+            return None
+        endpoints = np.concatenate([self.lower[indices], self.upper[indices]])
+        center = float(np.median(endpoints))
+
+        lower = self.lower[indices]
+        upper = self.upper[indices]
+        left = indices[upper < center]
+        right = indices[lower > center]
+        here = indices[(lower <= center) & (upper >= center)]
+
+        by_lower = here[np.argsort(self.lower[here], kind="stable")]
+        by_upper = here[np.argsort(-self.upper[here], kind="stable")]
+        return (
+            center,
+            self._build(left),
+            self._build(right),
+            self.lower[by_lower], by_lower,
+            -self.upper[by_upper], by_upper,
+        )
+
+    def stab(self, x):
+        """包含波长 x (μm) 的区间行号，升序"""
+        found = []
+        node = self._root
+        while node is not None:
+            center, left, right, lowers, by_lower, neg_uppers, by_upper = node
+            if x < center:
+                # 本节点区间都包含 center > x，只需 lower <= x
+                found.append(by_lower[:np.searchsorted(lowers, x, side="right")])
+                node = left
+            elif x > center:
+                # 只需 upper >= x，即 -upper <= -x
+                found.append(by_upper[:np.searchsorted(neg_uppers, -x, side="right")])
+                node = right
+            else:
+                found.append(by_lower)
+                break
+        if not found:
+            return np.empty(0, dtype=np.intp)
+        return np.sort(np.concatenate(found))
+
+    def overlapping(self, lo, hi):
+        """
+        与 [lo, hi] 相交的区间行号，升序。
+        相交的区间要么包含 lo（stab），要么起点落在 (lo, hi]，两部分互不重复。
+        """
+        if lo > hi:
+            raise ValueError("lo must be <= hi")
+        start = np.searchsorted(self._sorted_lower, lo, side="right")
+        stop = np.searchsorted(self._sorted_lower, hi, side="right")
+        return np.sort(np.concatenate([self.stab(lo), self._order_by_lower[start:stop]]))
+
+
+def overlap_join(table, sensor_a, sensor_b):
+    """
+    两颗卫星之间所有相互重叠的波段对，返回 [(row_a, row_b), ...]（band_table 行号）。
+    扫描线：端点排序后依次处理，区间开始时与另一颗卫星当前活跃的区间逐一配对。
+    """
+    rows_a = sensor_mask(table, sensor_a).nonzero()[0]
+    rows_b = sensor_mask(table, sensor_b).nonzero()[0]
+    rows = np.concatenate([rows_a, rows_b])
+    side = np.concatenate([np.zeros(len(rows_a), dtype=np.int8), np.ones(len(rows_b), dtype=np.int8)])
+
+    # 事件：(坐标, 类型)；闭区间下同一坐标先处理开始(0)再处理结束(1)
+    coords = np.concatenate([table["lower"][rows], table["upper"][rows]])
+    kinds = np.concatenate([np.zeros(len(rows), dtype=np.int8), np.ones(len(rows), dtype=np.int8)])
+    owners = np.concatenate([np.arange(len(rows)), np.arange(len(rows))])
+    order = np.lexsort((kinds, coords))
+
+    active = ({}, {})   # 每颗卫星当前活跃的区间 {行号: None}，保持插入顺序
+    pairs = []
+    for event in order:
+        owner = owners[event]
+        row = int(rows[owner])
+        which = side[owner]
+        if kinds[event] == 0:
+            for other in active[1 - which]:
+                pairs.append((row, other) if which == 0 else (other, row))
+            active[which][row] = None
+        else:
+            del active[which][row]
+    return sorted(pairs)
+
+
+def overlap_regions(table, sensor_a, sensor_b):
+    """
+    两颗卫星重叠波段对及其交集波长范围：[(row_a, row_b, lo, hi), ...]。
+    端点相接（交集宽度为 0）的波段对不计入。
+    """
+    regions = []
+    for row_a, row_b in overlap_join(table, sensor_a, sensor_b):
+        lo = max(table["lower"][row_a], table["lower"][row_b])
+        hi = min(table["upper"][row_a], table["upper"][row_b])
+        if hi > lo:
+            regions.append((row_a, row_b, float(lo), float(hi)))
+    return regions
+
+
+@lru_cache(maxsize=None)
+def band_index():
+    """spectral_bands.band_table() 对应的区间索引（构建一次后复用）"""
+    return BandIntervalIndex.from_table(band_table())
+
+
+if __name__ == "__main__":
+    from spectral_bands import band_labels
+
+    table = band_table()
+    index = band_index()
+    print("Bands covering 0.85 μm:", band_labels(table[index.stab(0.85)]))
+    print("Bands overlapping 0.60-0.70 μm:", band_labels(table[index.overlapping(0.60, 0.70)]))
+    print("Landsat 9 / Sentinel-2 overlapping band pairs:")
+    for row_a, row_b, lo, hi in overlap_regions(table, "Landsat 9", "Sentinel-2"):
+        print(f"  {table['band'][row_a]:>4} ∩ {table['band'][row_b]:<4} {lo:.3f}-{hi:.3f} μm")
@@ -0,0 +1,68 @@
+"""
+卫星波段矩形的批量绘制，app.py、landsat_sentinel_static.py 与
+landsat_sentinel_interactive.py 共用这一份实现。
+
+每颗卫星每个子图只用一个 go.Bar trace：逐波段的中心/宽度/颜色以数组传入，
+悬停信息（含波段平均大气透过率）放在 customdata 中，
+trace 数从每波段一个降为每卫星每子图一个。
+"""
+
+# 悬停文字与图例名称，static 脚本的图表是中文
+HOVER_LABELS = {
+    "en": {"bands": "bands", "wavelength": "Wavelength", "resolution": "Resolution",
+           "description": "Description", "transmission": "Mean transmission"},
+    "zh": {"bands": "波段", "wavelength": "波长", "resolution": "分辨率",
+           "description": "描述", "transmission": "平均透过率"},
+}
+
+
+def add_batched_band_traces(fig, satellite_name, bands, show_satellite=True, language="en"):
+    """
+    在 1 × 2 子图（左：可见光到近红外，右：热红外）上批量绘制一颗卫星的全部波段矩形。
+    show_satellite: 悬停标题中是否带卫星名
+    language: HOVER_LABELS 中的语言
+    """
+    # plotly 在真正构建图表时才导入，app.py 命中快照时不需要它
+    import plotly.graph_objects as go
+    from band_transmission import transmission_lookup
+
+    mean_transmission = transmission_lookup()
+    text = HOVER_LABELS[language]
+
+    label = f"{satellite_name} " if show_satellite else ""
+    panels = (
+        (1, [band for band in bands if band["Range"][1] <= 2.5]),   # 可见光到近红外
+        (2, [band for band in bands if band["Range"][0] >= 10]),    # 热红外
+    )
+    show_legend = True
+    for col, panel_bands in panels:
+        if not panel_bands:
+            continue
+        colors = [band["Color"] for band in panel_bands]
+        fig.add_trace(
+            go.Bar(
+                x=[(band["Range"][0] + band["Range"][1]) / 2 for band in panel_bands],
+                y=[100] * len(panel_bands),
+                base=0,
+                width=[band["Range"][1] - band["Range"][0] for band in panel_bands],
+                name=f"{satellite_name} {text['bands']}",
+                legendgroup=satellite_name,
+                showlegend=show_legend,
+                marker=dict(color=colors, line=dict(color=colors, width=1)),
+                opacity=0.7,
+                customdata=[
+                    [label + band["Band"], band["Range"][0], band["Range"][1], band["Resolution"], band["Description"],
+                     mean_transmission[(satellite_name, band["Band"])]]
+                    for band in panel_bands
+                ],
+                hovertemplate="<b>%{customdata[0]}</b><br>" +
+                              f"{text['wavelength']}: " + "%{customdata[1]}-%{customdata[2]} μm<br>" +
+                              f"{text['resolution']}: " + "%{customdata[3]}<br>" +
+                              f"{text['description']}: " + "%{customdata[4]}<br>" +
+                              f"{text['transmission']}: " + "%{customdata[5]:.1f}%<extra></extra>"
+            ),
+            row=1, col=col
+        )
+        show_legend = False
+    # 波段之间有重叠，柱子需叠放而不是并排
+    fig.update_layout(barmode='overlay')
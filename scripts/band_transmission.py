@@ -0,0 +1,114 @@
+"""
+波段积分大气透过率：计算每个波段实际能透过大气的比例。
+
+把透过率曲线插值到统一的细网格上，用梯形法求累积积分 C(λ)，
+任意波段 [a, b] 的积分就是 C(b) - C(a)（端点处按线性插值精确补齐），
+所以全部卫星的全部波段只需一次批量运算：
+
+    O(G) 建累积积分 + O(B log G) 查端点，G 为网格点数，B 为波段数
+
+透过率曲线换成 10^5 采样的高分辨率廓线时，直接把它作为 grid/values 传给
+band_mean_transmission() 即可，无需再重采样。
+"""
+from functools import lru_cache
+
+import numpy as np
+
+from spectral_bands import SENSORS, band_table, transmission_curve
+
+DEFAULT_STEP_UM = 0.001
+
+
+def resample_curve(wavelength_um, transmission_pct, step_um=DEFAULT_STEP_UM):
+    """把透过率曲线线性插值到步长为 step_um 的均匀网格"""
+    wavelength_um = np.asarray(wavelength_um, dtype=np.float64)
+    count = int(round((wavelength_um[-1] - wavelength_um[0]) / step_um)) + 1
+    grid = np.linspace(wavelength_um[0], wavelength_um[-1], count)
+    return grid, np.interp(grid, wavelength_um, transmission_pct)
+
+
+def cumulative_trapezoid(grid, values):
+    """梯形法累积积分，C[0] = 0"""
+    cumulative = np.empty_like(grid, dtype=np.float64)
+    cumulative[0] = 0.0
+    np.cumsum(np.diff(grid) * (values[1:] + values[:-1]) * 0.5, out=cumulative[1:])
+    return cumulative
+
+
+def _cumulative_at(x, grid, values, cumulative):
+    """在任意波长 x 处求累积积分（x 落在网格点之间时补上最后一小段梯形）"""
+    x = np.clip(x, grid[0], grid[-1])
+    i = np.clip(np.searchsorted(grid, x, side="right") - 1, 0, len(grid) - 1)
+    value_at_x = np.interp(x, grid, values)
+    return cumulative[i] + (x - grid[i]) * (values[i] + value_at_x) * 0.5
+
+
+def band_integrals(lower, upper, grid, values, cumulative=None):
+    """每个波段 [lower, upper] 上透过率曲线的积分（单位：% · μm）"""
+    if cumulative is None:
+        cumulative = cumulative_trapezoid(grid, values)
+    return (_cumulative_at(np.asarray(upper), grid, values, cumulative)
+            - _cumulative_at(np.asarray(lower), grid, values, cumulative))
+
+
+def band_mean_transmission(lower, upper, grid, values, cumulative=None):
+    """每个波段的平均透过率 (%)，即积分除以波段宽度"""
+    lower = np.asarray(lower, dtype=np.float64)
+    upper = np.asarray(upper, dtype=np.float64)
+    return band_integrals(lower, upper, grid, values, cumulative) / (upper - lower)
+
+
+@lru_cache(maxsize=None)
+def registry_band_transmission(step_um=DEFAULT_STEP_UM):
+    """
+    spectral_bands 中全部波段的平均透过率 (%)，与 band_table() 逐行对应。
+    结果缓存，返回只读数组。
+    """
+    table = band_table()
+    grid, values = resample_curve(*transmission_curve(), step_um=step_um)
+    mean = band_mean_transmission(table["lower"], table["upper"], grid, values)
+    mean.flags.writeable = False
+    return mean
+
+
+def transmission_lookup():
+    """{(卫星名, 波段名): 平均透过率 %}，便于绘图代码按 dict 波段查询"""
+    table = band_table()
+    mean = registry_band_transmission()
+    return {
+        (SENSORS[row["sensor"]], row["band"]): float(value)
+        for row, value in zip(table, mean)
+    }
+
+
+def transmission_rows():
+    """表格用的行列表（每个波段一行），平均透过率保留一位小数"""
+    table = band_table()
+    mean = registry_band_transmission()
+    return [
+        {
+            "Satellite": SENSORS[row["sensor"]],
+            "Band": str(row["band"]),
+            "Description": str(row["description"]),
+            "Range (μm)": f"{row['lower']:g}-{row['upper']:g}",
+            "Resolution (m)": float(row["resolution_m"]),
+            "Mean transmission (%)": round(float(value), 1),
+        }
+        for row, value in zip(table, mean)
+    ]
+
+
+if __name__ == "__main__":
+    import time
+
+    for row in sorted(transmission_rows(), key=lambda r: r["Mean transmission (%)"], reverse=True):
+        print(f"{row['Satellite']:<11} {row['Band']:<4} {row['Description']:<16} {row['Mean transmission (%)']:5.1f}%")
+
+    # 高分辨率廓线：10^5 个采样点直接作为网格
+    table = band_table()
+    wavelength_um, transmission_pct = transmission_curve()
+    fine_grid = np.linspace(wavelength_um[0], wavelength_um[-1], 100_000)
+    fine_values = np.interp(fine_grid, wavelength_um, transmission_pct)
+    start = time.perf_counter()
+    band_mean_transmission(table["lower"], table["upper"], fine_grid, fine_values)
+    print(f"\n{len(table)} bands on a {len(fine_grid)}-sample profile: {(time.perf_counter() - start) * 1e3:.2f} ms")
@@ -0,0 +1,221 @@
+"""
+笔记站点 (index.md, Jekyll) 的增量资源构建：按内容哈希只处理有变化的图片。
+
+1. 脚本生成的插图（assets/Figure_*.png）交给 export_figures：构建脚本或数据未变时跳过
+2. index.md 中用 responsive-image.html 引用的图生成缩小的 WebP 版本（VARIANT_WIDTHS 中小于原宽度的各档 + 原宽度），
+   文件名带内容哈希，如 assets/variants/Figure_1-960w.3f2a9c41d0.webp，可长期缓存；
+   源图哈希与参数都没变时跳过，源图变化后旧版本自动删除
+3. 写出 _data/responsive_images.json，供 _includes/responsive-image.html 生成
+   <picture> + srcset；浏览器按显示宽度只下载一档 WebP，不支持时回退到原图
+
+清单 assets/variants/manifest.json 记录每张源图的哈希、尺寸与各版本文件。
+需要 Pillow（带 WebP 支持）。
+
+在 index.md 中使用：
+    {% include responsive-image.html src="assets/Figure_1.png" alt="Figure_1" %}
+
+示例：
+    python scripts/build_assets.py                 # 增量构建
+    python scripts/build_assets.py --force --workers 4
+"""
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from export_figures import FIGURES, REPO_ROOT, export_figures, figure_spec, file_digest, output_paths
+
+try:
+    from PIL import Image    # 可选依赖，只有构建资源时需要
+except ImportError:
+    Image = None
+
+DEFAULT_MARKDOWN = os.path.join(REPO_ROOT, "index.md")
+VARIANTS_DIR = os.path.join("assets", "variants")
+DATA_PATH = os.path.join("_data", "responsive_images.json")
+MANIFEST_NAME = "manifest.json"
+
+# Cayman 主题正文最宽约 64rem (1024 px)；再加一档给高分屏
+VARIANT_WIDTHS = (480, 960, 1600)
+WEBP_QUALITY = 80
+
+# ![alt](assets/...)、<img src="assets/..."> 与 {% include responsive-image.html src="assets/..." %}
+_IMAGE_PATTERN = re.compile(r'!\[[^\]]*\]\((assets/[^)]+)\)|<img[^>]*\bsrc="(assets/[^"]+)"'
+                            r'|\{%-?\s*include\s+responsive-image\.html[^%]*\bsrc="(assets/[^"]+)"')
+# 只有 include 引用的图会用到 WebP 版本，普通 markdown 图片直接用原图
+_INCLUDE_PATTERN = re.compile(r'\{%-?\s*include\s+responsive-image\.html[^%]*\bsrc="(assets/[^"]+)"')
+_UNSAFE_CHARS = re.compile(r"[^A-Za-z0-9._-]+")
+
+
+def referenced_assets(markdown_path=DEFAULT_MARKDOWN):
+    """markdown 中引用的 assets/ 图片（相对仓库根目录的路径），按首次出现的顺序去重"""
+    with open(markdown_path, encoding="utf-8") as f:
+        text = f.read()
+    return list(dict.fromkeys(next(filter(None, groups)) for groups in _IMAGE_PATTERN.findall(text)))
+
+
+def responsive_assets(markdown_path=DEFAULT_MARKDOWN):
+    """markdown 中通过 responsive-image.html 引用的 assets/ 图片，按首次出现的顺序去重"""
+    with open(markdown_path, encoding="utf-8") as f:
+        text = f.read()
+    return list(dict.fromkeys(_INCLUDE_PATTERN.findall(text)))
+
+
+def variant_widths(width, widths=VARIANT_WIDTHS):
+    """小于原宽度的各档宽度，加上原宽度本身"""
+    return [w for w in widths if w < width] + [width]
+
+
+def variant_name(source, width, digest):
+    stem = _UNSAFE_CHARS.sub("-", os.path.splitext(os.path.basename(source))[0]).strip("-")
+    return f"{stem}-{width}w.{digest[:10]}.webp"
+
+
+def build_variants(source, digest, root=REPO_ROOT, widths=VARIANT_WIDTHS, quality=WEBP_QUALITY):
+    """为一张源图写出各档 WebP，返回清单条目"""
+    with Image.open(os.path.join(root, source)) as image:
+        image.load()
+        width, height = image.size
+        has_alpha = image.mode in ("RGBA", "LA") or "transparency" in image.info
+        image = image.convert("RGBA" if has_alpha else "RGB")
+        variants = []
+        for target in variant_widths(width, widths):
+            resized = image if target == width else image.resize(
+                (target, max(1, round(height * target / width))), Image.LANCZOS, reducing_gap=3.0)
+            name = variant_name(source, target, digest)
+            path = os.path.join(root, VARIANTS_DIR, name)
+            resized.save(path, "WEBP", quality=quality, method=4)
+            variants.append({"width": target, "file": name, "bytes": os.path.getsize(path)})
+    return {
+        "hash": digest,
+        "width": width,
+        "height": height,
+        "bytes": os.path.getsize(os.path.join(root, source)),
+        "settings": {"widths": list(widths), "quality": quality},
+        "variants": variants,
+    }
+
+
+def _load_manifest(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _up_to_date(entry, digest, variants_dir, widths, quality):
+    return (entry.get("hash") == digest
+            and entry.get("settings") == {"widths": list(widths), "quality": quality}
+            and all(os.path.exists(os.path.join(variants_dir, variant["file"])) for variant in entry["variants"]))
+
+
+def responsive_data(manifest):
+    """_data/responsive_images.json：{源图路径: {width, height, srcset: [{file, width}, ...]}}"""
+    return {
+        source: {
+            "width": entry["width"],
+            "height": entry["height"],
+            "srcset": [{"file": f"{VARIANTS_DIR}/{variant['file']}".replace(os.sep, "/"), "width": variant["width"]}
+                       for variant in entry["variants"]],
+        }
+        for source, entry in manifest.items()
+    }
+
+
+def build_assets(markdown_path=DEFAULT_MARKDOWN, root=REPO_ROOT, figures=True, workers=None, force=False,
+                 widths=VARIANT_WIDTHS, quality=WEBP_QUALITY):
+    """
+    增量构建，返回 {"figures": export_figures() 的结果, "variants": {源图: "built" / "skipped"},
+    "missing": markdown 中引用但不存在的文件}
+    """
+    if Image is None:
+        raise ImportError("build_assets() requires Pillow")
+    sources = referenced_assets(markdown_path)
+    assets_dir = os.path.join(root, "assets")
+
+    # 1. 由脚本生成、且被 markdown 引用的插图
+    figure_status = {}
+    if figures:
+        names = [name for name in FIGURES
+                 if any(os.path.relpath(path, root).replace(os.sep, "/") in sources
+                        for path in output_paths(figure_spec(name), assets_dir))]
+        figure_status = export_figures(names, assets_dir, workers, force)
+
+    # 2. WebP 版本，只为 include 引用的图生成
+    responsive = responsive_assets(markdown_path)
+    variants_dir = os.path.join(root, VARIANTS_DIR)
+    os.makedirs(variants_dir, exist_ok=True)
+    manifest_path = os.path.join(variants_dir, MANIFEST_NAME)
+    old_manifest = _load_manifest(manifest_path)
+    missing = [source for source in sources if not os.path.exists(os.path.join(root, source))]
+    manifest, status, pending = {}, {}, []
+    for source in responsive:
+        if source in missing:
+            continue
+        digest = file_digest(os.path.join(root, source))
+        entry = old_manifest.get(source, {})
+        if not force and _up_to_date(entry, digest, variants_dir, widths, quality):
+            manifest[source] = entry
+            status[source] = "skipped"
+        else:
+            pending.append((source, digest))
+
+    if workers == 1 or len(pending) <= 1:
+        entries = [build_variants(source, digest, root, widths, quality) for source, digest in pending]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(build_variants, source, digest, root, widths, quality) for source, digest in pending]
+            entries = [future.result() for future in futures]
+    for (source, _), entry in zip(pending, entries):
+        manifest[source] = entry
+        status[source] = "built"
+    manifest = {source: manifest[source] for source in responsive if source in manifest}
+
+    # 清理不再被清单引用的旧版本
+    keep = {variant["file"] for entry in manifest.values() for variant in entry["variants"]} | {MANIFEST_NAME}
+    for name in os.listdir(variants_dir):
+        if name not in keep:
+            os.remove(os.path.join(variants_dir, name))
+
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    data_path = os.path.join(root, DATA_PATH)
+    os.makedirs(os.path.dirname(data_path), exist_ok=True)
+    with open(data_path, "w", encoding="utf-8") as f:
+        json.dump(responsive_data(manifest), f, indent=2)
+    return {"figures": figure_status, "variants": status, "missing": missing, "manifest": manifest}
+
+
+def page_weight(manifest, display_width=960):
+    """(原图总字节数, 按 display_width 显示时各图所选 WebP 的总字节数)"""
+    original = sum(entry["bytes"] for entry in manifest.values())
+    served = 0
+    for entry in manifest.values():
+        fitting = [variant for variant in entry["variants"] if variant["width"] >= display_width]
+        served += (min(fitting, key=lambda v: v["width"]) if fitting else entry["variants"][-1])["bytes"]
+    return original, served
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Incrementally build figures and responsive WebP variants.")
+    parser.add_argument("--markdown", default=DEFAULT_MARKDOWN)
+    parser.add_argument("--skip-figures", action="store_true", help="do not re-render script-generated figures")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--force", action="store_true", help="rebuild everything regardless of hashes")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    result = build_assets(args.markdown, figures=not args.skip_figures, workers=args.workers, force=args.force)
+    for name, state in result["figures"].items():
+        print(f"figure  {name:<60} {state}")
+    for source, state in result["variants"].items():
+        print(f"variant {source:<60} {state}")
+    for source in result["missing"]:
+        print(f"missing {source}")
+    original, served = page_weight(result["manifest"])
+    built = sum(state == "built" for state in result["variants"].values())
+    print(f"{built} images rebuilt, {len(result['variants']) - built} skipped in {time.perf_counter() - start:.2f} s")
+    print(f"Responsive images: {original / 1e6:.1f} MB original -> {served / 1e6:.1f} MB as 960w WebP")
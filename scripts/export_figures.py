@@ -0,0 +1,217 @@
+"""
+无界面批量导出：用 Agg 后端渲染全部示意图，多进程并行写出 PNG / SVG / HTML。
+
+scripts/ 里的绘图脚本都提供返回 Figure 的构建函数（matplotlib 脚本为 build_figure()，
+波段对比图为 landsat_sentinel_static.create_comparison_chart()），原来的 plt.show()
+只在 `__main__` 下执行；这里直接导入这些函数，不弹窗，适合 CI 和渲染机。
+
+增量导出：每张图的输入指纹 = 构建脚本源码 + 依赖文件（如 spectral_bands.py 中的波段数据）
++ 构建参数 + 输出设置的 SHA-256，记录在输出目录的 figure_manifest.json 中；
+指纹未变且输出文件都在时跳过该图。
+
+FIGURES 中 Figure_1..3 对应 index.md 引用的 assets/Figure_*.png（2048 × 1047 像素），
+ahi_scanning_pattern 对应 assets/Advanced Himawari Imager (AHI) Scanning Pattern.png（964 × 1006）。
+plotly 图输出 HTML；安装 kaleido 时也可输出 PNG / SVG。
+
+示例：
+    python scripts/export_figures.py                      # 写入 assets/，未变化的图跳过
+    python scripts/export_figures.py --only Figure_3 --force
+    python scripts/export_figures.py --output build/figures --workers 4
+"""
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(SCRIPTS_DIR)
+DEFAULT_OUTPUT = os.path.join(REPO_ROOT, "assets")
+MANIFEST_NAME = "figure_manifest.json"
+
+# 与 assets/Figure_*.png 一致的画布：20.48 × 10.47 英寸 × 100 dpi
+ASSET_SIZE = (20.48, 10.47)
+
+# 波段对比图的数据与共用的批量绘制代码
+BAND_CHART_DEPENDS = ("spectral_bands.py", "band_traces.py", "band_transmission.py")
+
+# index.md 中 AHI 扫描示意图的画布：9.64 × 10.06 英寸 × 100 dpi
+AHI_ASSET_SIZE = (9.64, 10.06)
+
+# 图名: module / builder / kwargs / depends（除构建脚本外的输入文件，相对 scripts/）/ output（输出文件名，
+# 缺省为图名）/ formats / size / dpi
+FIGURES = {
+    "Figure_1": {"module": "electromagnetic_wave_components", "size": ASSET_SIZE},
+    "Figure_2": {"module": "toy_reflectance_simulation", "kwargs": {"rng": 42}, "size": ASSET_SIZE},
+    "Figure_3": {"module": "polarization_vector_projection", "depends": ("polarization.py",), "size": ASSET_SIZE},
+    "ahi_scanning_pattern": {
+        "module": "ahi_scanning_rhythm", "output": "Advanced Himawari Imager (AHI) Scanning Pattern",
+        "size": AHI_ASSET_SIZE,
+    },
+    "band_comparison": {
+        "module": "landsat_sentinel_static", "builder": "create_comparison_chart",
+        "kwargs": {"selected_satellite": "Both"}, "depends": BAND_CHART_DEPENDS, "formats": ("html",),
+    },
+    "band_comparison_landsat9": {
+        "module": "landsat_sentinel_static", "builder": "create_comparison_chart",
+        "kwargs": {"selected_satellite": "Landsat 9"}, "depends": BAND_CHART_DEPENDS, "formats": ("html",),
+    },
+    "band_comparison_sentinel2": {
+        "module": "landsat_sentinel_static", "builder": "create_comparison_chart",
+        "kwargs": {"selected_satellite": "Sentinel-2"}, "depends": BAND_CHART_DEPENDS, "formats": ("html",),
+    },
+}
+DEFAULT_FORMATS = ("png",)
+DEFAULT_DPI = 100
+
+
+def figure_spec(name):
+    """补全缺省字段后的图描述"""
+    spec = {"builder": "build_figure", "kwargs": {}, "depends": (), "output": name, "formats": DEFAULT_FORMATS,
+            "size": None, "dpi": DEFAULT_DPI}
+    spec.update(FIGURES[name])
+    return spec
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def input_fingerprint(spec):
+    """构建脚本源码哈希 + 依赖数据哈希 + 参数，合成一个指纹"""
+    sources = [spec["module"] + ".py"] + list(spec["depends"])
+    payload = {
+        "files": {source: file_digest(os.path.join(SCRIPTS_DIR, source)) for source in sources},
+        "builder": spec["builder"],
+        "kwargs": spec["kwargs"],
+        "output": spec["output"],
+        "formats": list(spec["formats"]),
+        "size": spec["size"],
+        "dpi": spec["dpi"],
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def output_paths(spec, output_dir):
+    return [os.path.join(output_dir, f"{spec['output']}.{fmt}") for fmt in spec["formats"]]
+
+
+def load_manifest(output_dir):
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_manifest(output_dir, manifest):
+    with open(os.path.join(output_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+
+def _init_worker():
+    """子进程在导入任何绘图脚本之前切到 Agg 后端"""
+    os.environ["MPLBACKEND"] = "Agg"
+    if SCRIPTS_DIR not in sys.path:
+        sys.path.insert(0, SCRIPTS_DIR)
+    import matplotlib
+
+    matplotlib.use("Agg")
+
+
+def _save(fig, path, spec):
+    fmt = os.path.splitext(path)[1][1:]
+    if hasattr(fig, "savefig"):                      # matplotlib
+        if spec["size"] is not None:
+            fig.set_size_inches(*spec["size"])
+        fig.savefig(path, format=fmt, dpi=spec["dpi"])
+    elif fmt == "html":                              # plotly
+        fig.write_html(path, include_plotlyjs="cdn")
+    else:
+        fig.write_image(path)                        # plotly 静态图需要 kaleido
+
+
+def render_figure(name, spec, output_dir):
+    """在当前进程中构建并写出一张图，返回 (图名, 输出路径列表, 耗时 s)"""
+    import importlib
+
+    import matplotlib.pyplot as plt
+
+    start = time.perf_counter()
+    module = importlib.import_module(spec["module"])
+    fig = getattr(module, spec["builder"])(**spec["kwargs"])
+    paths = output_paths(spec, output_dir)
+    try:
+        for path in paths:
+            _save(fig, path, spec)
+    finally:
+        if hasattr(fig, "savefig"):
+            plt.close(fig)
+    return name, paths, time.perf_counter() - start
+
+
+def export_figures(names=None, output_dir=DEFAULT_OUTPUT, workers=None, force=False):
+    """
+    导出 names（缺省为 FIGURES 全部）中输入有变化的图。
+    返回 {图名: "rendered" / "skipped"}；workers=1 时在当前进程中依次渲染。
+    """
+    names = list(FIGURES) if names is None else list(names)
+    unknown = [name for name in names if name not in FIGURES]
+    if unknown:
+        raise KeyError(f"Unknown figures {unknown}; available: {', '.join(FIGURES)}")
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = load_manifest(output_dir)
+
+    status, pending = dict.fromkeys(names), []
+    for name in names:
+        spec = figure_spec(name)
+        fingerprint = input_fingerprint(spec)
+        entry = manifest.get(name, {})
+        up_to_date = entry.get("fingerprint") == fingerprint and all(
+            os.path.exists(path) for path in output_paths(spec, output_dir))
+        if up_to_date and not force:
+            status[name] = "skipped"
+        else:
+            pending.append((name, spec, fingerprint))
+
+    fingerprints = {name: fingerprint for name, _, fingerprint in pending}
+    if workers == 1 or len(pending) <= 1:
+        _init_worker()
+        results = [render_figure(name, spec, output_dir) for name, spec, _ in pending]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            futures = [pool.submit(render_figure, name, spec, output_dir) for name, spec, _ in pending]
+            results = [future.result() for future in futures]
+
+    for name, paths, elapsed in results:
+        manifest[name] = {
+            "fingerprint": fingerprints[name],
+            "outputs": [os.path.basename(path) for path in paths],
+            "seconds": round(elapsed, 3),
+        }
+        status[name] = "rendered"
+    save_manifest(output_dir, manifest)
+    return status
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Render all figures headlessly (Agg) in parallel.")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="output directory (default: assets/)")
+    parser.add_argument("--only", nargs="+", metavar="NAME", help=f"figures to export: {', '.join(FIGURES)}")
+    parser.add_argument("--workers", type=int, default=None, help="process pool size (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="re-render even if inputs are unchanged")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    status = export_figures(args.only, args.output, args.workers, args.force)
+    for name, state in status.items():
+        print(f"{name:<28} {state}")
+    rendered = sum(state == "rendered" for state in status.values())
+    print(f"{rendered} rendered, {len(status) - rendered} skipped in {time.perf_counter() - start:.2f} s")
@@ -0,0 +1,189 @@
+"""
+线性成像正演模型 b = Ax（见 index.md 的 matrix_equation 一节）。
+
+x 是地表反射率立方体 (G 个波长, H, W)，b 是传感器各波段影像 (B, H, W)。
+A 由三部分组成，整体从不显式构造：
+
+    A = PSF ⊗ (M · diag(t))
+
+- t: spectral_bands 中的大气透过率曲线插值到波长网格 (0-1)
+- M: spectral_response.srf_matrix() 的波段响应矩阵 (B × G)，已含积分权重与归一化
+- PSF: 可分离的高斯点扩散函数，沿行、列各做一次一维卷积（图像外按 0 处理）
+
+光谱部分合成一个 (B × G) 的小矩阵，每个像元一次矩阵乘法；空间部分只是短卷积核。
+伴随算子 Aᵀ = PSF 的相关运算 ⊗ (diag(t) · Mᵀ)，可用于 LSQR 等迭代反演。
+安装 scipy 时 as_linear_operator() 给出 scipy.sparse.linalg.LinearOperator。
+
+整景数据用 forward_blocks() 按行带处理（带上下 PSF 半径的重叠行），
+内存只与行带大小有关。
+
+示例：
+    model = ForwardModel(grid_um, boxcar_srfs("Sentinel-2", max_um=2.5), psf_sigma=1.0)
+    bands = model.forward(reflectance_cube)          # (B, H, W)
+    back = model.adjoint(bands)                       # (G, H, W)
+"""
+import numpy as np
+
+from spectral_bands import transmission_curve
+from spectral_response import srf_matrix
+
+try:
+    from scipy.sparse.linalg import LinearOperator   # 可选依赖
+except ImportError:
+    LinearOperator = None
+
+
+def transmission_on_grid(grid_um):
+    """大气透过率 (0-1) 线性插值到波长网格"""
+    wavelength_um, transmission_pct = transmission_curve()
+    return np.interp(grid_um, wavelength_um, transmission_pct) / 100.0
+
+
+def gaussian_kernel(sigma, truncate=3.0):
+    """归一化的一维高斯核；sigma <= 0 时为单位核"""
+    if sigma <= 0:
+        return np.ones(1)
+    radius = int(np.ceil(truncate * sigma))
+    offsets = np.arange(-radius, radius + 1)
+    kernel = np.exp(-0.5 * (offsets / sigma) ** 2)
+    return kernel / kernel.sum()
+
+
+def convolve_axis(data, kernel, axis, out=None):
+    """
+    沿 axis 做一维卷积（'same' 尺寸，边界外为 0），用移位切片累加，不做 FFT。
+    卷积核较短（PSF 半径几个像元）时这比通用卷积快得多。
+    """
+    data = np.asarray(data)
+    if out is None:
+        out = np.zeros_like(data)
+    else:
+        out[...] = 0
+    radius = len(kernel) // 2
+    length = data.shape[axis]
+    for j, weight in enumerate(kernel):
+        shift = j - radius          # out[i] += k[j] · data[i - shift]
+        lo, hi = max(0, shift), min(length, length + shift)
+        if lo >= hi:
+            continue
+        target = [slice(None)] * data.ndim
+        source = [slice(None)] * data.ndim
+        target[axis] = slice(lo, hi)
+        source[axis] = slice(lo - shift, hi - shift)
+        out[tuple(target)] += weight * data[tuple(source)]
+    return out
+
+
+class ForwardModel:
+    """矩阵无关 (matrix-free) 的正演算子：反射率立方体 -> 波段影像"""
+
+    def __init__(self, grid_um, srfs, psf_sigma=1.0, image_shape=None, dtype=np.float32):
+        self.grid_um = np.asarray(grid_um, dtype=np.float64)
+        self.srfs = srfs
+        self.dtype = np.dtype(dtype)
+        self.transmission = transmission_on_grid(self.grid_um)
+        # M · diag(t)：(B × G)
+        self.spectral = (np.asarray(srf_matrix(srfs, self.grid_um, sparse=False)) * self.transmission).astype(self.dtype)
+        self.kernel = gaussian_kernel(psf_sigma).astype(self.dtype)
+        self.image_shape = image_shape
+
+    @property
+    def bands(self):
+        return self.spectral.shape[0]
+
+    @property
+    def wavelengths(self):
+        return self.spectral.shape[1]
+
+    @property
+    def psf_radius(self):
+        return len(self.kernel) // 2
+
+    def _spatial(self, cube, kernel):
+        rows = convolve_axis(cube, kernel, axis=-2)
+        return convolve_axis(rows, kernel, axis=-1, out=cube if cube.flags.writeable else None)
+
+    def forward(self, cube):
+        """(G, H, W) -> (B, H, W)"""
+        cube = np.asarray(cube, dtype=self.dtype)
+        spatial_shape = cube.shape[1:]
+        bands = (self.spectral @ cube.reshape(self.wavelengths, -1)).reshape((self.bands,) + spatial_shape)
+        return self._spatial(bands, self.kernel)
+
+    def adjoint(self, bands):
+        """(B, H, W) -> (G, H, W)，满足 <A x, y> = <x, Aᵀ y>"""
+        bands = np.array(bands, dtype=self.dtype)
+        blurred = self._spatial(bands, self.kernel[::-1])
+        spatial_shape = bands.shape[1:]
+        return (self.spectral.T @ blurred.reshape(self.bands, -1)).reshape((self.wavelengths,) + spatial_shape)
+
+    def forward_blocks(self, cube, out, block_rows=256):
+        """
+        整景正演：按行带读取 cube (G, H, W)（可为内存映射），结果写入 out (B, H, W)。
+        每个行带多读 PSF 半径的重叠行，保证与整体计算结果一致。
+        """
+        height = cube.shape[1]
+        radius = self.psf_radius
+        for start in range(0, height, block_rows):
+            stop = min(start + block_rows, height)
+            lo, hi = max(0, start - radius), min(height, stop + radius)
+            strip = self.forward(cube[:, lo:hi])
+            out[:, start:stop] = strip[:, start - lo:start - lo + (stop - start)]
+        return out
+
+    def as_linear_operator(self, image_shape=None):
+        """向量形式的 scipy LinearOperator：x 为展平的 (G, H, W)，b 为展平的 (B, H, W)"""
+        if LinearOperator is None:
+            raise ImportError("as_linear_operator() requires scipy")
+        height, width = image_shape or self.image_shape
+        pixels = height * width
+
+        def matvec(x):
+            return self.forward(np.reshape(x, (self.wavelengths, height, width))).ravel()
+
+        def rmatvec(y):
+            return self.adjoint(np.reshape(y, (self.bands, height, width))).ravel()
+
+        return LinearOperator((self.bands * pixels, self.wavelengths * pixels),
+                              matvec=matvec, rmatvec=rmatvec, dtype=self.dtype)
+
+
+if __name__ == "__main__":
+    import time
+
+    from spectral_response import boxcar_srfs
+    from toy_reflectance_simulation import simulate_reflectance
+    from synthetic_scene import random_land_cover
+
+    grid_um = np.arange(0.40, 2.50 + 1e-9, 0.01)
+    srfs = boxcar_srfs("Sentinel-2", max_um=2.5)
+    model = ForwardModel(grid_um, srfs, psf_sigma=1.5)
+    print(f"A: {model.bands} bands x {model.wavelengths} wavelengths, PSF radius {model.psf_radius} px")
+
+    # 伴随检验
+    rng = np.random.default_rng(0)
+    x = rng.random((model.wavelengths, 64, 48), dtype=np.float32)
+    y = rng.random((model.bands, 64, 48), dtype=np.float32)
+    lhs = float(np.vdot(model.forward(x).astype(np.float64), y))
+    rhs = float(np.vdot(x, model.adjoint(y).astype(np.float64)))
+    print(f"Adjoint check <Ax, y> / <x, A'y> = {lhs / rhs:.7f}")
+
+    # 1024 x 1024 的高光谱场景
+    land_cover = random_land_cover((1024, 1024), cell=64, seed=0)
+    cube = np.moveaxis(simulate_reflectance(grid_um * 1000, land_cover, rng, dtype=np.float32), -1, 0)
+    out = np.empty((model.bands,) + cube.shape[1:], dtype=np.float32)
+    start = time.perf_counter()
+    model.forward_blocks(cube, out)
+    elapsed = time.perf_counter() - start
+    dense_gb = (model.bands * cube[0].size) * (model.wavelengths * cube[0].size) * 4 / 1e9
+    print(f"Forward model on {cube.shape}: {elapsed:.2f} s (dense A would be {dense_gb:,.0f} GB)")
+    print(f"Blocked result matches whole-image result: {np.allclose(out, model.forward(cube), atol=1e-6)}")
+
+    if LinearOperator is not None:
+        from scipy.sparse.linalg import lsqr
+
+        small = cube[:, :32, :32]
+        operator = model.as_linear_operator(small.shape[1:])
+        solution = lsqr(operator, model.forward(small).ravel(), iter_lim=50)[0]
+        residual = model.forward(solution.reshape(small.shape)) - model.forward(small)
+        print(f"LSQR retrieval on 32x32: relative residual {np.linalg.norm(residual) / np.linalg.norm(model.forward(small)):.2e}")
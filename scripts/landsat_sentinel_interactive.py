@@ -1,46 +1,9 @@
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-import plotly.express as px
 
-# 更详细的大气透过率数据（基于真实大气窗口）
-wavelength = [0.4, 0.45, 0.5, 0.55, 0.6, 0.65, 0.7, 0.75, 0.8, 0.85, 0.9, 0.95, 1.0, 
-              1.1, 1.2, 1.3, 1.4, 1.5, 1.6, 1.7, 1.8, 1.9, 2.0, 2.1, 2.2, 2.3, 2.4, 2.5,
-              10.0, 10.5, 11.0, 11.5, 12.0, 12.5]
-
-transmission = [75, 80, 85, 88, 90, 88, 85, 80, 75, 70, 65, 60, 55, 50, 45, 40, 35, 30, 25, 20, 15, 10, 15, 20, 25, 30, 35, 40,
-                50, 55, 60, 65, 70, 75]
-
-# 详细的卫星波段数据
-satellite_bands = {
-    "Landsat 9": [
-        {"Band": "B1", "Range": (0.43, 0.45), "Resolution": "30 m", "Color": "lightblue", "Description": "Coastal aerosol"},
-        {"Band": "B2", "Range": (0.45, 0.51), "Resolution": "30 m", "Color": "blue", "Description": "Blue"},
-        {"Band": "B3", "Range": (0.53, 0.59), "Resolution": "30 m", "Color": "green", "Description": "Green"},
-        {"Band": "B4", "Range": (0.64, 0.67), "Resolution": "30 m", "Color": "red", "Description": "Red"},
-        {"Band": "B5", "Range": (0.85, 0.88), "Resolution": "30 m", "Color": "lightgreen", "Description": "NIR"},
-        {"Band": "B6", "Range": (1.57, 1.65), "Resolution": "30 m", "Color": "orange", "Description": "SWIR 1"},
-        {"Band": "B7", "Range": (2.11, 2.29), "Resolution": "30 m", "Color": "brown", "Description": "SWIR 2"},
-        {"Band": "B8", "Range": (0.50, 0.68), "Resolution": "15 m", "Color": "purple", "Description": "Panchromatic"},
-        {"Band": "B9", "Range": (1.36, 1.38), "Resolution": "30 m", "Color": "navy", "Description": "Cirrus"},
-        {"Band": "B10", "Range": (10.6, 11.2), "Resolution": "100 m", "Color": "crimson", "Description": "TIRS 1"},
-        {"Band": "B11", "Range": (11.5, 12.5), "Resolution": "100 m", "Color": "crimson", "Description": "TIRS 2"}
-    ],
-    "Sentinel-2": [
-        {"Band": "B1", "Range": (0.433, 0.453), "Resolution": "60 m", "Color": "lightblue", "Description": "Coastal aerosol"},
-        {"Band": "B2", "Range": (0.458, 0.523), "Resolution": "10 m", "Color": "blue", "Description": "Blue"},
-        {"Band": "B3", "Range": (0.543, 0.578), "Resolution": "10 m", "Color": "green", "Description": "Green"},
-        {"Band": "B4", "Range": (0.650, 0.680), "Resolution": "10 m", "Color": "red", "Description": "Red"},
-        {"Band": "B5", "Range": (0.698, 0.713), "Resolution": "20 m", "Color": "lightgreen", "Description": "Red edge 1"},
-        {"Band": "B6", "Range": (0.733, 0.748), "Resolution": "20 m", "Color": "yellow", "Description": "Red edge 2"},
-        {"Band": "B7", "Range": (0.773, 0.793), "Resolution": "20 m", "Color": "orange", "Description": "Red edge 3"},
-        {"Band": "B8", "Range": (0.785, 0.900), "Resolution": "10 m", "Color": "purple", "Description": "NIR"},
-        {"Band": "B8A", "Range": (0.855, 0.875), "Resolution": "20 m", "Color": "forestgreen", "Description": "NIR narrow"},
-        {"Band": "B9", "Range": (0.935, 0.955), "Resolution": "60 m", "Color": "navy", "Description": "Water vapour"},
-        {"Band": "B10", "Range": (1.365, 1.385), "Resolution": "60 m", "Color": "navy", "Description": "Cirrus"},
-        {"Band": "B11", "Range": (1.565, 1.655), "Resolution": "20 m", "Color": "brown", "Description": "SWIR 1"},
-        {"Band": "B12", "Range": (2.100, 2.280), "Resolution": "20 m", "Color": "saddlebrown", "Description": "SWIR 2"}
-    ]
-}
+# 波段与大气透过率数据统一放在 spectral_bands.py
+from spectral_bands import wavelength, transmission, satellite_bands
+from band_traces import add_batched_band_traces
 
 def create_satellite_comparison_chart():
     """创建卫星波段比较图表"""
@@ -89,47 +52,9 @@ def create_satellite_comparison_chart():
         row=1, col=2
     )
     
-    # 添加卫星波段矩形
+    # 添加卫星波段矩形：每颗卫星每个子图一个批量 trace
     for satellite_name, bands in satellite_bands.items():
-        for band in bands:
-            # 确定波段属于哪个子图
-            if band["Range"][1] <= 2.5:
-                # 可见光到近红外波段
-                fig.add_trace(
-                    go.Scatter(
-                        x=[band["Range"][0], band["Range"][1], band["Range"][1], band["Range"][0], band["Range"][0]],
-                        y=[0, 0, 100, 100, 0],
-                        fill="toself",
-                        name=f"{satellite_name} {band['Band']} ({band['Resolution']})",
-                        fillcolor=band["Color"],
-                        line=dict(color=band["Color"], width=1),
-                        opacity=0.7,
-                        hovertemplate=f"<b>{satellite_name} {band['Band']}</b><br>" +
-                                    f"Wavelength: {band['Range'][0]}-{band['Range'][1]} μm<br>" +
-                                    f"Resolution: {band['Resolution']}<br>" +
-                                    f"Description: {band['Description']}<extra></extra>"
-                    ),
-                    row=1, col=1
-                )
-            elif band["Range"][0] >= 10:
-                # 热红外波段
-                fig.add_trace(
-                    go.Scatter(
-                        x=[band["Range"][0], band["Range"][1], band["Range"][1], band["Range"][0], band["Range"][0]],
-                        y=[0, 0, 100, 100, 0],
-                        fill="toself",
-                        name=f"{satellite_name} {band['Band']} ({band['Resolution']})",
-                        fillcolor=band["Color"],
-                        line=dict(color=band["Color"], width=1),
-                        opacity=0.7,
-                        hovertemplate=f"<b>{satellite_name} {band['Band']}</b><br>" +
-                                    f"Wavelength: {band['Range'][0]}-{band['Range'][1]} μm<br>" +
-                                    f"Resolution: {band['Resolution']}<br>" +
-                                    f"Description: {band['Description']}<extra></extra>",
-                        showlegend=False
-                    ),
-                    row=1, col=2
-                )
+        add_batched_band_traces(fig, satellite_name, bands)
     
     # 更新布局
     fig.update_layout(
@@ -304,43 +229,7 @@ def create_interactive_dashboard():
             )
             
             # 只添加选定卫星的波段
-            bands = satellite_bands[selected_satellite]
-            for band in bands:
-                if band["Range"][1] <= 2.5:
-                    fig.add_trace(
-                        go.Scatter(
-                            x=[band["Range"][0], band["Range"][1], band["Range"][1], band["Range"][0], band["Range"][0]],
-                            y=[0, 0, 100, 100, 0],
-                            fill="toself",
-                            name=f"{band['Band']} ({band['Resolution']})",
-                            fillcolor=band["Color"],
-                            line=dict(color=band["Color"], width=1),
-                            opacity=0.7,
-                            hovertemplate=f"<b>{band['Band']}</b><br>" +
-                                        f"Wavelength: {band['Range'][0]}-{band['Range'][1]} μm<br>" +
-                                        f"Resolution: {band['Resolution']}<br>" +
-                                        f"Description: {band['Description']}<extra></extra>"
-                        ),
-                        row=1, col=1
-                    )
-                elif band["Range"][0] >= 10:
-                    fig.add_trace(
-                        go.Scatter(
-                            x=[band["Range"][0], band["Range"][1], band["Range"][1], band["Range"][0], band["Range"][0]],
-                            y=[0, 0, 100, 100, 0],
-                            fill="toself",
-                            name=f"{band['Band']} ({band['Resolution']})",
-                            fillcolor=band["Color"],
-                            line=dict(color=band["Color"], width=1),
-                            opacity=0.7,
-                            hovertemplate=f"<b>{band['Band']}</b><br>" +
-                                        f"Wavelength: {band['Range'][0]}-{band['Range'][1]} μm<br>" +
-                                        f"Resolution: {band['Resolution']}<br>" +
-                                        f"Description: {band['Description']}<extra></extra>",
-                            showlegend=False
-                        ),
-                        row=1, col=2
-                    )
+            add_batched_band_traces(fig, selected_satellite, satellite_bands[selected_satellite], show_satellite=False)
             
             fig.update_layout(
                 title=f'{selected_satellite} Bands vs Atmospheric Transmission',
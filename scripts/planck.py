@@ -0,0 +1,195 @@
+"""
+普朗克黑体辐射与亮温：温度 ↔ 光谱辐亮度的向量化换算。
+
+    L(λ, T) = c1 / (λ^5 · (exp(c2 / (λT)) - 1))          单位 W·m⁻²·sr⁻¹·μm⁻¹，λ 为 μm
+
+- planck_radiance() / brightness_temperature()   单色正算与解析反演，任意可广播形状
+- band_radiance()   波段平均辐亮度：在波段 Range（或实测 SRF）上按响应加权积分
+- BrightnessTemperatureLUT   波段平均辐亮度没有解析反演，先在细温度网格上算出单调的
+  L(T)，再重采样成“辐亮度等间距”的查找表：反演时下标直接由 (L - L0) / ΔL 算出，
+  不需要二分查找，按块做几次逐元素运算即可，单核可达每秒上亿像元
+- thermal_luts()    spectral_bands 中热红外波段（Landsat 9 B10/B11）的查找表
+
+示例：
+    luts = thermal_luts("Landsat 9")
+    bt = luts["B10"].invert(radiance_image)      # K
+"""
+from functools import lru_cache
+
+import numpy as np
+
+from spectral_bands import SENSORS, band_table, sensor_mask, wavelength_mask
+
+# 2hc² 与 hc/k，波长以 μm 计
+C1 = 1.191042972e8      # W·μm⁴·m⁻²·sr⁻¹
+C2 = 1.438776877e4      # μm·K
+
+# 热红外波段的下界 (μm)
+THERMAL_MIN_UM = 3.0
+DEFAULT_CHUNK = 1 << 15
+# band_radiance() 每次求积分的温度个数：(16384, 256) 的 float64 网格约 34 MB
+RADIANCE_CHUNK = 1 << 14
+
+
+def planck_radiance(temperature_k, wavelength_um):
+    """光谱辐亮度，温度与波长按 NumPy 规则广播（温度 × 波长网格用 T[:, None], λ[None, :]）"""
+    wavelength_um = np.asarray(wavelength_um, dtype=np.float64)
+    temperature_k = np.asarray(temperature_k, dtype=np.float64)
+    return C1 / (wavelength_um ** 5 * np.expm1(C2 / (wavelength_um * temperature_k)))
+
+
+def brightness_temperature(radiance, wavelength_um):
+    """单色辐亮度的解析反演 (K)"""
+    wavelength_um = np.asarray(wavelength_um, dtype=np.float64)
+    return C2 / (wavelength_um * np.log1p(C1 / (wavelength_um ** 5 * np.asarray(radiance, dtype=np.float64))))
+
+
+def band_weights(band, samples=256):
+    """
+    波段的 (波长网格, 归一化积分权重)。
+    band: (lower, upper) 矩形波段，或 spectral_response 格式的 SRF dict
+    """
+    if isinstance(band, dict):
+        grid = np.linspace(band["Wavelength"][0], band["Wavelength"][-1], samples)
+        response = np.interp(grid, band["Wavelength"], band["Response"])
+    else:
+        grid = np.linspace(band[0], band[1], samples)
+        response = np.ones(samples)
+    steps = np.diff(grid)
+    weights = np.zeros(samples)
+    weights[:-1] += steps * 0.5
+    weights[1:] += steps * 0.5
+    weights *= response
+    return grid, weights / weights.sum()
+
+
+def band_radiance(temperature_k, band, samples=256, chunk=RADIANCE_CHUNK):
+    """
+    波段平均辐亮度，返回形状与 temperature_k 相同。
+    温度按 chunk 个一组求 (chunk, samples) 的光谱网格并加权求和，
+    临时数组大小与温度个数无关（一次算完 100 万个温度需要约 2 GB）
+    """
+    grid, weights = band_weights(band, samples)
+    temperature_k = np.asarray(temperature_k, dtype=np.float64)
+    flat = temperature_k.ravel()
+    result = np.empty(flat.shape)
+    for start in range(0, flat.size, chunk):
+        stop = min(start + chunk, flat.size)
+        np.matmul(planck_radiance(flat[start:stop, None], grid), weights, out=result[start:stop])
+    return result.reshape(temperature_k.shape)
+
+
+class BrightnessTemperatureLUT:
+    """波段平均辐亮度 -> 亮温的等间距查找表（线性插值，保持单调）"""
+
+    def __init__(self, band, t_min=150.0, t_max=400.0, size=1 << 14, samples=256):
+        # 先在细温度网格上求 L(T)，它随 T 严格单调递增
+        temperatures = np.linspace(t_min, t_max, 8 * size)
+        radiances = band_radiance(temperatures, band, samples)
+
+        self.t_min, self.t_max = t_min, t_max
+        self.radiance_min = float(radiances[0])
+        self.radiance_max = float(radiances[-1])
+        self.step = (self.radiance_max - self.radiance_min) / (size - 1)
+        uniform = np.linspace(self.radiance_min, self.radiance_max, size)
+        table = np.interp(uniform, radiances, temperatures)
+        # 第 i 段上 T = intercept[i] + slope[i] · x，x = (L - L0) / ΔL 为连续下标；
+        # 末尾补一项使 x = size-1 时也能取到
+        slope = np.append(np.diff(table), 0.0)
+        self.temperature = table.astype(np.float32)
+        self.slope = slope.astype(np.float32)
+        self.intercept = (table - slope * np.arange(size)).astype(np.float32)
+
+    def __len__(self):
+        return len(self.temperature)
+
+    def invert(self, radiance, out=None, chunk=DEFAULT_CHUNK):
+        """
+        辐亮度数组 -> 亮温 (K, float32)。NaN（无效值）以及超出 [t_min, t_max] 对应辐亮度范围的值输出 NaN。
+        按块处理并复用缓冲区，块大小以能放进 CPU 缓存为宜。
+        """
+        radiance = np.asarray(radiance)
+        if out is None:
+            out = np.empty(radiance.shape, dtype=np.float32)
+        flat_in = radiance.reshape(-1)
+        flat_out = out.reshape(-1)
+        position = np.empty(min(chunk, flat_in.size), dtype=np.float32)
+        index = np.empty(len(position), dtype=np.int32)
+        intercept = np.empty(len(position), dtype=np.float32)
+        invalid = np.empty(len(position), dtype=bool)
+        above = np.empty(len(position), dtype=bool)
+        upper = np.float32(len(self) - 1)
+        offset = np.float32(self.radiance_min)
+        scale = np.float32(1.0 / self.step)
+
+        for start in range(0, flat_in.size, chunk):
+            stop = min(start + chunk, flat_in.size)
+            x = position[:stop - start]
+            i = index[:stop - start]
+            np.subtract(flat_in[start:stop], offset, out=x, casting="unsafe")
+            x *= scale
+            # NaN 与任何数比较都为 False，因此 "not (x >= 0) or x > upper" 同时标出 NaN 和越界值
+            bad = invalid[:stop - start]
+            np.greater_equal(x, 0, out=bad)
+            np.logical_not(bad, out=bad)
+            bad |= np.greater(x, upper, out=above[:stop - start])
+            # fmax / fmin 遇 NaN 取另一个操作数，转换为整数下标前就没有 NaN 了
+            np.fmax(x, 0, out=x)
+            np.fmin(x, upper, out=x)
+            np.copyto(i, x, casting="unsafe")          # 向下取整（x >= 0）即所在段
+            target = flat_out[start:stop]
+            np.take(self.slope, i, out=target)
+            target *= x
+            target += np.take(self.intercept, i, out=intercept[:stop - start])
+            np.copyto(target, np.nan, where=bad)
+        return out
+
+
+def thermal_bands(sensor=None):
+    """热红外波段（band_table() 的行），可按卫星筛选"""
+    table = band_table()
+    mask = wavelength_mask(table, min_um=THERMAL_MIN_UM)
+    if sensor is not None:
+        mask &= sensor_mask(table, sensor)
+    return table[mask]
+
+
+@lru_cache(maxsize=None)
+def thermal_luts(sensor):
+    """{波段名: BrightnessTemperatureLUT}，按波段 Range 做矩形响应，构建一次后复用"""
+    return {
+        str(row["band"]): BrightnessTemperatureLUT((float(row["lower"]), float(row["upper"])))
+        for row in thermal_bands(sensor)
+    }
+
+
+if __name__ == "__main__":
+    import time
+
+    for sensor in SENSORS:
+        for row in thermal_bands(sensor):
+            band = (float(row["lower"]), float(row["upper"]))
+            print(f"{sensor} {row['band']} ({row['description']}, {band[0]}-{band[1]} μm): "
+                  f"L(300 K) = {float(band_radiance(300.0, band)):.3f} W/m²/sr/μm")
+
+    luts = thermal_luts("Landsat 9")
+    lut = luts["B10"]
+    rng = np.random.default_rng(0)
+    truth = rng.uniform(200.0, 340.0, 1_000_000)
+    radiance = band_radiance(truth, (10.6, 11.2)).astype(np.float32)
+    print(f"B10 round-trip max error 200-340 K: {np.abs(lut.invert(radiance) - truth).max() * 1000:.2f} mK")
+
+    # 无效值回归检查：NaN 与超出 150-400 K 对应辐亮度范围的输入都应输出 NaN
+    nodata = np.array([np.nan, -1.0, 0.0, lut.radiance_max * 2, np.inf, radiance[0]], dtype=np.float32)
+    inverted = lut.invert(nodata)
+    assert np.isnan(inverted[:5]).all() and np.isfinite(inverted[5]), inverted
+    print(f"NaN / out-of-range inputs -> {inverted[:5]}, valid input -> {inverted[5]:.2f} K")
+
+    # 整景热红外影像
+    image = np.resize(radiance, 100_000_000)
+    # 输出缓冲区预先写一遍，计时不含首次缺页
+    out = np.full(image.shape, np.nan, dtype=np.float32)
+    start = time.perf_counter()
+    lut.invert(image, out=out)
+    elapsed = time.perf_counter() - start
+    print(f"{image.size / 1e6:.0f}M pixels in {elapsed:.2f} s ({image.size / elapsed / 1e6:.0f}M pixels/s)")
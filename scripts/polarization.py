@@ -0,0 +1,128 @@
+"""
+极化分解引擎：对任意形状的复电场分量 (E_h, E_v) 做向量化计算。
+
+polarization_vector_projection.py 里的示意图就是这里的特例（单个实数矢量 E = (2, 3)）：
+
+- projections()   H / V / +45° / -45° / 右旋 / 左旋圆极化基上的复振幅
+- stokes()        Stokes 参数 S0..S3，可沿 looks 轴做多视平均（部分极化）
+- degree_of_polarization() / ellipse_angles()   极化度、极化椭圆方位角与椭率角
+- polarization_chunked()   10^8 像元量级的 SAR 数据按块处理，complex64 输入、
+                           float32 输出，可直接写入预分配数组或内存映射
+
+约定：S3 = 2 Im(E_h* E_v)，S3 > 0 为右旋（从接收方看逆时针，IEEE 约定相反时取负即可）；
+方位角 ψ ∈ [-90°, 90°] 从 H 轴量起，椭率角 χ ∈ [-45°, 45°]。
+"""
+import numpy as np
+
+# 各极化基的单位矢量 (h, v)，投影为 <基矢, E> = conj(h) E_h + conj(v) E_v
+_SQRT_HALF = np.sqrt(0.5)
+BASES = {
+    "H": (1.0, 0.0),
+    "V": (0.0, 1.0),
+    "+45": (_SQRT_HALF, _SQRT_HALF),
+    "-45": (_SQRT_HALF, -_SQRT_HALF),
+    "RHC": (_SQRT_HALF, 1j * _SQRT_HALF),
+    "LHC": (_SQRT_HALF, -1j * _SQRT_HALF),
+}
+
+STOKES = ("S0", "S1", "S2", "S3")
+DEFAULT_CHUNK = 1 << 22     # 每块像元数，complex64 下约 32 MB / 分量
+
+
+def projections(e_h, e_v, bases=tuple(BASES)):
+    """{基名: 复振幅}，形状与广播后的 E_h / E_v 相同"""
+    e_h = np.asarray(e_h)
+    e_v = np.asarray(e_v)
+    result = {}
+    for name in bases:
+        h, v = BASES[name]
+        result[name] = np.conj(h) * e_h + np.conj(v) * e_v
+    return result
+
+
+def stokes(e_h, e_v, looks_axis=None):
+    """
+    Stokes 参数，返回形状 (4,) + 像元形状 的数组。
+    looks_axis: 给定时沿该轴平均（多视），得到部分极化波的 Stokes 参数
+    """
+    e_h = np.asarray(e_h)
+    e_v = np.asarray(e_v)
+    power_h = e_h.real ** 2 + e_h.imag ** 2
+    power_v = e_v.real ** 2 + e_v.imag ** 2
+    cross = np.conj(e_h) * e_v
+    s = np.stack([power_h + power_v, power_h - power_v, 2 * cross.real, 2 * cross.imag])
+    if looks_axis is not None:
+        axis = looks_axis + 1 if looks_axis >= 0 else looks_axis
+        s = s.mean(axis=axis)
+    return s
+
+
+def degree_of_polarization(s):
+    """sqrt(S1² + S2² + S3²) / S0；S0 = 0 的像元为 NaN"""
+    polarized = np.sqrt(s[1] ** 2 + s[2] ** 2 + s[3] ** 2)
+    return np.divide(polarized, s[0], out=np.full_like(polarized, np.nan), where=s[0] > 0)
+
+
+def ellipse_angles(s):
+    """极化椭圆 (方位角 ψ, 椭率角 χ)，单位度"""
+    orientation = 0.5 * np.degrees(np.arctan2(s[2], s[1]))
+    polarized = np.sqrt(s[1] ** 2 + s[2] ** 2 + s[3] ** 2)
+    ratio = np.divide(s[3], polarized, out=np.zeros_like(polarized), where=polarized > 0)
+    ellipticity = 0.5 * np.degrees(np.arcsin(np.clip(ratio, -1.0, 1.0)))
+    return orientation, ellipticity
+
+
+OUTPUTS = STOKES + ("dop", "orientation", "ellipticity")
+
+
+def polarization_chunked(e_h, e_v, out=None, chunk=DEFAULT_CHUNK):
+    """
+    大数组按块计算全部极化参数，返回 {名称: float32 数组}，名称见 OUTPUTS。
+    e_h / e_v: 同形状的复数数组（或内存映射），按 complex64 计算
+    out: 可选的预分配 dict（例如 np.lib.format.open_memmap 打开的文件），缺省时在内存中分配
+    """
+    if e_h.shape != e_v.shape:
+        raise ValueError("E_h and E_v must have the same shape")
+    if out is None:
+        out = {name: np.empty(e_h.shape, dtype=np.float32) for name in OUTPUTS}
+    flat_h = e_h.reshape(-1)
+    flat_v = e_v.reshape(-1)
+    flat_out = {name: out[name].reshape(-1) for name in OUTPUTS}
+
+    for start in range(0, flat_h.size, chunk):
+        window = slice(start, min(start + chunk, flat_h.size))
+        block_h = np.asarray(flat_h[window], dtype=np.complex64)
+        block_v = np.asarray(flat_v[window], dtype=np.complex64)
+        s = stokes(block_h, block_v)
+        for i, name in enumerate(STOKES):
+            flat_out[name][window] = s[i]
+        flat_out["dop"][window] = degree_of_polarization(s)
+        orientation, ellipticity = ellipse_angles(s)
+        flat_out["orientation"][window] = orientation
+        flat_out["ellipticity"][window] = ellipticity
+    return out
+
+
+if __name__ == "__main__":
+    import time
+
+    # 单个矢量：与示意图相同的 E = (2, 3)
+    s = stokes(2 + 0j, 3 + 0j)
+    orientation, ellipticity = ellipse_angles(s)
+    print("E = (2, 3):", {name: complex(value) for name, value in projections(2 + 0j, 3 + 0j).items()})
+    print(f"Stokes {s}, DoP {degree_of_polarization(s):.3f}, "
+          f"orientation {orientation:.2f}°, ellipticity {ellipticity:.2f}°")
+
+    # 多视平均后的部分极化：8 视 × 1000 像元，随机相位噪声
+    rng = np.random.default_rng(0)
+    looks = (rng.normal(size=(8, 1000)) + 1j * rng.normal(size=(8, 1000))).astype(np.complex64)
+    multilook = stokes(1.0 + looks * 0.5, 0.3j + looks * 0.5, looks_axis=0)
+    print(f"8-look mean DoP: {np.nanmean(degree_of_polarization(multilook)):.3f}")
+
+    # SAR 尺寸的数据按块处理
+    size = 10**7
+    e_h = (rng.standard_normal(size, dtype=np.float32) + 1j * rng.standard_normal(size, dtype=np.float32))
+    e_v = (rng.standard_normal(size, dtype=np.float32) + 1j * rng.standard_normal(size, dtype=np.float32))
+    start = time.perf_counter()
+    polarization_chunked(e_h.astype(np.complex64), e_v.astype(np.complex64))
+    print(f"{size:,} pixels in {time.perf_counter() - start:.2f} s")
@@ -1,30 +1,56 @@
 import matplotlib.pyplot as plt
 
-# 坐标
-plt.figure(figsize=(6, 6))
-plt.axhline(0, color='black', linewidth=1)
-plt.axvline(0, color='black', linewidth=1)
-
-# 电场矢量
-plt.arrow(0, 0, 2, 3, head_width=0.1, head_length=0.15, fc='red', ec='red', linewidth=2)
-plt.text(2.1, 3.1, "E (Electric field)", color='red', fontsize=10, fontweight='bold')
-
-# 水平(H)投影
-plt.arrow(0, 0, 2, 0, head_width=0.08, head_length=0.1, fc='blue', ec='blue', linestyle='--', linewidth=2)
-plt.text(2.1, -0.2, "H-component", color='blue', fontsize=10)
-
-# 垂直(V)投影
-plt.arrow(0, 0, 0, 3, head_width=0.08, head_length=0.1, fc='green', ec='green', linestyle='--', linewidth=2)
-plt.text(0.1, 3.1, "V-component", color='green', fontsize=10)
-
-# 辅助线
-plt.plot([2, 2], [0, 3], color='gray', linestyle=':', linewidth=1)
-plt.plot([0, 2], [3, 3], color='gray', linestyle=':', linewidth=1)
-
-plt.title("Polarization = Vector Projection", fontsize=14, fontweight='bold')
-plt.xlim(-0.5, 3)
-plt.ylim(-0.5, 3.5)
-plt.xlabel("Horizontal (H) direction")
-plt.ylabel("Vertical (V) direction")
-plt.grid(True, linestyle='--', alpha=0.3)
-plt.show()
+from polarization import degree_of_polarization, ellipse_angles, projections, stokes
+
+# 电场矢量（线极化，实数振幅）；图和数值都由 polarization 引擎计算
+E_H, E_V = 2 + 0j, 3 + 0j
+
+
+def build_figure(e_h=E_H, e_v=E_V):
+    """电场矢量在 H / V 方向上的投影示意图，返回 Figure"""
+    components = projections(e_h, e_v, bases=("H", "V"))
+    h = float(components["H"].real)
+    v = float(components["V"].real)
+    s = stokes(e_h, e_v)
+    orientation, ellipticity = ellipse_angles(s)
+
+    # 坐标
+    fig, ax = plt.subplots(figsize=(6, 6))
+    ax.axhline(0, color='black', linewidth=1)
+    ax.axvline(0, color='black', linewidth=1)
+
+    # 电场矢量
+    ax.arrow(0, 0, h, v, head_width=0.1, head_length=0.15, fc='red', ec='red', linewidth=2)
+    ax.text(h + 0.1, v + 0.1, "E (Electric field)", color='red', fontsize=10, fontweight='bold')
+
+    # 水平(H)投影
+    ax.arrow(0, 0, h, 0, head_width=0.08, head_length=0.1, fc='blue', ec='blue', linestyle='--', linewidth=2)
+    ax.text(h + 0.1, -0.2, "H-component", color='blue', fontsize=10)
+
+    # 垂直(V)投影
+    ax.arrow(0, 0, 0, v, head_width=0.08, head_length=0.1, fc='green', ec='green', linestyle='--', linewidth=2)
+    ax.text(0.1, v + 0.1, "V-component", color='green', fontsize=10)
+
+    # 辅助线
+    ax.plot([h, h], [0, v], color='gray', linestyle=':', linewidth=1)
+    ax.plot([0, h], [v, v], color='gray', linestyle=':', linewidth=1)
+
+    # Stokes 参数与极化椭圆
+    ax.text(1.2, 0.4,
+            f"S = [{s[0]:.0f}, {s[1]:.0f}, {s[2]:.0f}, {s[3]:.0f}]\n"
+            f"DoP = {degree_of_polarization(s):.2f}\n"
+            f"ψ = {orientation:.1f}°, χ = {ellipticity:.1f}°",
+            fontsize=9, bbox=dict(facecolor='white', alpha=0.7))
+
+    ax.set_title("Polarization = Vector Projection", fontsize=14, fontweight='bold')
+    ax.set_xlim(-0.5, 3)
+    ax.set_ylim(-0.5, 3.5)
+    ax.set_xlabel("Horizontal (H) direction")
+    ax.set_ylabel("Vertical (V) direction")
+    ax.grid(True, linestyle='--', alpha=0.3)
+    return fig
+
+
+if __name__ == "__main__":
+    build_figure()
+    plt.show()
@@ -0,0 +1,207 @@
+"""
+辐射量化与位打包：把浮点反射率 / 辐亮度立方体存成 N 位整数（8/10/12/14/16）。
+
+index.md 的 "Data Storage in Bits" 讲的是位深在数据量与灵敏度之间的取舍，这里给出实现：
+
+- quantize() / dequantize()   线性量化 q = round((x - offset) / scale)，可按波段（axis=0）
+  各自取 scale/offset；最大码值保留为填充值，NaN / ±inf 量化为填充值，还原时变为 NaN
+- pack_bits() / unpack_bits() 非字节对齐的位深按组打包：g = 8 / gcd(N, 8) 个值正好占
+  N·g/8 个字节（10 位 4 值 5 字节，12 位 2 值 3 字节，14 位 4 值 7 字节）；每个字节由哪几个
+  值移位拼成是固定的，按列做向量化的移位、掩码与按位或，没有逐值循环；
+  8/16 位直接用 uint8/uint16
+- save_packed() / load_packed()  打包数据存为 uint8 .npy，量化参数写入同名 .json
+
+示例：
+    save_packed("scene_q12.npy", cube, bits=12, axis=0)
+    restored = load_packed("scene_q12.npy")          # float32，误差不超过 scale / 2
+"""
+import math
+
+import numpy as np
+
+from synthetic_scene import sidecar_path, write_sidecar
+
+BIT_DEPTHS = (8, 10, 12, 14, 16)
+# 每次打包/解包的组数，限制 uint32 中间数组的大小
+PACK_CHUNK_GROUPS = 1 << 18
+
+
+def _check_bits(bits):
+    if bits not in BIT_DEPTHS:
+        raise ValueError(f"bits must be one of {BIT_DEPTHS}")
+
+
+def storage_dtype(bits):
+    return np.uint8 if bits <= 8 else np.uint16
+
+
+def quantize(data, bits, value_range=None, axis=None):
+    """
+    浮点数组 -> (N 位整数数组, 量化参数 dict)。
+    value_range: (最小值, 最大值)，缺省取数据的有限值范围（忽略 NaN 与 ±inf）
+    axis: 给定时沿该轴每个切片单独取范围（如立方体按波段 axis=0）
+    """
+    _check_bits(bits)
+    data = np.asarray(data)
+    fill = (1 << bits) - 1
+    levels = fill - 1               # 有效码值 0 .. fill - 1
+    nonfinite = ~np.isfinite(data)
+
+    if value_range is not None:
+        low = np.asarray(value_range[0], dtype=np.float64)
+        high = np.asarray(value_range[1], dtype=np.float64)
+    else:
+        reduce_axes = None if axis is None else tuple(i for i in range(data.ndim) if i != axis % data.ndim)
+        # ±inf 会让 scale 变成 inf、所有码值变成 0，范围只取有限值
+        finite = np.where(nonfinite, np.nan, data) if nonfinite.any() else data
+        low = np.nanmin(finite, axis=reduce_axes).astype(np.float64)
+        high = np.nanmax(finite, axis=reduce_axes).astype(np.float64)
+    scale = np.where(high > low, (high - low) / levels, 1.0)
+
+    shape = [1] * data.ndim
+    if axis is not None and np.ndim(scale):
+        shape[axis] = -1
+    offset_b = low.reshape(shape) if np.ndim(low) else low
+    scale_b = scale.reshape(shape) if np.ndim(scale) else scale
+
+    # float32 输入就在 float32 下计算（16 位码值在 float32 中仍可精确表示）
+    work_dtype = np.result_type(data.dtype, np.float32)
+    scaled = np.subtract(data, np.asarray(offset_b, dtype=work_dtype), dtype=work_dtype)
+    scaled *= np.asarray(1.0 / scale_b, dtype=work_dtype)
+    np.rint(scaled, out=scaled)
+    np.clip(scaled, 0, levels, out=scaled)
+    scaled[nonfinite] = fill
+    codes = np.empty(data.shape, dtype=storage_dtype(bits))
+    np.copyto(codes, scaled, casting="unsafe")
+
+    metadata = {
+        "bits": bits,
+        "scale": np.atleast_1d(scale).tolist(),
+        "offset": np.atleast_1d(low).tolist(),
+        "axis": axis,
+        "fill": fill,
+        "shape": list(data.shape),
+    }
+    return codes, metadata
+
+
+def dequantize(codes, metadata, dtype=np.float32):
+    """N 位整数数组 -> 浮点数组，填充值还原为 NaN"""
+    codes = np.asarray(codes)
+    scale = np.asarray(metadata["scale"], dtype=dtype)
+    offset = np.asarray(metadata["offset"], dtype=dtype)
+    axis = metadata.get("axis")
+    if axis is not None and len(scale) > 1:
+        shape = [1] * codes.ndim
+        shape[axis] = -1
+        scale, offset = scale.reshape(shape), offset.reshape(shape)
+    else:
+        scale, offset = scale[0], offset[0]
+    values = codes.astype(dtype)
+    values *= scale
+    values += offset
+    values[codes == metadata["fill"]] = np.nan
+    return values
+
+
+def group_layout(bits):
+    """(每组值个数, 每组字节数)"""
+    values = 8 // math.gcd(bits, 8)
+    return values, bits * values // 8
+
+
+def _byte_plan(bits):
+    """
+    组内位流（大端）中每个字节由哪些值的哪几位组成：[(字节号, 值号, 移位), ...]。
+    移位 > 0 表示值右移，< 0 表示左移，再取低 8 位即为该值对这个字节的贡献。
+    """
+    per_group, group_bytes = group_layout(bits)
+    plan = []
+    for j in range(group_bytes):
+        for k in range(per_group):
+            if bits * k < 8 * j + 8 and bits * (k + 1) > 8 * j:
+                plan.append((j, k, bits * (k + 1) - (8 * j + 8)))
+    return plan
+
+
+def _shift(values, shift):
+    return values >> shift if shift >= 0 else values << -shift
+
+
+def pack_bits(codes, bits):
+    """
+    N 位整数 -> 紧凑的 uint8 字节串（大端位序）。长度不足一组时末尾补 0，
+    解包时按原始个数截断。
+    """
+    _check_bits(bits)
+    flat = np.asarray(codes).reshape(-1)
+    if bits in (8, 16):
+        return flat.astype(">u2" if bits == 16 else np.uint8).view(np.uint8)
+
+    per_group, group_bytes = group_layout(bits)
+    groups = -(-flat.size // per_group)
+    plan = _byte_plan(bits)
+    packed = np.zeros((groups, group_bytes), dtype=np.uint8)
+
+    for start in range(0, groups, PACK_CHUNK_GROUPS):
+        stop = min(start + PACK_CHUNK_GROUPS, groups)
+        chunk = np.zeros((stop - start, per_group), dtype=np.uint32)
+        values = flat[start * per_group:stop * per_group]
+        chunk.reshape(-1)[:len(values)] = values
+        for j, k, shift in plan:
+            packed[start:stop, j] |= (_shift(chunk[:, k], shift) & 0xFF).astype(np.uint8)
+    return packed.reshape(-1)
+
+
+def unpack_bits(packed, bits, count):
+    """pack_bits() 的逆运算，返回 count 个 uint8/uint16 值"""
+    _check_bits(bits)
+    packed = np.asarray(packed, dtype=np.uint8)
+    if bits == 8:
+        return packed[:count].copy()
+    if bits == 16:
+        return packed[:2 * count].view(">u2").astype(np.uint16)
+
+    per_group, group_bytes = group_layout(bits)
+    groups = -(-count // per_group)
+    plan = _byte_plan(bits)
+    mask = (1 << bits) - 1
+    grouped = packed[:groups * group_bytes].reshape(groups, group_bytes)
+    codes = np.empty((groups, per_group), dtype=np.uint16)
+
+    for start in range(0, groups, PACK_CHUNK_GROUPS):
+        stop = min(start + PACK_CHUNK_GROUPS, groups)
+        chunk = grouped[start:stop].astype(np.uint32)
+        values = np.zeros((stop - start, per_group), dtype=np.uint32)
+        # 与打包相反：字节按相反方向移位后拼回各个值
+        for j, k, shift in plan:
+            values[:, k] |= _shift(chunk[:, j], -shift)
+        values &= mask
+        codes[start:stop] = values
+    return codes.reshape(-1)[:count]
+
+
+def packed_nbytes(count, bits):
+    """count 个 N 位值打包后的字节数"""
+    per_group, group_bytes = group_layout(bits)
+    return -(-count // per_group) * group_bytes
+
+
+def save_packed(path, data, bits, value_range=None, axis=None):
+    """量化并打包后存为 uint8 .npy，同名 .json 记录还原所需的参数；返回量化参数 dict"""
+    codes, metadata = quantize(data, bits, value_range, axis)
+    np.save(path, pack_bits(codes, bits))
+    metadata["count"] = int(codes.size)
+    write_sidecar(path, metadata)
+    return metadata
+
+
+def load_packed(path, dtype=np.float32):
+    """读取 save_packed() 的输出并还原为浮点数组"""
+    import json
+
+    with open(sidecar_path(path), encoding="utf-8") as f:
+        metadata = json.load(f)
+    packed = np.load(path, mmap_mode="r")
+    codes = unpack_bits(packed, metadata["bits"], metadata["count"]).reshape(metadata["shape"])
+    return dequantize(codes, metadata, dtype)
@@ -0,0 +1,217 @@
+"""
+扫描时间线的覆盖与重访分析：在整个经纬度网格上一次性统计每个格点的
+观测次数、最大间隔和平均重访间隔。
+
+输入是 ahi_scan_scheduler.ScanScheduler(timeline_limit=...) 记录的时间线，
+每条观测带有扫描角下的中心与半宽。做法：
+
+1. 网格按纬度分块，每块用广播把 (lat, lon) 换算成静止卫星扫描角，
+   只保留地球圆盘内可见的格点
+2. 时间线里不同的观测范围（Full Disk 的各条带、日本区、目标区、地标区……）
+   通常只有几十种；每个格点被哪些范围覆盖记成一个位掩码“覆盖签名”
+3. 签名相同的格点观测时刻完全相同，所以只需对每种签名合并、排序一次观测时刻，
+   再按 np.unique 的反向索引把结果散回网格
+4. 扇区被地面指令停用的时段（报告中的 disabled_windows）：覆盖某格点的扇区全部停用时，
+   与该时段相交的间隔不计入最大间隔和平均重访间隔；仍有扇区在观测时间隔照常统计
+
+0.05° 全球网格约 2600 万格点，结果使用紧凑类型：观测次数 uint16（超过 65535 时饱和），
+间隔 float32（秒，无观测或只观测一次的格点为 NaN）。
+
+示例：
+    report = ScanScheduler(timeline_limit=10**6).run(86400)
+    lats, lons = lat_lon_grid(0.05)
+    stats = coverage_stats(report["timeline"], lats, lons, disabled=disabled_windows(report))
+    plot_revisit_heatmap(stats, lats, lons)
+"""
+import numpy as np
+
+EARTH_RADIUS_KM = 6378.137
+GEO_RADIUS_KM = 42164.0
+# Himawari-8/9 的星下点经度
+SUB_SATELLITE_LON = 140.7
+
+COUNT_MAX = np.iinfo(np.uint16).max
+# 相邻条带边界重合，留一点容差避免浮点误差在接缝处漏掉格点
+EDGE_TOLERANCE_DEG = 1e-9
+
+
+def lat_lon_grid(resolution=0.05, lat_range=(-90.0, 90.0), lon_range=(-180.0, 180.0)):
+    """格点中心的纬度（由北向南）和经度一维数组"""
+    lats = np.arange(lat_range[1] - resolution / 2, lat_range[0], -resolution)
+    lons = np.arange(lon_range[0] + resolution / 2, lon_range[1], resolution)
+    return lats, lons
+
+
+def scan_angles(lat, lon, sub_lon=SUB_SATELLITE_LON):
+    """
+    经纬度（度，可广播）-> 扫描角 (E-W x, N-S y)（度）及可见掩码。
+    地球按球体近似。
+    """
+    lat = np.radians(lat)
+    dlon = np.radians(np.asarray(lon) - sub_lon)
+    cos_lat = np.cos(lat)
+    px = EARTH_RADIUS_KM * cos_lat * np.cos(dlon)
+    py = EARTH_RADIUS_KM * cos_lat * np.sin(dlon)
+    pz = EARTH_RADIUS_KM * np.sin(lat)
+    dx = GEO_RADIUS_KM - px
+    x = np.degrees(np.arctan2(py, dx))
+    y = np.degrees(np.arctan2(pz, np.hypot(dx, py)))
+    # 与卫星连线不被地球遮挡：地心角余弦大于 R / H
+    visible = px > EARTH_RADIUS_KM * EARTH_RADIUS_KM / GEO_RADIUS_KM
+    return x, y, visible
+
+
+def group_footprints(timeline):
+    """
+    把时间线按观测范围归组：返回 ([(中心, 半宽), ...], [该范围的观测结束时刻数组, ...],
+    [观测过该范围的扇区名集合, ...])。
+    时间线条目为 (开始, 结束, 扇区, 条带, 中心, 半宽)。
+    """
+    times, sectors = {}, {}
+    for _, end, sector, _, center, size in timeline:
+        key = (tuple(center), tuple(size))
+        times.setdefault(key, []).append(end)
+        sectors.setdefault(key, set()).add(sector)
+    footprints = list(times)
+    return footprints, [np.sort(np.array(times[footprint])) for footprint in footprints], \
+        [sectors[footprint] for footprint in footprints]
+
+
+def disabled_windows(report):
+    """ScanScheduler.run() 报告中被停用过的扇区：{扇区: [(开始, 结束), ...]}"""
+    return {name: stats["disabled_windows"] for name, stats in report["sectors"].items()
+            if stats.get("disabled_windows")}
+
+
+def _signatures(x, y, footprints):
+    """每个格点的覆盖签名：(格点数, 字数) uint64，第 f 位表示被第 f 个范围覆盖"""
+    words = np.zeros((len(x), -(-len(footprints) // 64)), dtype=np.uint64)
+    for f, ((cx, cy), (hx, hy)) in enumerate(footprints):
+        inside = (np.abs(x - cx) <= hx + EDGE_TOLERANCE_DEG) & (np.abs(y - cy) <= hy + EDGE_TOLERANCE_DEG)
+        words[inside, f // 64] |= np.uint64(1) << np.uint64(f % 64)
+    return words
+
+
+def _intersect_windows(first, second):
+    """两组 (开始, 结束) 时段的交集"""
+    return [(max(a, c), min(b, d)) for a, b in first for c, d in second if max(a, c) < min(b, d)]
+
+
+def _signature_stats(word_row, footprint_times, footprint_sectors, disabled):
+    """
+    一种签名的 (次数, 最大间隔, 平均重访间隔)。
+    只有覆盖该格点的扇区全部停用的时段才不算重访间隔；其余扇区仍在观测时，
+    停用造成的更长间隔是真实的覆盖退化，照常计入
+    """
+    members = [f for f in range(len(footprint_times)) if (int(word_row[f // 64]) >> (f % 64)) & 1]
+    if not members:
+        return 0, np.nan, np.nan
+    times = np.sort(np.concatenate([footprint_times[f] for f in members]))
+    gaps = np.diff(times)
+    sectors = set().union(*(footprint_sectors[f] for f in members))
+    windows = None
+    for sector in sectors:
+        sector_windows = disabled.get(sector, [])
+        windows = sector_windows if windows is None else _intersect_windows(windows, sector_windows)
+    if windows:
+        starts, ends = np.array(windows, dtype=np.float64).T
+        # 间隔 (t_i, t_i+1) 与全部扇区都停用的时段相交
+        overlaps = ((times[:-1, None] < ends) & (times[1:, None] > starts)).any(axis=1)
+        gaps = gaps[~overlaps]
+    if len(gaps) == 0:
+        return len(times), np.nan, np.nan
+    return len(times), gaps.max(), gaps.mean()
+
+
+def coverage_stats(timeline, lats, lons, chunk_rows=256, sub_lon=SUB_SATELLITE_LON, disabled=None):
+    """
+    整个网格的覆盖统计，返回 {"count": uint16, "max_gap": float32, "mean_revisit": float32}，
+    形状均为 (len(lats), len(lons))，间隔单位秒。
+    disabled: {扇区: [(开始, 结束), ...]}（见 disabled_windows()）；覆盖某格点的扇区全部停用的时段内，
+    该格点的间隔不参与统计
+    """
+    footprints, footprint_times, footprint_sectors = group_footprints(timeline)
+    disabled = disabled or {}
+    shape = (len(lats), len(lons))
+    count = np.zeros(shape, dtype=np.uint16)
+    max_gap = np.full(shape, np.nan, dtype=np.float32)
+    mean_revisit = np.full(shape, np.nan, dtype=np.float32)
+    cache = {}      # 签名字节 -> (次数, 最大间隔, 平均间隔)，跨块复用
+
+    for start in range(0, len(lats), chunk_rows):
+        rows = slice(start, min(start + chunk_rows, len(lats)))
+        x, y, visible = scan_angles(lats[rows, None], lons[None, :], sub_lon)
+        cells = visible.nonzero()
+        if len(cells[0]) == 0:
+            continue
+        words = _signatures(x[cells], y[cells], footprints)
+
+        # 多字签名按行视为定长字节串，便于 np.unique 分组
+        keys = np.ascontiguousarray(words).view(np.dtype((np.void, words.shape[1] * 8))).ravel()
+        unique, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        table = np.empty((len(unique), 3))
+        for i, (key, row) in enumerate(zip(unique, first)):
+            key = key.tobytes()
+            if key not in cache:
+                cache[key] = _signature_stats(words[row], footprint_times, footprint_sectors, disabled)
+            table[i] = cache[key]
+
+        rows_index = cells[0] + start
+        count[rows_index, cells[1]] = np.minimum(table[inverse, 0], COUNT_MAX)
+        max_gap[rows_index, cells[1]] = table[inverse, 1]
+        mean_revisit[rows_index, cells[1]] = table[inverse, 2]
+    return {"count": count, "max_gap": max_gap, "mean_revisit": mean_revisit}
+
+
+def plot_revisit_heatmap(stats, lats, lons, field="mean_revisit", ax=None, max_pixels=2000):
+    """重访间隔热力图（分钟，对数色标），风格与 ahi_scanning_rhythm.py 一致"""
+    import matplotlib.pyplot as plt
+    from matplotlib.colors import LogNorm
+
+    if ax is None:
+        _, ax = plt.subplots(figsize=(8, 6))
+    # 显示时抽稀，避免把 2600 万格点全部交给 imshow
+    step = max(1, -(-max(len(lats), len(lons)) // max_pixels))
+    minutes = stats[field][::step, ::step] / 60.0
+    extent = (lons[0], lons[-1], lats[-1], lats[0])
+    image = ax.imshow(minutes, extent=extent, origin="upper", cmap="viridis_r",
+                      norm=LogNorm(vmin=np.nanmin(minutes), vmax=np.nanmax(minutes)))
+    plt.colorbar(image, ax=ax, shrink=0.7, label="Minutes")
+    ax.set_xlabel("Longitude (°)")
+    ax.set_ylabel("Latitude (°)")
+    label = "Mean revisit interval" if field == "mean_revisit" else "Maximum gap"
+    ax.set_title(f"Advanced Himawari Imager (AHI) {label}", fontsize=12)
+    return ax
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    import matplotlib.pyplot as plt
+
+    from ahi_scan_scheduler import ScanScheduler
+
+    parser = argparse.ArgumentParser(description="Revisit statistics of the AHI scan schedule on a lat/lon grid")
+    parser.add_argument("--hours", type=float, default=24.0)
+    parser.add_argument("--resolution", type=float, default=0.05, help="grid spacing in degrees")
+    parser.add_argument("--output", help="save the heatmap to this file instead of showing it")
+    args = parser.parse_args()
+
+    report = ScanScheduler(timeline_limit=10**7).run(args.hours * 3600)
+    lats, lons = lat_lon_grid(args.resolution)
+
+    start = time.perf_counter()
+    stats = coverage_stats(report["timeline"], lats, lons, disabled=disabled_windows(report))
+    elapsed = time.perf_counter() - start
+    print(f"{len(report['timeline']):,} observations x {lats.size * lons.size:,} cells in {elapsed:.1f} s")
+    observed = stats["count"] > 0
+    print(f"Observed cells: {observed.mean():.1%}, "
+          f"best mean revisit {np.nanmin(stats['mean_revisit']) / 60:.2f} min, "
+          f"worst max gap {np.nanmax(stats['max_gap']) / 60:.1f} min")
+
+    plot_revisit_heatmap(stats, lats, lons)
+    if args.output:
+        plt.savefig(args.output, dpi=150, bbox_inches="tight")
+    else:
+        plt.show()
@@ -0,0 +1,308 @@
+"""
+RGB 合成与色标渲染：把波段数据经查找表 (LUT) 直接写成 uint8 影像并存为 PNG。
+
+index.md 的 "Image Visualization" 一节介绍了 RGB 合成、假彩色与色标 (color bar)，这里是实现：
+
+- RECIPES            按波段名给出的合成方案，如 Landsat 9 假彩色 B5/B4/B3，
+                     resolve_recipe() 通过 spectral_bands.find_band() 校验并对应到立方体平面
+- StretchLUT         单通道的线性拉伸 + gamma，预先算成 256 / 4096 项的 uint8 表；
+                     浮点输入按 (x - low) / (high - low) 直接算下标，整数输入（如 quantization
+                     的 N 位码值）对每个码值预先查好表，一次 np.take 完成
+- composite_rgb()    三个通道逐块 (tile) 查表，原地写入 (H, W, 3) 的 uint8 数组
+- colormap_lut() / apply_colormap()   单波段 -> 色标颜色，同样是下标 + 查表
+- write_png()        只用标准库 zlib / struct 的 PNG 写出，不经过 matplotlib imshow
+
+NaN 像元输出为黑色。
+
+示例：
+    cube, meta = open_scene("scene.npy")
+    rgb = composite_scene(cube, meta, "false_color")   # (H, W, 3) uint8
+    write_png("false_color.png", rgb)
+"""
+import struct
+import zlib
+
+import numpy as np
+
+from spectral_bands import band_table, find_band
+from synthetic_scene import DEFAULT_BLOCK_SIZE, iter_blocks
+
+try:
+    import matplotlib    # 可选依赖：提供更多色标
+except ImportError:
+    matplotlib = None
+
+# 各卫星的合成方案：(红, 绿, 蓝) 通道的波段名
+RECIPES = {
+    "Landsat 9": {
+        "true_color": ("B4", "B3", "B2"),
+        "false_color": ("B5", "B4", "B3"),
+        "swir": ("B7", "B5", "B4"),
+    },
+    "Sentinel-2": {
+        "true_color": ("B4", "B3", "B2"),
+        "false_color": ("B8", "B4", "B3"),
+        "swir": ("B12", "B8A", "B4"),
+    },
+}
+
+# AHI Night Microphysics：通道是亮温差 / 亮温 (K)，固定范围，见 index.md 的示例图
+#   R = B15 - B13 (12.4 - 10.4 μm)，G = B13 - B07 (10.4 - 3.9 μm)，B = B13
+NIGHT_MICROPHYSICS = (
+    {"low": -4.0, "high": 2.0, "gamma": 1.0},
+    {"low": 0.0, "high": 10.0, "gamma": 1.0},
+    {"low": 243.0, "high": 293.0, "gamma": 1.0},
+)
+
+# 未安装 matplotlib 时可用的色标：等间距的锚点颜色，中间线性插值
+COLORMAP_ANCHORS = {
+    "gray": [(0, 0, 0), (255, 255, 255)],
+    "ndvi": [(120, 70, 20), (230, 210, 120), (250, 250, 190), (110, 180, 60), (0, 90, 20)],
+    "thermal": [(0, 0, 80), (0, 120, 255), (255, 255, 255), (255, 160, 0), (160, 0, 0)],
+}
+
+LUT_SIZES = (256, 4096)
+# 自动拉伸时参与求百分位数的最大采样像元数
+STRETCH_SAMPLES = 1 << 20
+
+
+def resolve_recipe(sensor, recipe, bands):
+    """
+    合成方案 -> 立方体平面号 (r, g, b)。
+    recipe: RECIPES[sensor] 中的名字，或三个波段名的元组
+    bands: 立方体各平面的波段名（synthetic_scene 元数据的 "bands"）
+    """
+    names = RECIPES[sensor][recipe] if isinstance(recipe, str) else tuple(recipe)
+    if len(names) != 3:
+        raise ValueError("an RGB recipe needs exactly three bands")
+    bands = list(bands)
+    table = band_table()
+    planes = []
+    for name in names:
+        row = table[find_band(sensor, name)]
+        if name not in bands:
+            raise KeyError(f"{sensor} {name} ({row['description']}) is not in the cube")
+        planes.append(bands.index(name))
+    return tuple(planes)
+
+
+def percentile_limits(band, low=2.0, high=98.0, samples=STRETCH_SAMPLES):
+    """按百分位数取拉伸范围；大影像按固定步长抽样，不读入整幅"""
+    step = max(1, int(np.sqrt(band.size / samples)))
+    sample = np.asarray(band[::step, ::step], dtype=np.float64)
+    lower, upper = np.nanpercentile(sample, [low, high])
+    return float(lower), float(upper)
+
+
+class StretchLUT:
+    """线性拉伸 + gamma 的 uint8 查找表：out = 255 · t^(1/gamma)，t = (x - low) / (high - low)"""
+
+    def __init__(self, low, high, gamma=1.0, size=4096):
+        if size not in LUT_SIZES:
+            raise ValueError(f"size must be one of {LUT_SIZES}")
+        if not high > low:
+            raise ValueError("high must be greater than low")
+        self.low, self.high, self.gamma = float(low), float(high), float(gamma)
+        t = np.linspace(0.0, 1.0, size)
+        self.table = np.round(255.0 * t ** (1.0 / gamma)).astype(np.uint8)
+        self.scale = np.float32((size - 1) / (self.high - self.low))
+        self.offset = np.float32(self.low)
+        self._code_tables = {}
+
+    def __len__(self):
+        return len(self.table)
+
+    def code_table(self, dtype):
+        """
+        8/16 位整数输入的完整查找表：每个可能的码值直接对应一个 uint8 输出。
+        表按码值的无符号位模式排列，有符号输入 view 成同宽的无符号类型后直接查表
+        （int16 的 -1 即 uint16 的 65535），不需要做减法。
+        """
+        dtype = np.dtype(dtype)
+        table = self._code_tables.get(dtype)
+        if table is None:
+            unsigned = np.dtype(f"u{dtype.itemsize}")
+            codes = np.arange(np.iinfo(unsigned).max + 1, dtype=unsigned).view(dtype)
+            table = self.apply(codes.astype(np.float32))
+            self._code_tables[dtype] = table
+        return table
+
+    def indices(self, data, position=None, index=None):
+        """
+        浮点 data -> 表项下标 (int32)。position / index 为可复用的 float32 / int32 缓冲区
+        （与 data 同形状），逐块调用时传入以避免每块重新分配。
+        """
+        x = np.empty(data.shape, dtype=np.float32) if position is None else position
+        i = np.empty(data.shape, dtype=np.int32) if index is None else index
+        np.subtract(data, self.offset, out=x, casting="unsafe")
+        x *= self.scale
+        x += np.float32(0.5)                     # 截断前加 0.5 即四舍五入到最近的表项
+        # fmax / fmin 遇 NaN 取另一个操作数，因此 NaN 落到表项 0（黑色），转换时不产生无效值
+        np.fmax(x, 0, out=x)
+        np.fmin(x, len(self) - 1, out=x)
+        np.copyto(i, x, casting="unsafe")
+        return i
+
+    def apply(self, data, out=None, position=None, index=None):
+        """data -> uint8，形状不变；缓冲区参数同 indices()"""
+        data = np.asarray(data)
+        if out is None:
+            out = np.empty(data.shape, dtype=np.uint8)
+        if data.dtype.kind in "ui" and data.dtype.itemsize <= 2:
+            table, i = self.code_table(data.dtype), data.view(f"u{data.dtype.itemsize}")
+        else:
+            table, i = self.table, self.indices(data, position, index)
+        np.take(table, i, out=out, mode="clip")
+        return out
+
+
+def _as_stretch(stretch, band, size):
+    if isinstance(stretch, StretchLUT):
+        return stretch
+    if stretch is None:
+        stretch = {}
+    if "low" not in stretch or "high" not in stretch:
+        low, high = percentile_limits(band)
+        stretch = {"low": low, "high": high if high > low else low + 1.0, **stretch}
+    return StretchLUT(stretch["low"], stretch["high"], stretch.get("gamma", 1.0), size)
+
+
+def composite_rgb(red, green, blue, stretches=None, out=None, tile=DEFAULT_BLOCK_SIZE, size=4096):
+    """
+    三个 (H, W) 通道 -> (H, W, 3) uint8 RGB，逐块写入 out。
+    stretches: 每通道一个 StretchLUT 或 {"low", "high", "gamma"} dict；缺少范围时按 2%-98% 百分位自动拉伸
+    通道可以是内存映射数组，也可以是亮温差等任意二维数组（如 NIGHT_MICROPHYSICS）
+    """
+    channels = (red, green, blue)
+    shape = red.shape
+    if any(channel.shape != shape for channel in channels):
+        raise ValueError("all three channels must have the same shape")
+    stretches = stretches or (None, None, None)
+    luts = [_as_stretch(stretch, channel, size) for stretch, channel in zip(stretches, channels)]
+    if out is None:
+        out = np.empty(shape + (3,), dtype=np.uint8)
+
+    position = np.empty((min(tile, shape[0]), min(tile, shape[1])), dtype=np.float32)
+    index = np.empty(position.shape, dtype=np.int32)
+    plane = np.empty(position.shape, dtype=np.uint8)
+    for _, rows, cols in iter_blocks(shape, tile):
+        h, w = rows.stop - rows.start, cols.stop - cols.start
+        for c, (lut, channel) in enumerate(zip(luts, channels)):
+            lut.apply(channel[rows, cols], out=plane[:h, :w], position=position[:h, :w], index=index[:h, :w])
+            out[rows, cols, c] = plane[:h, :w]
+    return out
+
+
+def composite_scene(cube, metadata, recipe="true_color", stretches=None, out=None, tile=DEFAULT_BLOCK_SIZE):
+    """synthetic_scene 场景 (cube, 元数据) 按方案合成 RGB"""
+    planes = resolve_recipe(metadata["sensor"], recipe, metadata["bands"])
+    return composite_rgb(*(cube[plane] for plane in planes), stretches=stretches, out=out, tile=tile)
+
+
+def colormap_lut(name="gray", size=256):
+    """(size, 3) uint8 色标表；优先用 COLORMAP_ANCHORS，其余名字交给 matplotlib"""
+    if name in COLORMAP_ANCHORS:
+        anchors = np.asarray(COLORMAP_ANCHORS[name], dtype=np.float64)
+        positions = np.linspace(0.0, 1.0, len(anchors))
+        t = np.linspace(0.0, 1.0, size)
+        table = np.stack([np.interp(t, positions, anchors[:, c]) for c in range(3)], axis=-1)
+        return np.round(table).astype(np.uint8)
+    if matplotlib is None:
+        raise KeyError(f"Unknown colormap {name!r}; available without matplotlib: {', '.join(COLORMAP_ANCHORS)}")
+    rgba = matplotlib.colormaps[name](np.linspace(0.0, 1.0, size))
+    return np.round(rgba[:, :3] * 255).astype(np.uint8)
+
+
+def apply_colormap(band, low, high, colormap="gray", out=None, tile=DEFAULT_BLOCK_SIZE, size=256):
+    """单波段 (H, W) -> 色标着色的 (H, W, 3) uint8；colormap 为名字或 colormap_lut() 的表"""
+    table = colormap_lut(colormap, size) if isinstance(colormap, str) else np.asarray(colormap, dtype=np.uint8)
+    # 线性拉伸只用来求下标，表项数与颜色表相同
+    stretch = StretchLUT(low, high, 1.0, len(table))
+    if out is None:
+        out = np.empty(band.shape + (3,), dtype=np.uint8)
+
+    position = np.empty((min(tile, band.shape[0]), min(tile, band.shape[1])), dtype=np.float32)
+    index = np.empty(position.shape, dtype=np.int32)
+    for _, rows, cols in iter_blocks(band.shape, tile):
+        h, w = rows.stop - rows.start, cols.stop - cols.start
+        i = stretch.indices(band[rows, cols], position[:h, :w], index[:h, :w])
+        np.take(table, i, axis=0, out=out[rows, cols], mode="clip")
+    return out
+
+
+def colorbar(colormap="gray", length=256, thickness=16, horizontal=True):
+    """色标条影像 (uint8 RGB)，从左到右（或从下到上）对应 low -> high"""
+    table = colormap_lut(colormap, length) if isinstance(colormap, str) else np.asarray(colormap, dtype=np.uint8)
+    bar = np.broadcast_to(table[None, :, :], (thickness, len(table), 3))
+    return np.ascontiguousarray(bar if horizontal else bar.transpose(1, 0, 2)[::-1])
+
+
+def _png_chunk(kind, data):
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+def write_png(path, image, compress_level=1, rows_per_chunk=256):
+    """
+    uint8 影像写为 PNG：(H, W) 灰度、(H, W, 3) RGB 或 (H, W, 4) RGBA。
+    每行加滤波类型 0 (None) 后分块送入 zlib，低压缩级别优先速度。
+    """
+    image = np.asarray(image)
+    if image.dtype != np.uint8:
+        raise ValueError("write_png() expects a uint8 image")
+    color_types = {1: 0, 3: 2, 4: 6}
+    channels = 1 if image.ndim == 2 else image.shape[2]
+    if channels not in color_types:
+        raise ValueError("image must be (H, W), (H, W, 3) or (H, W, 4)")
+    height, width = image.shape[:2]
+    rows = image.reshape(height, width * channels)
+
+    compressor = zlib.compressobj(compress_level)
+    buffer = np.zeros((min(rows_per_chunk, height), width * channels + 1), dtype=np.uint8)
+    parts = []
+    for start in range(0, height, rows_per_chunk):
+        stop = min(start + rows_per_chunk, height)
+        buffer[:stop - start, 1:] = rows[start:stop]
+        parts.append(compressor.compress(buffer[:stop - start].tobytes()))
+    parts.append(compressor.flush())
+
+    header = struct.pack(">IIBBBBB", width, height, 8, color_types[channels], 0, 0, 0)
+    with open(path, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        f.write(_png_chunk(b"IHDR", header))
+        f.write(_png_chunk(b"IDAT", b"".join(parts)))
+        f.write(_png_chunk(b"IEND", b""))
+    return path
+
+
+if __name__ == "__main__":
+    import os
+    import tempfile
+    import time
+
+    from spectral_indices import normalized_difference
+    from synthetic_scene import random_land_cover, scene_metadata, simulate_block
+
+    size = 2048
+    land_cover = random_land_cover((size, size), cell=64, seed=0)
+    metadata = scene_metadata("Sentinel-2", land_cover.shape)
+    cube = np.ascontiguousarray(simulate_block(land_cover, np.array(metadata["center_nm"]), np.random.SeedSequence(0)))
+    output_dir = tempfile.mkdtemp(prefix="rgb_composite_")
+
+    for recipe in RECIPES["Sentinel-2"]:
+        start = time.perf_counter()
+        rgb = composite_scene(cube, metadata, recipe)
+        rendered = time.perf_counter() - start
+        path = write_png(os.path.join(output_dir, f"{recipe}.png"), rgb)
+        total = time.perf_counter() - start
+        print(f"{recipe:<12} {rgb.shape}: composite {rendered:.2f} s, + PNG {total:.2f} s "
+              f"({os.path.getsize(path) / 1e6:.1f} MB)")
+
+    nir, red = cube[metadata["bands"].index("B8")], cube[metadata["bands"].index("B4")]
+    ndvi = np.empty(nir.shape, dtype=np.float32)
+    normalized_difference(nir, red, ndvi, np.empty_like(ndvi), np.empty(ndvi.shape, dtype=bool))
+    start = time.perf_counter()
+    colored = apply_colormap(ndvi, -0.2, 0.9, "ndvi")
+    write_png(os.path.join(output_dir, "ndvi.png"), colored)
+    write_png(os.path.join(output_dir, "ndvi_colorbar.png"), colorbar("ndvi", 512, 24))
+    print(f"NDVI colormap {colored.shape} + PNG: {time.perf_counter() - start:.2f} s")
+    print(f"PNG files written to {output_dir}")
@@ -0,0 +1,160 @@
+"""
+共享的光谱波段注册表：大气透过率曲线 + Landsat 9 / Sentinel-2 波段定义。
+
+app.py、landsat_sentinel_interactive.py、landsat_sentinel_static.py 都从这里导入，
+数据只维护一份。
+
+- wavelength / transmission / satellite_bands 保持原来的列表与 dict 形式，供绘图代码直接使用
+- band_table() 把全部波段转成 NumPy 结构化数组（边界为 float64，分辨率为米，
+  卫星与颜色为类别索引），筛选用布尔掩码完成，不再逐个遍历 dict，例如：
+
+    table = band_table()
+    table[wavelength_mask(table, max_um=2.5) & sensor_mask(table, "Landsat 9")]
+
+numpy 只在第一次调用 band_table() 时导入，不影响 app.py 的冷启动。
+"""
+from functools import lru_cache
+
+# 更详细的大气透过率数据（基于真实大气窗口）
+wavelength = [0.4, 0.45, 0.5, 0.55, 0.6, 0.65, 0.7, 0.75, 0.8, 0.85, 0.9, 0.95, 1.0,
+              1.1, 1.2, 1.3, 1.4, 1.5, 1.6, 1.7, 1.8, 1.9, 2.0, 2.1, 2.2, 2.3, 2.4, 2.5,
+              10.0, 10.5, 11.0, 11.5, 12.0, 12.5]
+
+transmission = [75, 80, 85, 88, 90, 88, 85, 80, 75, 70, 65, 60, 55, 50, 45, 40, 35, 30, 25, 20, 15, 10, 15, 20, 25, 30, 35, 40,
+                50, 55, 60, 65, 70, 75]
+
+# 详细的卫星波段数据
+satellite_bands = {
+    "Landsat 9": [
+        {"Band": "B1", "Range": (0.43, 0.45), "Resolution": "30 m", "Color": "lightblue", "Description": "Coastal aerosol"},
+        {"Band": "B2", "Range": (0.45, 0.51), "Resolution": "30 m", "Color": "blue", "Description": "Blue"},
+        {"Band": "B3", "Range": (0.53, 0.59), "Resolution": "30 m", "Color": "green", "Description": "Green"},
+        {"Band": "B4", "Range": (0.64, 0.67), "Resolution": "30 m", "Color": "red", "Description": "Red"},
+        {"Band": "B5", "Range": (0.85, 0.88), "Resolution": "30 m", "Color": "lightgreen", "Description": "NIR"},
+        {"Band": "B6", "Range": (1.57, 1.65), "Resolution": "30 m", "Color": "orange", "Description": "SWIR 1"},
+        {"Band": "B7", "Range": (2.11, 2.29), "Resolution": "30 m", "Color": "brown", "Description": "SWIR 2"},
+        {"Band": "B8", "Range": (0.50, 0.68), "Resolution": "15 m", "Color": "purple", "Description": "Panchromatic"},
+        {"Band": "B9", "Range": (1.36, 1.38), "Resolution": "30 m", "Color": "navy", "Description": "Cirrus"},
+        {"Band": "B10", "Range": (10.6, 11.2), "Resolution": "100 m", "Color": "crimson", "Description": "TIRS 1"},
+        {"Band": "B11", "Range": (11.5, 12.5), "Resolution": "100 m", "Color": "crimson", "Description": "TIRS 2"}
+    ],
+    "Sentinel-2": [
+        {"Band": "B1", "Range": (0.433, 0.453), "Resolution": "60 m", "Color": "lightblue", "Description": "Coastal aerosol"},
+        {"Band": "B2", "Range": (0.458, 0.523), "Resolution": "10 m", "Color": "blue", "Description": "Blue"},
+        {"Band": "B3", "Range": (0.543, 0.578), "Resolution": "10 m", "Color": "green", "Description": "Green"},
+        {"Band": "B4", "Range": (0.650, 0.680), "Resolution": "10 m", "Color": "red", "Description": "Red"},
+        {"Band": "B5", "Range": (0.698, 0.713), "Resolution": "20 m", "Color": "lightgreen", "Description": "Red edge 1"},
+        {"Band": "B6", "Range": (0.733, 0.748), "Resolution": "20 m", "Color": "yellow", "Description": "Red edge 2"},
+        {"Band": "B7", "Range": (0.773, 0.793), "Resolution": "20 m", "Color": "orange", "Description": "Red edge 3"},
+        {"Band": "B8", "Range": (0.785, 0.900), "Resolution": "10 m", "Color": "purple", "Description": "NIR"},
+        {"Band": "B8A", "Range": (0.855, 0.875), "Resolution": "20 m", "Color": "forestgreen", "Description": "NIR narrow"},
+        {"Band": "B9", "Range": (0.935, 0.955), "Resolution": "60 m", "Color": "navy", "Description": "Water vapour"},
+        {"Band": "B10", "Range": (1.365, 1.385), "Resolution": "60 m", "Color": "navy", "Description": "Cirrus"},
+        {"Band": "B11", "Range": (1.565, 1.655), "Resolution": "20 m", "Color": "brown", "Description": "SWIR 1"},
+        {"Band": "B12", "Range": (2.100, 2.280), "Resolution": "20 m", "Color": "saddlebrown", "Description": "SWIR 2"}
+    ]
+}
+
+# 类别索引：band_table() 中 sensor / color 字段存的是下面元组的下标
+SENSORS = tuple(satellite_bands)
+COLORS = tuple(dict.fromkeys(band["Color"] for bands in satellite_bands.values() for band in bands))
+
+BAND_DTYPE = [
+    ("sensor", "u1"),          # SENSORS 下标
+    ("band", "U4"),            # 波段名，如 "B8A"
+    ("lower", "f8"),           # 波长下界 (μm)
+    ("upper", "f8"),           # 波长上界 (μm)
+    ("resolution_m", "f8"),    # 空间分辨率 (m)
+    ("color", "u1"),           # COLORS 下标
+    ("description", "U24"),    # 波段描述，如 "SWIR 1"
+]
+
+
+def parse_resolution(resolution):
+    """'30 m' -> 30.0"""
+    value, unit = resolution.split()
+    if unit != "m":
+        raise ValueError(f"Unsupported resolution unit: {resolution!r}")
+    return float(value)
+
+
+@lru_cache(maxsize=None)
+def band_table():
+    """
+    全部卫星波段的结构化数组（按 satellite_bands 中的顺序），首次调用时构建。
+    返回的数组设为只读，调用方需要修改时请先 copy()。
+    """
+    import numpy as np
+
+    rows = [
+        (SENSORS.index(sensor), band["Band"], band["Range"][0], band["Range"][1],
+         parse_resolution(band["Resolution"]), COLORS.index(band["Color"]), band["Description"])
+        for sensor, bands in satellite_bands.items()
+        for band in bands
+    ]
+    table = np.array(rows, dtype=BAND_DTYPE)
+    table.flags.writeable = False
+    return table
+
+
+@lru_cache(maxsize=None)
+def transmission_curve():
+    """大气透过率曲线 (wavelength μm, transmission %)，均为只读 float64 数组"""
+    import numpy as np
+
+    wavelength_um = np.array(wavelength, dtype=np.float64)
+    transmission_pct = np.array(transmission, dtype=np.float64)
+    wavelength_um.flags.writeable = False
+    transmission_pct.flags.writeable = False
+    return wavelength_um, transmission_pct
+
+
+# ========== 向量化访问 ==========
+def sensor_mask(table, sensor):
+    """属于指定卫星（名称或 SENSORS 下标）的波段掩码"""
+    index = SENSORS.index(sensor) if isinstance(sensor, str) else sensor
+    return table["sensor"] == index
+
+
+def wavelength_mask(table, min_um=None, max_um=None):
+    """整个波段落在 [min_um, max_um] 内的掩码，例如 max_um=2.5 即“2.5 μm 以下的全部波段”"""
+    import numpy as np
+
+    mask = np.ones(len(table), dtype=bool)
+    if min_um is not None:
+        mask &= table["lower"] >= min_um
+    if max_um is not None:
+        mask &= table["upper"] <= max_um
+    return mask
+
+
+def description_mask(table, description):
+    """波段描述完全匹配（如 "NIR"、"SWIR 1"）的掩码"""
+    return table["description"] == description
+
+
+def band_centers(table):
+    return (table["lower"] + table["upper"]) / 2
+
+
+def band_widths(table):
+    return table["upper"] - table["lower"]
+
+
+def sensor_names(table):
+    """结构化数组中 sensor 字段对应的卫星名列表"""
+    return [SENSORS[index] for index in table["sensor"]]
+
+
+def band_labels(table):
+    """形如 'Landsat 9 B5' 的波段标签列表"""
+    return [f"{SENSORS[row['sensor']]} {row['band']}" for row in table]
+
+
+def find_band(sensor, band_name):
+    """按卫星名和波段名返回 band_table() 中的行号，找不到时抛 KeyError"""
+    table = band_table()
+    matches = (sensor_mask(table, sensor) & (table["band"] == band_name)).nonzero()[0]
+    if len(matches) == 0:
+        raise KeyError(f"{sensor} has no band {band_name!r}")
+    return int(matches[0])
@@ -0,0 +1,137 @@
+"""
+流式光谱指数计算：在内存映射的波段立方体上逐块计算 NDVI / NDWI / NBR。
+
+    NDVI = (NIR - Red)    / (NIR + Red)      植被
+    NDWI = (Green - NIR)  / (Green + NIR)    水体 (McFeeters)
+    NBR  = (NIR - SWIR 2) / (NIR + SWIR 2)   火烧迹地
+
+波段按 satellite_bands 中的 Description（"Red"、"NIR"、"SWIR 2" ...）自动对应到
+立方体的波段平面，因此 Landsat 9 与 Sentinel-2 的场景用法相同。
+
+index_blocks() 是生成器：每次读入一块波段数据，用 np.subtract / np.add /
+np.divide(out=, where=) 写入预先分配的缓冲区，不产生临时数组；
+所需内存只与块大小和指数个数有关，与场景大小无关。
+产出的块是缓冲区的视图，在下一次迭代时会被覆盖，需要保留时请 copy()。
+
+示例：
+    cube, meta = open_scene("scene.npy")
+    for rows, cols, blocks in index_blocks(cube, meta["descriptions"]):
+        blocks["NDVI"] ...
+    write_indices("scene.npy", "indices.npy")
+"""
+import numpy as np
+
+from synthetic_scene import DEFAULT_BLOCK_SIZE, iter_blocks, open_scene, sidecar_path, write_sidecar
+
+# 指数名: (分子被减数波段, 减数波段)，值为波段描述
+INDICES = {
+    "NDVI": ("NIR", "Red"),
+    "NDWI": ("Green", "NIR"),
+    "NBR": ("NIR", "SWIR 2"),
+}
+
+
+def resolve_bands(descriptions, names=tuple(INDICES)):
+    """{指数名: (平面号 a, 平面号 b)}，descriptions 为立方体各波段平面的描述"""
+    descriptions = list(descriptions)
+    planes = {}
+    for name in names:
+        if name not in INDICES:
+            raise KeyError(f"Unknown index {name!r}; available: {', '.join(INDICES)}")
+        missing = [description for description in INDICES[name] if description not in descriptions]
+        if missing:
+            raise KeyError(f"{name} needs bands {missing} which the cube does not have")
+        planes[name] = tuple(descriptions.index(description) for description in INDICES[name])
+    return planes
+
+
+def normalized_difference(a, b, out, denominator, valid):
+    """
+    (a - b) / (a + b) 写入 out；分母为 0 的像元记为 NaN。
+    denominator / valid 为与 out 同形状的 float / bool 缓冲区。
+    加减在 out 的浮点类型下进行：整数 DN / 量化码直接相减会回绕（uint16 的 100 - 200 = 65436）
+    """
+    np.subtract(a, b, out=out, dtype=out.dtype)
+    np.add(a, b, out=denominator, dtype=denominator.dtype)
+    np.not_equal(denominator, 0, out=valid)
+    np.divide(out, denominator, out=out, where=valid)
+    np.logical_not(valid, out=valid)
+    np.copyto(out, np.nan, where=valid)
+    return out
+
+
+def index_blocks(cube, descriptions, names=tuple(INDICES), block_size=DEFAULT_BLOCK_SIZE, dtype=np.float32):
+    """
+    逐块产出 (行切片, 列切片, {指数名: 块})。
+    cube: (波段数, H, W) 数组或内存映射；descriptions: 各波段平面的描述
+    """
+    planes = resolve_bands(descriptions, names)
+    buffers = {name: np.empty((block_size, block_size), dtype=dtype) for name in planes}
+    denominator = np.empty((block_size, block_size), dtype=dtype)
+    valid = np.empty((block_size, block_size), dtype=bool)
+
+    for _, rows, cols in iter_blocks(cube.shape[1:], block_size):
+        height, width = rows.stop - rows.start, cols.stop - cols.start
+        blocks = {}
+        for name, (a, b) in planes.items():
+            blocks[name] = normalized_difference(
+                cube[a, rows, cols], cube[b, rows, cols],
+                buffers[name][:height, :width], denominator[:height, :width], valid[:height, :width],
+            )
+        yield rows, cols, blocks
+
+
+def write_indices(scene_path, path, names=tuple(INDICES), block_size=DEFAULT_BLOCK_SIZE):
+    """
+    读取 synthetic_scene 格式的场景，把指数写入 path (.npy)，形状 (指数个数, H, W)，float32。
+    同名 .json 记录指数顺序与来源场景。返回只读内存映射数组。
+    """
+    cube, metadata = open_scene(scene_path)
+    names = list(names)
+    output = np.lib.format.open_memmap(path, mode="w+", dtype=np.float32,
+                                       shape=(len(names),) + cube.shape[1:])
+    for rows, cols, blocks in index_blocks(cube, metadata["descriptions"], names, block_size):
+        for i, name in enumerate(names):
+            output[i, rows, cols] = blocks[name]
+    output.flush()
+    del output
+
+    write_sidecar(path, {
+        "indices": names,
+        "bands": {name: list(INDICES[name]) for name in names},
+        "source": sidecar_path(scene_path),
+        "sensor": metadata["sensor"],
+        "shape": [len(names)] + list(cube.shape[1:]),
+        "dtype": "float32",
+    })
+    return np.load(path, mmap_mode="r")
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Compute NDVI/NDWI/NBR over a synthetic_scene cube")
+    parser.add_argument("scene", help="scene .npy written by synthetic_scene.py")
+    parser.add_argument("output", help="output .npy path for the index stack")
+    parser.add_argument("--indices", nargs="+", default=list(INDICES), choices=list(INDICES))
+    parser.add_argument("--block-size", type=int, default=DEFAULT_BLOCK_SIZE)
+    args = parser.parse_args()
+
+    # 整数 DN 立方体与同值的浮点立方体结果一致（不发生整数回绕）
+    descriptions = ["Green", "Red", "NIR", "SWIR 2"]
+    counts = np.random.default_rng(0).integers(0, 65535, size=(4, 300, 200), dtype=np.uint16)
+    counts[:, 0, :3] = [[100, 0, 7], [200, 0, 7], [100, 0, 7], [200, 0, 7]]
+    for (_, _, integer), (_, _, floating) in zip(index_blocks(counts, descriptions, block_size=128),
+                                                  index_blocks(counts.astype(np.float32), descriptions, block_size=128)):
+        for name in INDICES:
+            np.testing.assert_allclose(integer[name], floating[name], rtol=1e-6, equal_nan=True)
+    first = next(index_blocks(counts, descriptions, block_size=128))[2]
+    assert np.isclose(first["NDVI"][0, 0], -1 / 3) and np.isclose(first["NBR"][0, 0], -1 / 3)
+    assert all(np.isnan(first[name][0, 1]) for name in INDICES)
+
+    start = time.perf_counter()
+    result = write_indices(args.scene, args.output, args.indices, args.block_size)
+    print(f"{args.output}: {result.shape} in {time.perf_counter() - start:.1f} s")
+    for name, plane in zip(args.indices, result):
+        print(f"  {name:<5} mean {np.nanmean(plane[::16, ::16]):+.3f}")
@@ -0,0 +1,163 @@
+"""
+光谱响应函数 (SRF) 卷积：把任意光谱换算成各波段的等效值。
+
+satellite_bands 里每个波段只是理想的矩形 Range；这里支持载入实测的逐波段 SRF
+（波长/响应表），在统一波长网格上把全部 SRF 重采样成一个 (波段数 × 网格点数) 的
+权重矩阵 M（已含梯形积分权重并按行归一化），于是
+
+    波段等效值 = ∫ S(λ) R(λ) dλ / ∫ R(λ) dλ  ≈  M @ S
+
+成千上万条光谱一次矩阵乘法即可得到全部波段的结果。M 按 (SRF, 网格) 缓存；
+安装了 scipy 时稀疏的 M（如矩形 SRF）会自动转成 CSR 稀疏矩阵。
+
+SRF 用 dict 表示，与 satellite_bands 的风格一致：
+    {"Sensor": "Landsat 9", "Band": "B5", "Wavelength": array(μm), "Response": array}
+"""
+import csv
+import hashlib
+
+import numpy as np
+
+from spectral_bands import SENSORS, band_table, sensor_mask, wavelength_mask
+
+try:
+    import scipy.sparse as scipy_sparse   # 可选依赖
+except ImportError:
+    scipy_sparse = None
+
+# 非零元素占比低于该值时使用稀疏矩阵
+SPARSE_DENSITY = 0.25
+MAX_CACHED_MATRICES = 16
+
+_matrix_cache = {}
+
+
+def boxcar_srfs(sensor=None, min_um=None, max_um=None):
+    """由 spectral_bands 的 Range 生成理想矩形 SRF，可按卫星和波长范围筛选"""
+    table = band_table()
+    mask = wavelength_mask(table, min_um, max_um)
+    if sensor is not None:
+        mask &= sensor_mask(table, sensor)
+    return [
+        {
+            "Sensor": SENSORS[row["sensor"]],
+            "Band": str(row["band"]),
+            # np.interp(left=0, right=0) 会把两点 [lower, upper] 的常数响应当作矩形窗
+            "Wavelength": np.array([row["lower"], row["upper"]]),
+            "Response": np.ones(2),
+        }
+        for row in table[mask]
+    ]
+
+
+def load_srf_csv(path, sensor, wavelength_unit="um"):
+    """
+    读取常见的 RSR 表格：第一列为波长，其余每列一个波段，表头为波段名，例如
+
+        wavelength,B1,B2,B3
+        0.420,0.001,0.000,0.000
+        ...
+
+    wavelength_unit: 'um' 或 'nm'
+    """
+    if wavelength_unit not in ("um", "nm"):
+        raise ValueError("wavelength_unit must be 'um' or 'nm'")
+    with open(path, newline="", encoding="utf-8") as f:
+        header = next(csv.reader(f))
+    data = np.loadtxt(path, delimiter=",", skiprows=1, ndmin=2)
+    wavelength_um = data[:, 0] / 1000.0 if wavelength_unit == "nm" else data[:, 0]
+    order = np.argsort(wavelength_um, kind="stable")
+    return [
+        {"Sensor": sensor, "Band": name.strip(), "Wavelength": wavelength_um[order], "Response": data[order, column]}
+        for column, name in enumerate(header[1:], start=1)
+    ]
+
+
+def trapezoid_weights(grid):
+    """梯形积分权重：∫ f dλ ≈ weights @ f"""
+    weights = np.zeros_like(grid, dtype=np.float64)
+    steps = np.diff(grid)
+    weights[:-1] += steps * 0.5
+    weights[1:] += steps * 0.5
+    return weights
+
+
+def _cache_key(srfs, grid, sparse):
+    digest = hashlib.sha1(np.ascontiguousarray(grid, dtype=np.float64).tobytes())
+    for srf in srfs:
+        digest.update(f"{srf['Sensor']}|{srf['Band']}".encode("utf-8"))
+        digest.update(np.ascontiguousarray(srf["Wavelength"], dtype=np.float64).tobytes())
+        digest.update(np.ascontiguousarray(srf["Response"], dtype=np.float64).tobytes())
+    return digest.hexdigest(), sparse
+
+
+def srf_matrix(srfs, grid, sparse=None):
+    """
+    在波长网格 grid (μm) 上重采样全部 SRF，返回按行归一化的 (波段数 × 网格点数) 权重矩阵。
+    sparse: None 自动选择（需要 scipy）；True 强制稀疏；False 返回 numpy 稠密数组。
+    """
+    grid = np.asarray(grid, dtype=np.float64)
+    key = _cache_key(srfs, grid, sparse)
+    matrix = _matrix_cache.get(key)
+    if matrix is not None:
+        return matrix
+
+    responses = np.vstack([
+        np.interp(grid, srf["Wavelength"], srf["Response"], left=0.0, right=0.0)
+        for srf in srfs
+    ])
+    weights = responses * trapezoid_weights(grid)
+    norms = weights.sum(axis=1, keepdims=True)
+    empty = (norms[:, 0] <= 0).nonzero()[0]
+    if len(empty):
+        names = ", ".join(f"{srfs[i]['Sensor']} {srfs[i]['Band']}" for i in empty)
+        raise ValueError(f"SRF has no support on the wavelength grid: {names}")
+    weights /= norms
+
+    if sparse is None:
+        sparse = scipy_sparse is not None and np.count_nonzero(weights) < SPARSE_DENSITY * weights.size
+    if sparse:
+        if scipy_sparse is None:
+            raise ImportError("sparse=True requires scipy")
+        weights = scipy_sparse.csr_matrix(weights)
+    else:
+        weights.flags.writeable = False
+
+    if len(_matrix_cache) >= MAX_CACHED_MATRICES:
+        _matrix_cache.clear()
+    _matrix_cache[key] = weights
+    return weights
+
+
+def band_equivalent(spectra, grid, srfs, sparse=None):
+    """
+    把光谱换算为各波段等效值。
+    spectra: (..., 网格点数)，grid: 对应波长 (μm)，返回 (..., 波段数)
+    """
+    spectra = np.asarray(spectra)
+    matrix = srf_matrix(srfs, grid, sparse)
+    flat = spectra.reshape(-1, spectra.shape[-1])
+    result = np.asarray((matrix @ flat.T).T)
+    return result.reshape(spectra.shape[:-1] + (len(srfs),))
+
+
+if __name__ == "__main__":
+    import time
+
+    from toy_reflectance_simulation import generate_spectrum, materials, wavelengths_cont
+
+    grid_um = wavelengths_cont / 1000.0
+    srfs = boxcar_srfs(min_um=grid_um[0], max_um=grid_um[-1])
+    print("Bands inside the toy wavelength range:", [f"{s['Sensor']} {s['Band']}" for s in srfs])
+
+    # 每种地物 100 条带噪声的光谱，一次生成
+    spectra = generate_spectrum(np.repeat(materials, 100), np.random.default_rng(0))
+    result = band_equivalent(spectra, grid_um, srfs)
+    for i, material in enumerate(materials):
+        mean = result[i * 100:(i + 1) * 100].mean(axis=0)
+        print(f"{material:<11}", " ".join(f"{value:.3f}" for value in mean))
+
+    many = np.tile(spectra, (40, 1))   # 12000 条光谱
+    start = time.perf_counter()
+    band_equivalent(many, grid_um, srfs)
+    print(f"\n{len(many)} spectra x {len(srfs)} bands: {(time.perf_counter() - start) * 1e3:.1f} ms")
@@ -0,0 +1,168 @@
+"""
+合成场景生成：由土地覆盖栅格（植被/水体/土壤类别）生成多波段反射率立方体。
+
+反射率模型来自 toy_reflectance_simulation.simulate_reflectance()，波段取自
+spectral_bands 注册表中指定卫星的反射波段（上界 <= 2.5 μm，以波段中心波长计算）。
+
+场景按块处理，峰值内存只与块大小有关（默认 512×512），可生成整景
+Sentinel-2 10980×10980 的测试数据：
+- 输出为 float32 的 .npy 内存映射文件，形状 (波段数, H, W)，np.load(mmap_mode='r') 即可读取
+- 同名 .json 附带元数据（卫星、波段、中心波长、块大小、随机种子）
+- 每个块的随机数流由 SeedSequence(seed).spawn() 按块序号派生，结果与处理顺序无关
+
+示例：
+    land_cover = random_land_cover((10980, 10980), path="land_cover.npy")
+    generate_scene(land_cover, "scene.npy", sensor="Sentinel-2")
+    cube, meta = open_scene("scene.npy")
+"""
+import json
+import os
+
+import numpy as np
+
+from spectral_bands import SENSORS, band_centers, band_table, sensor_mask, wavelength_mask
+from toy_reflectance_simulation import MATERIALS, simulate_reflectance
+
+DEFAULT_BLOCK_SIZE = 512
+# 反射波段的上界 (μm)，热红外波段不参与反射率模拟
+REFLECTIVE_MAX_UM = 2.5
+
+
+def reflective_bands(sensor):
+    """指定卫星的反射波段（band_table() 的行）"""
+    table = band_table()
+    return table[sensor_mask(table, sensor) & wavelength_mask(table, max_um=REFLECTIVE_MAX_UM)]
+
+
+def iter_blocks(shape, block_size=DEFAULT_BLOCK_SIZE):
+    """按行优先顺序切块：依次产出 (块序号, 行切片, 列切片)"""
+    height, width = shape
+    index = 0
+    for row in range(0, height, block_size):
+        for col in range(0, width, block_size):
+            yield index, slice(row, min(row + block_size, height)), slice(col, min(col + block_size, width))
+            index += 1
+
+
+def block_count(shape, block_size=DEFAULT_BLOCK_SIZE):
+    height, width = shape
+    return -(-height // block_size) * -(-width // block_size)
+
+
+def block_seeds(seed, shape, block_size=DEFAULT_BLOCK_SIZE):
+    """每个块一个独立的 SeedSequence，下标即块序号"""
+    return np.random.SeedSequence(seed).spawn(block_count(shape, block_size))
+
+
+def simulate_block(land_cover_block, centers_nm, seed_sequence, dtype=np.float32):
+    """单块反射率，返回 (波段数, h, w)"""
+    rng = np.random.default_rng(seed_sequence)
+    reflectance = simulate_reflectance(centers_nm, np.asarray(land_cover_block), rng, dtype=dtype)
+    return np.moveaxis(reflectance, -1, 0)
+
+
+def sidecar_path(path):
+    """scene.npy -> scene.json"""
+    root, _ = os.path.splitext(path)
+    return root + ".json"
+
+
+def _open_land_cover(land_cover):
+    if isinstance(land_cover, (str, os.PathLike)):
+        return np.load(land_cover, mmap_mode="r")
+    return np.asarray(land_cover)
+
+
+def scene_metadata(sensor, shape, block_size=DEFAULT_BLOCK_SIZE, seed=0):
+    """(H, W) 场景的元数据：卫星、反射波段及其中心波长、立方体形状、分块与种子"""
+    bands = reflective_bands(sensor)
+    return {
+        "sensor": sensor,
+        "bands": [str(band) for band in bands["band"]],
+        "descriptions": [str(description) for description in bands["description"]],
+        "center_nm": [round(float(center), 3) for center in band_centers(bands) * 1000.0],
+        "shape": [len(bands)] + list(shape),
+        "dtype": "float32",
+        "materials": list(MATERIALS),
+        "block_size": block_size,
+        "seed": seed,
+    }
+
+
+def write_sidecar(path, metadata):
+    with open(sidecar_path(path), "w", encoding="utf-8") as f:
+        json.dump(metadata, f, indent=2)
+
+
+def generate_scene(land_cover, path, sensor="Sentinel-2", block_size=DEFAULT_BLOCK_SIZE, seed=0):
+    """
+    生成反射率立方体并写入 path (.npy)，同时写出元数据 JSON。
+    land_cover: (H, W) 的 MATERIALS 类别编码数组，或 .npy 路径（以内存映射方式读取）
+    返回写好的只读内存映射数组。
+    """
+    land_cover = _open_land_cover(land_cover)
+    if land_cover.ndim != 2:
+        raise ValueError("land_cover must be a 2-D class raster")
+    metadata = scene_metadata(sensor, land_cover.shape, block_size, seed)
+    centers_nm = np.array(metadata["center_nm"])
+
+    cube = np.lib.format.open_memmap(path, mode="w+", dtype=np.float32, shape=tuple(metadata["shape"]))
+    seeds = block_seeds(seed, land_cover.shape, block_size)
+    for index, rows, cols in iter_blocks(land_cover.shape, block_size):
+        cube[:, rows, cols] = simulate_block(land_cover[rows, cols], centers_nm, seeds[index])
+    cube.flush()
+    del cube
+
+    write_sidecar(path, metadata)
+    return np.load(path, mmap_mode="r")
+
+
+def open_scene(path):
+    """读取场景：返回 (只读内存映射立方体, 元数据 dict)"""
+    with open(sidecar_path(path), encoding="utf-8") as f:
+        metadata = json.load(f)
+    return np.load(path, mmap_mode="r"), metadata
+
+
+def random_land_cover(shape, cell=100, seed=0, path=None, block_size=DEFAULT_BLOCK_SIZE):
+    """
+    用于测试的土地覆盖栅格：先在 cell×cell 像元的粗网格上随机分类，再按最近邻展开。
+    给定 path 时按块写入 uint8 .npy 内存映射文件，否则返回内存中的数组。
+    """
+    height, width = shape
+    rng = np.random.default_rng(seed)
+    coarse = rng.integers(0, len(MATERIALS), size=(-(-height // cell), -(-width // cell)), dtype=np.uint8)
+
+    if path is None:
+        land_cover = np.empty(shape, dtype=np.uint8)
+    else:
+        land_cover = np.lib.format.open_memmap(path, mode="w+", dtype=np.uint8, shape=shape)
+    for _, rows, cols in iter_blocks(shape, block_size):
+        land_cover[rows, cols] = coarse[np.arange(rows.start, rows.stop)[:, None] // cell,
+                                        np.arange(cols.start, cols.stop)[None, :] // cell]
+    if path is not None:
+        land_cover.flush()
+    return land_cover
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Generate a synthetic reflectance cube from a land-cover raster")
+    parser.add_argument("output", help="output .npy path (a .json sidecar is written next to it)")
+    parser.add_argument("--land-cover", help="(H, W) uint8 .npy class raster; a random one is generated if omitted")
+    parser.add_argument("--size", type=int, default=10980, help="side length of the random land-cover raster")
+    parser.add_argument("--sensor", choices=SENSORS, default="Sentinel-2")
+    parser.add_argument("--block-size", type=int, default=DEFAULT_BLOCK_SIZE)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    land_cover = args.land_cover
+    if land_cover is None:
+        land_cover = random_land_cover((args.size, args.size), seed=args.seed, block_size=args.block_size)
+
+    start = time.perf_counter()
+    cube = generate_scene(land_cover, args.output, args.sensor, args.block_size, args.seed)
+    print(f"{args.output}: {cube.shape} float32, {cube.nbytes / 1e9:.2f} GB "
+          f"in {time.perf_counter() - start:.1f} s")
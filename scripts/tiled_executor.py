@@ -0,0 +1,125 @@
+"""
+分块并行执行：把场景切成块，交给 ProcessPoolExecutor 的多个进程处理。
+
+- 输入/输出都是 .npy 内存映射文件，进程之间只传文件路径和块的切片，不序列化数组；
+  每个工作进程启动时打开一次内存映射，各块的结果直接写回输出文件对应位置
+- 每个块的随机数流由 SeedSequence(seed).spawn() 按块序号派生（与
+  synthetic_scene.block_seeds 相同），结果与进程数和完成顺序无关，
+  并与单进程的 synthetic_scene.generate_scene() 逐位一致
+
+块处理函数 (kernel) 必须是模块级函数（可被 pickle），签名为
+    kernel(input_blocks, seed_sequence, *kernel_args) -> 输出块
+input_blocks 是各输入在该块上的切片列表（(H, W) 或 (C, H, W) 数组都按最后两维切块），
+返回值写入输出的 [..., rows, cols]。
+
+示例：
+    parallel_generate_scene("land_cover.npy", "scene.npy", workers=32)
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from synthetic_scene import (DEFAULT_BLOCK_SIZE, block_seeds, iter_blocks, scene_metadata,
+                             simulate_block, write_sidecar)
+
+# 工作进程内打开的内存映射：{"inputs": [...], "output": memmap}
+_worker_state = {}
+
+
+def _open_worker(input_paths, output_path):
+    _worker_state["inputs"] = [np.load(path, mmap_mode="r") for path in input_paths]
+    _worker_state["output"] = np.load(output_path, mmap_mode="r+")
+
+
+def _run_block(kernel, rows, cols, seed_sequence, kernel_args):
+    blocks = [array[..., rows, cols] for array in _worker_state["inputs"]]
+    _worker_state["output"][..., rows, cols] = kernel(blocks, seed_sequence, *kernel_args)
+    return rows, cols
+
+
+def _run_chunk(kernel, tasks, kernel_args):
+    """一次处理多个块，减少进程间往返；结束时把写入的页刷回文件"""
+    for rows, cols, seed_sequence in tasks:
+        _run_block(kernel, rows, cols, seed_sequence, kernel_args)
+    _worker_state["output"].flush()
+    return len(tasks)
+
+
+def run_tiled(kernel, input_paths, output_path, shape, block_size=DEFAULT_BLOCK_SIZE, seed=0,
+              workers=None, kernel_args=(), blocks_per_task=4):
+    """
+    在 (H, W) 的块网格上并行执行 kernel，结果写入已创建好的 output_path (.npy)。
+    workers: 进程数，默认 os.cpu_count()；为 1 时在当前进程内顺序执行。
+    返回处理的块数。
+    """
+    seeds = block_seeds(seed, shape, block_size)
+    tasks = [(rows, cols, seeds[index]) for index, rows, cols in iter_blocks(shape, block_size)]
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1:
+        _open_worker(input_paths, output_path)
+        try:
+            return _run_chunk(kernel, tasks, kernel_args)
+        finally:
+            _worker_state.clear()
+
+    chunks = [tasks[i:i + blocks_per_task] for i in range(0, len(tasks), blocks_per_task)]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_open_worker,
+                             initargs=(list(input_paths), output_path)) as executor:
+        futures = [executor.submit(_run_chunk, kernel, chunk, kernel_args) for chunk in chunks]
+        return sum(future.result() for future in futures)
+
+
+def scene_kernel(blocks, seed_sequence, centers_nm):
+    """反射率模拟的块处理函数：blocks[0] 为土地覆盖块"""
+    return simulate_block(blocks[0], centers_nm, seed_sequence)
+
+
+def parallel_generate_scene(land_cover_path, path, sensor="Sentinel-2", block_size=DEFAULT_BLOCK_SIZE,
+                            seed=0, workers=None):
+    """
+    synthetic_scene.generate_scene() 的多进程版本，输出完全相同。
+    land_cover_path: (H, W) 类别栅格的 .npy 文件（各进程以内存映射方式共享）
+    """
+    land_cover = np.load(land_cover_path, mmap_mode="r")
+    if land_cover.ndim != 2:
+        raise ValueError("land_cover must be a 2-D class raster")
+    metadata = scene_metadata(sensor, land_cover.shape, block_size, seed)
+
+    # 主进程只写 .npy 头并预分配文件，数据由各工作进程填充
+    cube = np.lib.format.open_memmap(path, mode="w+", dtype=np.float32, shape=tuple(metadata["shape"]))
+    del cube
+
+    run_tiled(scene_kernel, [land_cover_path], path, land_cover.shape, block_size, seed, workers,
+              kernel_args=(np.array(metadata["center_nm"]),))
+    write_sidecar(path, metadata)
+    return np.load(path, mmap_mode="r")
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    from synthetic_scene import random_land_cover
+
+    parser = argparse.ArgumentParser(description="Generate a synthetic reflectance cube with a process pool")
+    parser.add_argument("output", help="output .npy path (a .json sidecar is written next to it)")
+    parser.add_argument("--land-cover", help="(H, W) uint8 .npy class raster; a random one is generated if omitted")
+    parser.add_argument("--size", type=int, default=10980, help="side length of the random land-cover raster")
+    parser.add_argument("--sensor", default="Sentinel-2")
+    parser.add_argument("--block-size", type=int, default=DEFAULT_BLOCK_SIZE)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None, help="process count (default: all cores)")
+    args = parser.parse_args()
+
+    land_cover_path = args.land_cover
+    if land_cover_path is None:
+        land_cover_path = os.path.splitext(args.output)[0] + "_land_cover.npy"
+        random_land_cover((args.size, args.size), seed=args.seed, path=land_cover_path, block_size=args.block_size)
+
+    start = time.perf_counter()
+    cube = parallel_generate_scene(land_cover_path, args.output, args.sensor, args.block_size,
+                                   args.seed, args.workers)
+    print(f"{args.output}: {cube.shape} float32, {cube.nbytes / 1e9:.2f} GB "
+          f"with {args.workers or os.cpu_count()} workers in {time.perf_counter() - start:.1f} s")
@@ -1,68 +1,118 @@
 import numpy as np
-import pandas as pd
 import matplotlib.pyplot as plt
 
 # ========== 1. 定义简易反射率模拟函数 ==========
-def simulate_reflectance(wavelength_nm, material_type):
+# 地物类别；simulate_reflectance 也接受这里的下标作为类别编码（如土地覆盖栅格）
+MATERIALS = ("vegetation", "water", "soil")
+
+def material_codes(material_type):
+    """
+    把地物名称（或已是整数编码的数组）转为 MATERIALS 下标，未知类别记为 -1。
+    material_type: 标量或任意形状的数组
+    """
+    materials = np.asarray(material_type)
+    if materials.dtype.kind in "iu":
+        codes = materials.astype(np.intp)
+        return np.where((codes >= 0) & (codes < len(MATERIALS)), codes, -1)
+    codes = np.full(materials.shape, -1, dtype=np.intp)
+    for code, name in enumerate(MATERIALS):
+        codes[materials == name] = code
+    return codes
+
+def reflectance_tables(wavelength_nm):
+    """
+    每种地物在各波长上的反射率基值与噪声幅度：reflectance = base + scale * U[0, 1)。
+    返回 (base, scale)，形状均为 (len(MATERIALS) + 1,) + wavelength.shape，
+    最后一行对应未知类别（base 为 NaN），便于用 -1 直接索引。
+    """
+    wavelength_nm = np.asarray(wavelength_nm, dtype=np.float64)
+    base = np.full((len(MATERIALS) + 1,) + wavelength_nm.shape, np.nan)
+    scale = np.zeros_like(base)
+
+    # 假设植被在NIR反射强，在Red吸收强
+    red = (wavelength_nm >= 600) & (wavelength_nm <= 700)
+    nir = (wavelength_nm >= 750) & (wavelength_nm <= 900)
+    base[0] = np.where(red, 0.1, np.where(nir, 0.5, 0.2))
+    scale[0] = np.where(red, 0.05, np.where(nir, 0.2, 0.1))
+
+    # 水体在所有波段反射率都低
+    base[1] = 0.02
+    scale[1] = 0.01
+
+    # 土壤随波长略微上升
+    base[2] = 0.1 + wavelength_nm / 2000
+    scale[2] = 0.05
+    return base, scale
+
+def simulate_reflectance(wavelength_nm, material_type, rng=None, dtype=np.float64):
     """
     A toy reflectance simulator for basic remote sensing understanding.
-    wavelength_nm: input wavelength in nm
-    material_type: 'vegetation', 'water', or 'soil'
+    wavelength_nm: wavelength in nm, scalar or array of any shape
+    material_type: 'vegetation', 'water', 'soil' (or MATERIALS index), scalar or array of any shape
+    rng: np.random.Generator used for the noise; pass a seeded one for reproducible results
+    Returns an array of shape material.shape + wavelength.shape, e.g. a
+    (materials x wavelengths) matrix. Unknown materials give NaN; for scalar
+    inputs a float is returned (None for an unknown material).
     """
-    if material_type == "vegetation":
-        # 假设植被在NIR反射强，在Red吸收强
-        if 600 <= wavelength_nm <= 700:  # Red
-            return 0.1 + 0.05 * np.random.rand()
-        elif 750 <= wavelength_nm <= 900:  # NIR
-            return 0.5 + 0.2 * np.random.rand()
-        else:
-            return 0.2 + 0.1 * np.random.rand()
-
-    elif material_type == "water":
-        # 水体在所有波段反射率都低
-        return 0.02 + 0.01 * np.random.rand()
-
-    elif material_type == "soil":
-        # 土壤随波长略微上升
-        return 0.1 + (wavelength_nm / 2000) + 0.05 * np.random.rand()
-
-    else:
-        return None
+    if rng is None:
+        rng = np.random.default_rng()
+    codes = material_codes(material_type)
+    base, scale = (table.astype(dtype, copy=False) for table in reflectance_tables(wavelength_nm))
 
-# ========== 2. 测试典型波长输出表 ==========
-materials = ["vegetation", "water", "soil"]
-wavelengths = [650, 850]  # Red & NIR
+    # 按类别编码取出每个样本的基值/噪声幅度，噪声一次性生成
+    reflectance = rng.random(codes.shape + base.shape[1:], dtype=dtype)
+    reflectance *= scale[codes]
+    reflectance += base[codes]
 
-results = []
-for m in materials:
-    for w in wavelengths:
-        refl = simulate_reflectance(w, m)
-        results.append((m, w, round(refl, 3)))
+    if reflectance.ndim == 0:
+        return None if codes == -1 else float(reflectance)
+    return reflectance
 
-df = pd.DataFrame(results, columns=["Material", "Wavelength (nm)", "Simulated Reflectance"])
-print("\nToy Reflectance Simulation Table:\n", df)
+# ========== 2. 测试典型波长输出表 ==========
+materials = list(MATERIALS)
+wavelengths = [650, 850]  # Red & NIR
 
 # ========== 3. 生成连续波长的光谱曲线 ==========
 wavelengths_cont = np.linspace(400, 1000, 200)
 
-def generate_spectrum(material_type):
-    return [simulate_reflectance(w, material_type) for w in wavelengths_cont]
-
-# 三类地物光谱
-vegetation_spectrum = generate_spectrum("vegetation")
-water_spectrum = generate_spectrum("water")
-soil_spectrum = generate_spectrum("soil")
-
-# ========== 4. 绘制光谱曲线 ==========
-plt.figure(figsize=(8, 5))
-plt.plot(wavelengths_cont, vegetation_spectrum, label="Vegetation", color="green", linewidth=2)
-plt.plot(wavelengths_cont, water_spectrum, label="Water", color="blue", linewidth=2)
-plt.plot(wavelengths_cont, soil_spectrum, label="Soil", color="sienna", linewidth=2)
-
-plt.title("Simulated Reflectance Spectra", fontsize=14, fontweight="bold")
-plt.xlabel("Wavelength (nm)")
-plt.ylabel("Reflectance")
-plt.ylim(0, 1)
-plt.grid(True, linestyle='--', alpha=0.5)
-plt.legend()
-plt.show()
+def generate_spectrum(material_type, rng=None):
+    return simulate_reflectance(wavelengths_cont, material_type, rng)
+
+def build_figure(rng=None):
+    """三类地物的模拟光谱曲线，返回 Figure；rng 可为 Generator 或整数种子"""
+    vegetation_spectrum, water_spectrum, soil_spectrum = generate_spectrum(materials, np.random.default_rng(rng))
+
+    # ========== 4. 绘制光谱曲线 ==========
+    fig, ax = plt.subplots(figsize=(8, 5))
+    ax.plot(wavelengths_cont, vegetation_spectrum, label="Vegetation", color="green", linewidth=2)
+    ax.plot(wavelengths_cont, water_spectrum, label="Water", color="blue", linewidth=2)
+    ax.plot(wavelengths_cont, soil_spectrum, label="Soil", color="sienna", linewidth=2)
+
+    ax.set_title("Simulated Reflectance Spectra", fontsize=14, fontweight="bold")
+    ax.set_xlabel("Wavelength (nm)")
+    ax.set_ylabel("Reflectance")
+    ax.set_ylim(0, 1)
+    ax.grid(True, linestyle='--', alpha=0.5)
+    ax.legend()
+    return fig
+
+
+if __name__ == "__main__":
+    import pandas as pd    # 只有打印演示表格时需要，export_figures / build_assets 导入本模块时不加载
+
+    rng = np.random.default_rng(42)
+
+    # (materials x wavelengths) 一次算出
+    table = simulate_reflectance(wavelengths, materials, rng)
+    results = [
+        (m, w, round(float(table[i, j]), 3))
+        for i, m in enumerate(materials)
+        for j, w in enumerate(wavelengths)
+    ]
+
+    df = pd.DataFrame(results, columns=["Material", "Wavelength (nm)", "Simulated Reflectance"])
+    print("\nToy Reflectance Simulation Table:\n", df)
+
+    # 三类地物光谱
+    build_figure(rng)
+    plt.show()